@@ -0,0 +1,82 @@
+"""
+Замер построения сводного листа на синтетических данных: нормализация цен, ранжирование и запись в Excel.
+
+    python benchmarks/ranking_benchmark.py                          # 10 000 артикулов x 7 магазинов
+    python benchmarks/ranking_benchmark.py --articles 1000 --offers 3
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from openpyxl import Workbook  # noqa: E402
+
+from src.utils.ExcelSaver import ExcelSaver  # noqa: E402
+from src.utils.PriceNormalizer import normalize_records  # noqa: E402
+from src.utils.PriceRanking import rank_offers  # noqa: E402
+
+SHOPS = ["ChipDip", "eBay", "ETM", "YandexMarket", "Bonpet", "Aliexpress", "Zakupki"]
+PRICE_TEMPLATES = ["{:,.2f} ₽".replace(",", " "), "{:.0f} руб./шт", "от {:.2f} ₽", "{:.0f}&nbsp;₽"]
+
+
+def make_records(articles, offers_per_shop, seed=0):
+    """Синтетические записи в формате парсеров для каждого магазина."""
+    rng = random.Random(seed)
+    records = {shop: [] for shop in SHOPS}
+    for article in articles:
+        for shop in SHOPS:
+            for index in range(offers_per_shop):
+                price = rng.uniform(10, 100000)
+                if rng.random() < 0.05:
+                    raw_price = "Цена не найдена"
+                else:
+                    raw_price = rng.choice(PRICE_TEMPLATES).format(price)
+                records[shop].append({article: {
+                    "description": f"{article} {shop} #{index}",
+                    "price": raw_price,
+                    "url": f"https://{shop.lower()}.example/{article}/{index}",
+                }})
+    return records
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Summary sheet ranking benchmark")
+    arg_parser.add_argument("--articles", type=int, default=10000, help="Number of articles (default: 10000)")
+    arg_parser.add_argument("--offers", type=int, default=5, help="Offers per shop and article (default: 5)")
+    arg_parser.add_argument("--top", type=int, default=3, help="Best offers per article (default: 3)")
+    args = arg_parser.parse_args(argv)
+
+    articles = [f"ART-{index:05d}" for index in range(args.articles)]
+    records = make_records(articles, args.offers)
+    total = sum(len(shop_records) for shop_records in records.values())
+    print(f"{args.articles} articles x {len(SHOPS)} shops, {total} offers")
+
+    start = time.perf_counter()
+    import pandas as pd
+    offers = pd.concat([normalize_records(shop_records, shop=shop) for shop, shop_records in records.items()],
+                       ignore_index=True)
+    print(f"normalize  {time.perf_counter() - start:8.2f} s")
+
+    start = time.perf_counter()
+    summary = rank_offers(offers, articles=articles, top_n=args.top)
+    print(f"rank       {time.perf_counter() - start:8.2f} s  ({len(summary)} rows)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        excel_file = os.path.join(directory, "summary.xlsx")
+        Workbook().save(excel_file)
+        start = time.perf_counter()
+        ExcelSaver(excel_file=excel_file, articles=articles).aggregate_prices_to_first_sheet(offers=offers,
+                                                                                            top_n=args.top)
+        print(f"write xlsx {time.perf_counter() - start:8.2f} s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Замер времени запуска: импорт gui.py / cli.py и (при наличии дисплея) показ окна.
+
+Каждый замер выполняется в отдельном процессе, чтобы не мешал кэш уже загруженных модулей.
+
+    python benchmarks/startup_benchmark.py            # импорт gui и cli
+    python benchmarks/startup_benchmark.py --window   # плюс создание и отрисовка окна
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Модули, которые не должны загружаться при старте
+HEAVY_MODULES = ["selenium", "undetected_chromedriver", "webdriver_manager", "pandas", "openpyxl", "tqdm"]
+
+PROBES = {
+    "import gui": "import gui",
+    "import cli": "import cli",
+    "cli --list-shops": "import cli; cli.main(['--list-shops'])",
+    "show window": "import gui; app = gui.ParserApp(); app.update(); app.destroy()",
+}
+
+PROBE_TEMPLATE = """
+import io, json, sys, time, contextlib
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    {code}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "heavy": heavy}}))
+"""
+
+
+def run_probe(code, repeat):
+    """Запускает фрагмент кода в новых процессах и возвращает время и список загруженных тяжёлых модулей."""
+    timings = []
+    heavy = []
+    script = PROBE_TEMPLATE.format(code=code, heavy=HEAVY_MODULES)
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr else "probe failed")
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        timings.append(result["elapsed"])
+        heavy = result["heavy"]
+    return timings, heavy
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Startup time benchmark")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Runs per probe (default: 5)")
+    arg_parser.add_argument("--budget", type=float, default=1.0, help="Allowed median time, seconds (default: 1.0)")
+    arg_parser.add_argument("--window", action="store_true", help="Also measure window construction (needs display)")
+    args = arg_parser.parse_args(argv)
+
+    probes = dict(PROBES)
+    if not args.window:
+        probes.pop("show window")
+
+    failed = False
+    for name, code in probes.items():
+        try:
+            timings, heavy = run_probe(code, args.repeat)
+        except RuntimeError as e:
+            print(f"{name:<20} error: {e}")
+            failed = True
+            continue
+
+        median = statistics.median(timings)
+        over_budget = median > args.budget
+        failed = failed or over_budget or bool(heavy)
+        print(f"{name:<20} median {median * 1000:8.1f} ms  min {min(timings) * 1000:8.1f} ms"
+              f"  heavy modules: {', '.join(heavy) or '-'}{'  OVER BUDGET' if over_budget else ''}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
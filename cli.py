@@ -0,0 +1,143 @@
+"""
+Консольный запуск парсеров без GUI (подходит для cron на сервере).
+
+Пример:
+    python cli.py --articles data.xlsx --shops ChipDip eBay --workers 2 --output output.xlsx
+"""
+import argparse
+import os
+import sys
+
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(description="Shops Parser: batch run without GUI")
+    arg_parser.add_argument("--articles", default="data.xlsx",
+                            help="Excel or CSV file with articles in the first column or under an 'Article' header, "
+                                 "optionally with 'Quantity' and 'Shops' columns (default: data.xlsx)")
+    arg_parser.add_argument("--shops", nargs="+", default=[],
+                            help="Shops to parse, e.g. ChipDip eBay ETM; 'all' selects every shop")
+    arg_parser.add_argument("--output", default="output.xlsx", help="Output Excel file (default: output.xlsx)")
+    arg_parser.add_argument("--workers", type=int, default=None,
+                            help="Parser processes running at once (default: number of CPU cores)")
+    arg_parser.add_argument("--shards", type=int, default=1,
+                            help="Processes per shop; articles are split between them (default: 1)")
+    arg_parser.add_argument("--article-timeout", type=float, default=180,
+                            help="Seconds before a stuck article is skipped and its worker restarted (default: 180)")
+    arg_parser.add_argument("--data-root", default=".", help="Directory that holds data/JSON (default: current)")
+    arg_parser.add_argument("--db", default=None,
+                            help="Price history database (default: <data-root>/data/prices.sqlite3)")
+    arg_parser.add_argument("--incremental", action="store_true",
+                            help="Scrape only articles whose revisit interval (from price history) has passed")
+    arg_parser.add_argument("--budget", type=int, default=None,
+                            help="With --incremental: max (shop, article) pairs scraped per run (default: no limit)")
+    arg_parser.add_argument("--chunk-size", type=int, default=1000,
+                            help="Articles read from the input file and dispatched at a time (default: 1000)")
+    arg_parser.add_argument("--export", choices=["parquet", "arrow"], default=None,
+                            help="Also export run offers to data/Export/run=<id>/shop=<shop> (requires pyarrow)")
+    arg_parser.add_argument("--metrics-port", type=int, default=None,
+                            help="Serve live run metrics in Prometheus text format on http://127.0.0.1:<port>/metrics "
+                                 "(default: EMPARSER_METRICS_PORT, off if unset)")
+    arg_parser.add_argument("--recycle-rss-mb", type=float, default=None,
+                            help="Restart a kept browser between articles when its worker uses more memory "
+                                 "(MB, with Chrome; default: EMPARSER_RECYCLE_RSS_MB, off; requires psutil)")
+    arg_parser.add_argument("--profile", default=None,
+                            help="Record every WebDriver command per article into this directory and write "
+                                 "a report of the slowest selectors and timeouts (default: EMPARSER_PROFILE, off)")
+    arg_parser.add_argument("--no-health-check", dest="health_check", action="store_const", const=False,
+                            default=None,
+                            help="Skip the canary search that checks each shop's selectors before the run "
+                                 "(default: EMPARSER_HEALTH_CHECK, on)")
+    arg_parser.add_argument("--fail-fast", type=int, default=None,
+                            help="Disable a shop for the rest of the run after this many failed articles in a row "
+                                 "(default: EMPARSER_FAIL_FAST or 20; 0 never disables)")
+    arg_parser.add_argument("--rates", default=None,
+                            help="Exchange rates to RUB for the summary sheet, e.g. USD=92.5,EUR=100 "
+                                 "(default: EMPARSER_RATES; offers in a currency without a rate are ranked "
+                                 "separately in that currency)")
+    arg_parser.add_argument("--proxies", default=None,
+                            help="Proxy list: a file with one proxy per line or a comma-separated list")
+    arg_parser.add_argument("--log-levels", default=None,
+                            help="Log levels, e.g. INFO or INFO,src.parsers.ChipDipParser=DEBUG (default: INFO)")
+    arg_parser.add_argument("--log-json", default=None, help="Also write logs as JSON lines to this file")
+    arg_parser.add_argument("--list-shops", action="store_true", help="Print available shops and exit")
+    return arg_parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    from src.logger.logger import Logger
+    from src.parsers.ShopRegistry import SHOP_MAP, shop_names
+
+    if args.log_levels:
+        Logger().set_levels(args.log_levels)
+    if args.log_json:
+        Logger().add_json_sink(args.log_json)
+
+    if args.proxies:
+        # Рабочие процессы парсеров читают список прокси из окружения (см. ProxyPool)
+        os.environ["EMPARSER_PROXIES"] = args.proxies
+    if args.profile:
+        # Как и прокси, каталог профиля передаётся рабочим процессам через окружение (см. DriverProfiler)
+        os.environ["EMPARSER_PROFILE"] = args.profile
+
+    if args.list_shops:
+        for shop in shop_names():
+            print(f"{shop}\t{SHOP_MAP[shop]['site_name']}")
+        return 0
+
+    shops = shop_names() if args.shops == ["all"] else args.shops
+    unknown = [shop for shop in shops if shop not in SHOP_MAP]
+    if unknown or not shops:
+        print(f"Unknown or missing shops: {', '.join(unknown) or '-'}. Available: {', '.join(shop_names())}",
+              file=sys.stderr)
+        return 2
+
+    # Парсеры, Selenium и openpyxl импортируются только когда действительно нужен запуск
+    from src.utils.BatchRunner import BatchRunner
+    from src.utils.RunMetrics import MetricsServer, RunMetrics
+
+    metrics = RunMetrics()
+    if args.metrics_port is not None:
+        metrics_server = MetricsServer(metrics, args.metrics_port)
+    else:
+        metrics_server = MetricsServer.from_env(metrics)
+    if metrics_server is not None:
+        metrics_server.start()
+
+    runner = BatchRunner(
+        articles_file=args.articles,
+        shops=shops,
+        output_file=args.output,
+        max_workers=args.workers,
+        shards_per_shop=args.shards,
+        article_timeout=args.article_timeout,
+        data_root=args.data_root,
+        db_path=args.db,
+        incremental=args.incremental,
+        budget=args.budget,
+        chunk_size=args.chunk_size,
+        export_format=args.export,
+        on_event=print,
+        metrics=metrics,
+        recycle_rss_mb=args.recycle_rss_mb,
+        health_check=args.health_check,
+        fail_fast_after=args.fail_fast,
+        rates=args.rates,
+    )
+    try:
+        results = runner.run()
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
+    if not results:
+        return 1
+
+    failed = sum(len(result["failed"]) for result in results.values())
+    parsed = sum(result["offers"] for result in results.values())
+    print(f"Done: {parsed} records, {failed} failed articles")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,24 @@
 import customtkinter as ctk
 import threading
-import openpyxl
 from pathlib import Path
 import os
 import platform
 import shutil
 import sys
-import tqdm
-from src.parsers.BonpetParser import BonpetParser
-from src.parsers.AliexpressParser import AliexpressParser
-from src.parsers.ChipDipParser import ChipDipParser
-from src.parsers.ETMParser import ETMParser
-from src.parsers.eBayParser import eBayParser
-from src.parsers.ZakupkiParser import ZakupkiParser
-from src.parsers.YandexMarketParser import YandexMarketParser
-from src.utils.ExcelSaver import ExcelSaver
-from src.parsers.AbstractParser import Loading_Source_Data
+from src.parsers.ShopRegistry import SHOP_MAP, shop_names
+from src.utils.EventBus import EventBus
+from src.utils.RunMetrics import MetricsServer, RunMetrics
 
 # Initialize CustomTkinter
 ctk.set_appearance_mode("System")  # Modes: "System" (default), "Dark", "Light"
 ctk.set_default_color_theme("blue")  # Themes: "blue" (default), "green", "dark-blue"
 
 class ParserApp(ctk.CTk):
+    EVENT_POLL_MS = 100  # How often the GUI drains the event bus
+    MAX_EVENTS_PER_TICK = 2000  # Upper bound of events handled per timer tick
+    MAX_CONSOLE_LINES = 5000  # Older console lines are dropped to keep the textbox fast
+    METRICS_REFRESH_MS = 1000  # How often the metrics panel is redrawn
+
     def __init__(self):
         super().__init__()
         self.title("Shops Parser")
@@ -32,6 +29,13 @@ class ParserApp(ctk.CTk):
         self.original_file_path = Path(__file__).parent / "data.xlsx"  # Original file for user input
         self.output_file_path = Path(__file__).parent / "output.xlsx"  # Output file for aggregation results
         self.workbook = None  # To store the loaded workbook
+        self.event_bus = EventBus()  # Worker threads/processes -> GUI thread
+        self.shop_progress = {}  # Latest progress event per shop
+        self.metrics = RunMetrics()  # Filled by the parser pipeline, read by the panel and /metrics
+        # Prometheus endpoint, if EMPARSER_METRICS_PORT is set
+        self.metrics_server = MetricsServer.from_env(self.metrics)
+        if self.metrics_server is not None:
+            self.metrics_server.start()
 
         # Handle window close event
         self.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -39,6 +43,10 @@ class ParserApp(ctk.CTk):
         # Layout
         self.create_widgets()
 
+        # Drain worker events on the Tk thread
+        self.after(self.EVENT_POLL_MS, self.process_events)
+        self.after(self.METRICS_REFRESH_MS, self.refresh_metrics)
+
     def create_widgets(self):
         # Title Label
         title_label = ctk.CTkLabel(self, text="Shops Parser", font=("Arial", 20, "bold"))
@@ -49,17 +57,9 @@ class ParserApp(ctk.CTk):
         shop_frame.pack(pady=10, padx=20, fill="x")
 
         # Checkboxes for Shops
-        shops = ["ChipDip", "eBay", "ETM", "YandexMarket", "Bonpet.tech", "Aliexpress", "Zakupki"]
-
-        self.shop_map = {
-            "ChipDip": {"id": 1, "site_name": "https://www.chipdip.ru/", "json_folder": "data/JSON/ChipDipData"},
-            "eBay": {"id": 2, "site_name": "https://www.ebay.com/", "json_folder": "data/JSON/eBayData"},
-            "ETM": {"id": 3, "site_name": "https://www.etm.ru/", "json_folder": "data/JSON/ETMData"},
-            "YandexMarket": {"id": 4, "site_name": "https://market.yandex.ru/", "json_folder": "data/JSON/YandexMarketData"},
-            "Bonpet.tech": {"id": 5, "site_name": "https://bonpet.tech/", "json_folder": "data/JSON/BonpetData"},
-            "Aliexpress": {"id": 6, "site_name": "https://aliexpress.ru/", "json_folder": "data/JSON/AliexpressData"},
-            "Zakupki": {"id": 7, "site_name": "https://www.zakupki.ru/", "json_folder": "data/JSON/ZakupkiData"},
-        }
+        shops = shop_names()
+
+        self.shop_map = SHOP_MAP
         for shop in shops:
             checkbox = ctk.CTkCheckBox(shop_frame, text=shop, command=lambda s=shop: self.toggle_shop(s))
             checkbox.pack(side="left", padx=10)
@@ -90,6 +90,13 @@ class ParserApp(ctk.CTk):
         self.progress_bar.set(0)
         self.progress_bar.pack(pady=10, padx=20, fill="x")
 
+        self.progress_label = ctk.CTkLabel(self, text="", anchor="w")
+        self.progress_label.pack(padx=20, fill="x")
+
+        # Live metrics: one line per shop
+        self.metrics_label = ctk.CTkLabel(self, text="", anchor="w", justify="left", font=("Courier New", 12))
+        self.metrics_label.pack(padx=20, fill="x")
+
         # Action Buttons
         action_frame = ctk.CTkFrame(self)
         action_frame.pack(pady=10, padx=20, fill="x")
@@ -155,107 +162,104 @@ class ParserApp(ctk.CTk):
             self.log_to_console(f"Error downloading results: {e}")
 
     def start_parsing(self):
+        # Widgets are read here, on the Tk thread; the worker thread only publishes events
+        selected_shops = [cb.cget("text") for cb in self.selected_shops if cb.get() == 1]
+        self.shop_progress = {}
+        self.progress_bar.set(0)
+        self.progress_label.configure(text="")
+
         # Start parsing in a separate thread to keep GUI responsive
-        threading.Thread(target=self.run_parsers).start()
+        threading.Thread(target=self.run_parsers, args=(selected_shops,), daemon=True).start()
 
-    def run_parsers(self):
+    def run_parsers(self, selected_shops):
         """Run selected parsers."""
-        selected_shops = [cb.cget("text") for cb in self.selected_shops if cb.get() == 1]
         if not selected_shops:
             self.log_to_console("No parsers selected.")
             return
 
-        # Define behavior for each shop
-        close_browser_behavior = {
-            "Aliexpress": False,  
-        }
-
-        self.log_to_console(f"Selected parsers: {', '.join(selected_shops)}")
         try:
-            # Load articles from data.xlsx
-            articles = list(Loading_Source_Data(self.original_file_path).loading_articles())
-            self.log_to_console(f"Loaded {len(articles)} articles for parsing.")
-
-            for shop in selected_shops:
-                shop_info = self.shop_map.get(shop)
-                if not shop_info:
-                    self.log_to_console(f"Unknown shop: {shop}")
-                    continue
-
-                site_name = shop_info["site_name"]
-                json_folder = shop_info["json_folder"]
-                parser_class = {
-                    "Bonpet.tech": BonpetParser,
-                    "Aliexpress": AliexpressParser,
-                    "ChipDip": ChipDipParser,
-                    "ETM": ETMParser,
-                    "eBay": eBayParser,
-                    "Zakupki": ZakupkiParser,
-                    "YandexMarket": YandexMarketParser
-                }.get(shop)
-
-                if not parser_class:
-                    self.log_to_console(f"No parser class found for shop: {shop}")
-                    continue
-
-                close_browser_after_each_article = close_browser_behavior.get(shop, True)
-
-                self.log_to_console(f"Starting parser for: {site_name} (Close browser after each article: {close_browser_after_each_article})")
-                try:
-                    # Create a single browser instance for the shop
-                    if not close_browser_after_each_article:
-                        parser_instance = parser_class(url=site_name, request="", items=[])
-                        parser_instance._setup()  # Initialize WebDriver
-
-                    # Parse each article
-                    for article in tqdm.tqdm(articles, desc=f"Parsing {site_name}", unit="item"):
-                        try:
-                            if close_browser_after_each_article:
-                                parser_instance = parser_class(url=site_name, request="", items=[])
-                            parser_instance.request = article
-                            parser_instance.items = [article]
-                            parser_instance.parse()
-                            self.log_to_console(f"Successfully parsed article: {article}")
-
-                            if close_browser_after_each_article:
-                                parser_instance._quit_driver()
-                        except Exception as e:
-                            self.log_to_console(f"Error parsing article {article}: {e}")
-
-                    # Save parsed data to JSON
-                    saver = ExcelSaver(json_folder=json_folder, articles=articles, excel_file=self.output_file_path)
-                    saver.process_data()
-                    self.log_to_console(f"Saved parsed data to JSON folder: {json_folder}")
-
-                    if not close_browser_after_each_article:
-                        parser_instance._quit_driver()
-
-                except Exception as e:
-                    self.log_to_console(f"Error parsing shop {shop}: {e}")
-
-            # Aggregate all data into one Excel file
-            try:
-                saver_aggregate = ExcelSaver(excel_file=self.output_file_path, articles=articles)
-                saver_aggregate.aggregate_prices_to_first_sheet()
-                self.log_to_console("All data successfully aggregated into Excel.")
-            except Exception as e:
-                self.log_to_console(f"Error aggregating data into Excel: {e}")
-
+            # Parsers, Selenium and openpyxl are imported on the first run, not at startup
+            from src.utils.BatchRunner import BatchRunner
+
+            runner = BatchRunner(
+                articles_file=self.original_file_path,
+                shops=selected_shops,
+                output_file=self.output_file_path,
+                on_event=self.event_bus.log,
+                on_progress=self.event_bus.progress,
+                metrics=self.metrics,
+            )
+            runner.run()
         except Exception as e:
-            self.log_to_console(f"Error loading articles: {e}")
+            self.log_to_console(f"Error running parsers: {e}")
 
     def log_to_console(self, message):
-        """Log a message to the console output."""
-        if hasattr(self, "console_output"):  # Ensure the console widget exists
-            self.console_output.configure(state="normal")
-            self.console_output.insert("end", message + "\n")
-            self.console_output.configure(state="disabled")
-            self.console_output.see("end")
-        else:
-            print(f"Console not initialized yet: {message}")
+        """Queue a message for the console output (safe to call from any thread)."""
+        self.event_bus.log(message)
+
+    def process_events(self):
+        """Drain queued events in one batch: a single textbox update and one progress refresh per tick."""
+        try:
+            lines = []
+            progress_changed = False
+            for event in self.event_bus.drain(self.MAX_EVENTS_PER_TICK):
+                if event["type"] == "log":
+                    lines.append(event["message"])
+                elif event["type"] == "progress":
+                    self.shop_progress[event["shop"]] = event
+                    progress_changed = True
+
+            if lines:
+                self._append_console("\n".join(lines) + "\n")
+            if progress_changed:
+                self._update_progress()
+        finally:
+            self.after(self.EVENT_POLL_MS, self.process_events)
+
+    def _append_console(self, text):
+        """Append text to the console and drop the oldest lines above MAX_CONSOLE_LINES."""
+        self.console_output.configure(state="normal")
+        self.console_output.insert("end", text)
+        line_count = int(self.console_output.index("end-1c").split(".")[0])
+        if line_count > self.MAX_CONSOLE_LINES:
+            self.console_output.delete("1.0", f"{line_count - self.MAX_CONSOLE_LINES + 1}.0")
+        self.console_output.configure(state="disabled")
+        self.console_output.see("end")
+
+    def _update_progress(self):
+        """Show overall progress in the bar and per-shop counts, rate and ETA in the label."""
+        processed = sum(p["done"] + p["failed"] for p in self.shop_progress.values())
+        total = sum(p["total"] for p in self.shop_progress.values())
+        self.progress_bar.set(processed / total if total else 0)
+
+        parts = []
+        for shop, p in self.shop_progress.items():
+            eta = f"{p['eta'] / 60:.1f} min" if p["eta"] is not None else "-"
+            parts.append(f"{shop}: {p['done'] + p['failed']}/{p['total']} "
+                         f"(errors {p['failed']}, {p['rate'] * 60:.1f}/min, ETA {eta})")
+        self.progress_label.configure(text="   ".join(parts))
+
+    def refresh_metrics(self):
+        """Redraw the metrics panel: rate, queue, browsers, error/block rates, cache hits, stage latencies
+        and shops disabled for the run."""
+        try:
+            lines = []
+            for shop, m in self.metrics.snapshot().items():
+                cache = f"{m['cache_hit_ratio']:.0%}" if m["cache_hit_ratio"] is not None else "-"
+                memory = f", {m['rss_mb']:.0f} MB, CPU {m['cpu']:.0f}%" if m["rss_mb"] is not None else ""
+                stages = " ".join(f"{stage} {seconds:.1f}s" for stage, seconds in m["stages"].items())
+                disabled = " [DISABLED]" if m["disabled"] else ""
+                lines.append(f"{shop}{disabled}: {m['rate']:.2f} art/s, queue {m['queued']}, browsers {m['browsers']}, "
+                             f"errors {m['error_rate']:.0%}, blocks {m['block_rate']:.0%}, cache hits {cache}{memory}"
+                             + (f" | {stages}" if stages else ""))
+            self.metrics_label.configure(text="\n".join(lines))
+        finally:
+            self.after(self.METRICS_REFRESH_MS, self.refresh_metrics)
 
     def on_close(self):
         """Handle the application close event."""
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
         self.destroy()  # Destroy the GUI
         sys.exit(0)  # Ensure the program exits completely
 
@@ -1,9 +1,45 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+ROOT_LOGGER_NAME = "ParserLogger"
+
+# Уровни логов: "DEBUG" для всего логгера или "INFO,src.parsers.ChipDipParser=DEBUG" — по модулям (по умолчанию INFO)
+LEVELS_ENV = "EMPARSER_LOG_LEVELS"
+# Путь к дополнительному файлу в формате JSON Lines (по одной записи на строку)
+JSON_LOG_ENV = "EMPARSER_LOG_JSON"
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Форматирует запись лога в одну строку JSON."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "file": record.filename,
+            "line": record.lineno,
+            "process": record.process,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
 
 
 class Logger:
-    """Класс для настройки единственного экземпляра логгера (Singleton)."""
+    """
+    Класс для настройки единственного экземпляра логгера (Singleton).
+
+    Логгер только кладёт записи в очередь (QueueHandler), а запись в файл и консоль выполняет
+    фоновый поток QueueListener, поэтому дисковый ввод-вывод не тормозит парсинг. Сообщения
+    форматируются лениво ("%s"-аргументы), так что отключённые уровни почти ничего не стоят.
+    """
 
     _instance = None  # Переменная для хранения единственного экземпляра логгера
 
@@ -16,8 +52,11 @@ class Logger:
 
     def _initialize_logger(self):
         """Настраивает логгер."""
-        self.logger = logging.getLogger("ParserLogger")
-        self.logger.setLevel(logging.DEBUG)  # Общий уровень логов (для файла)
+        self.logger = logging.getLogger(ROOT_LOGGER_NAME)
+        # Общий уровень логов; DEBUG включается через EMPARSER_LOG_LEVELS (--log-levels), в том числе
+        # для отдельных модулей. Записи ниже уровня отбрасываются до форматирования и постановки в очередь.
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
 
         # 🔹 Формат для файла (подробный)
         file_formatter = logging.Formatter(
@@ -31,8 +70,9 @@ class Logger:
         )
 
         # 🔹 Обработчик для файла (всё пишем в файл)
-        file_handler = RotatingFileHandler("parser.log", maxBytes=5_000_000, backupCount=3, encoding="utf-8")
-        file_handler.setLevel(logging.DEBUG)  # В файл пишем ВСЕ уровни логов
+        file_handler = RotatingFileHandler("parser.log", maxBytes=5_000_000, backupCount=3, encoding="utf-8",
+                                           delay=True)
+        file_handler.setLevel(logging.DEBUG)  # В файл пишем всё, что пропустили уровни логгеров
         file_handler.setFormatter(file_formatter)
 
         # 🔹 Обработчик для консоли (только INFO+)
@@ -40,9 +80,87 @@ class Logger:
         console_handler.setLevel(logging.INFO)  # В консоль пишем только INFO и выше
         console_handler.setFormatter(console_formatter)
 
-        # Добавляем обработчики в логгер
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        self.handlers = [file_handler, console_handler]
+
+        # 🔹 Необязательный JSON Lines файл
+        json_path = os.environ.get(JSON_LOG_ENV)
+        if json_path:
+            self.handlers.append(self._json_handler(json_path))
+
+        # Логгер пишет только в очередь, обработчики работают в фоновом потоке
+        self.queue = queue.SimpleQueue()
+        self.logger.addHandler(QueueHandler(self.queue))
+        self.listener = QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+        self._process_queue = None
+        self._process_listener = None
+        atexit.register(self.stop)
+
+        self.levels = {}
+        self.set_levels(os.environ.get(LEVELS_ENV, ""))
+
+    @staticmethod
+    def _json_handler(path):
+        handler = RotatingFileHandler(path, maxBytes=5_000_000, backupCount=3, encoding="utf-8", delay=True)
+        handler.setLevel(logging.DEBUG)
+        handler.setFormatter(JsonLinesFormatter(datefmt="%Y-%m-%d %H:%M:%S"))
+        return handler
+
+    def set_levels(self, levels):
+        """
+        Задаёт уровни логов для всего логгера и отдельных модулей.
+
+        :param levels: Строка "INFO,src.parsers.ChipDipParser=DEBUG" или словарь {модуль: уровень};
+                       пустое имя модуля (или уровень без имени) относится ко всему логгеру
+        """
+        if isinstance(levels, str):
+            levels = dict(item.strip().rpartition("=")[::2] for item in levels.split(",") if item.strip())
+
+        for name, level in levels.items():
+            name = name.strip()
+            level = level.strip().upper() if isinstance(level, str) else logging.getLevelName(level)
+            logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}" if name else ROOT_LOGGER_NAME).setLevel(level)
+            self.levels[name] = level
+
+        # Дочерние процессы (spawn) наследуют окружение, а значит и эти уровни
+        os.environ[LEVELS_ENV] = ",".join(f"{name}={level}" if name else level for name, level in self.levels.items())
+
+    def add_json_sink(self, path):
+        """Включает запись логов в файл JSON Lines (в том числе для дочерних процессов)."""
+        os.environ[JSON_LOG_ENV] = str(path)
+        handler = self._json_handler(path)
+        self.listener.stop()
+        self.handlers.append(handler)
+        self.listener = QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def process_queue(self, context):
+        """
+        Возвращает межпроцессную очередь для логов рабочих процессов.
+
+        Записи из неё пишет фоновый поток этого процесса, поэтому parser.log ротирует
+        только один процесс.
+
+        :param context: Контекст multiprocessing, в котором создаются рабочие процессы
+        """
+        if self._process_queue is None:
+            self._process_queue = context.Queue()
+            self._process_listener = QueueListener(self._process_queue, *self.handlers, respect_handler_level=True)
+            self._process_listener.start()
+        return self._process_queue
+
+    def use_queue(self, log_queue):
+        """Переключает логгер рабочего процесса на очередь родительского процесса."""
+        self.listener.stop()
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+        self.logger.addHandler(QueueHandler(log_queue))
+
+    def stop(self):
+        """Дописывает накопленные записи и останавливает фоновые потоки."""
+        for listener in (self._process_listener, self.listener):
+            if listener is not None and listener._thread is not None:
+                listener.stop()
 
     def get_logger(self):
         """Возвращает единственный экземпляр логгера."""
@@ -52,6 +170,12 @@ class Logger:
 # Создание единственного экземпляра логгера
 parser_logger = Logger().get_logger()
 
+
+def get_logger(name):
+    """Возвращает дочерний логгер модуля; его уровень можно задать отдельно через set_levels()."""
+    return parser_logger.getChild(name)
+
+
 # # 📌 УРОВНИ ЛОГИРОВАНИЯ:
 #
 # # 1️⃣ DEBUG (уровень 10) – Отладочная информация, используется для диагностики кода
@@ -1,20 +1,25 @@
 from abc import ABC, abstractmethod
+import atexit
 import os
 import sys
 import random
 import json
-import pandas as pd
+import time
 from time import sleep
 from datetime import datetime
 import subprocess
 import platform
 
-import undetected_chromedriver as uc
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.bidi.cdp import logger
-from webdriver_manager.chrome import ChromeDriverManager
-
+from src.logger.logger import get_logger
+from src.utils.DriverProfiler import get_profiler
+from src.utils.LocalProxy import LocalProxy
+from src.utils.PageClassifier import BLOCKED, ERROR as PAGE_ERROR, PageClassifier
+from src.utils.ProxyPool import get_proxy_pool
+from src.utils.RateLimiter import ERROR, OK, THROTTLED, domain_of, get_limiter
+from src.utils.RelevanceMatcher import MIN_SCORE, get_matcher
+from src.utils.StagePolicy import StageError, StagePolicy
 
+parser_logger = get_logger(__name__)
 
 
 class AbstractParser(ABC):
@@ -22,6 +27,25 @@ class AbstractParser(ABC):
 
     _filepath = ""
 
+    # Записи, ещё не сброшенные в _filepath; общий буфер всех экземпляров процесса
+    _pending = []
+
+    # Сколько записей копится в памяти до дозаписи в файл; None — прежний режим, когда файл
+    # перечитывается и перезаписывается целиком на каждый запрос
+    result_batch_size = 500
+
+    # Классификатор ответов магазина; парсер может задать свой с дополнительными маркерами
+    page_classifier = PageClassifier()
+
+    # Сколько раз можно сменить сессию браузера и повторить запрос после капчи или блокировки
+    max_session_rotations = 2
+
+    # Минимальная оценка релевантности карточки (см. RelevanceMatcher); 0.0 — сохранять все карточки с оценкой
+    relevance_threshold = MIN_SCORE
+
+    # Предельное время и повторы этапов parse() (см. StagePolicy)
+    stage_policy = StagePolicy()
+
     def __init__(self, url, request, items=[], version_chrome=None, telegram_sender=None):
         """
         Инициализатор парсера.
@@ -32,13 +56,15 @@ class AbstractParser(ABC):
         :param version_chrome: Версия Chrome (если используется Selenium)
         :param telegram_sender: Объект отправки уведомлений в Telegram (если используется)
         """
-        from src.logger.logger import parser_logger
         try:
             self.url = url
             self.request = request
             self.items = items
             self.version_chrome = version_chrome
-            self.data = []
+            # В режиме пачек self.data — только буфер ещё не сохранённых записей, а не все данные файла
+            self.data = AbstractParser._pending if self.result_batch_size else []
+            self.request_records = []  # Записи текущего запроса (их забирает рабочий процесс)
+            self.stage_timings = []  # (этап, сек, успешно) текущего запроса, для метрик запуска
             self.telegram_sender = telegram_sender
 
             # Определяем имя класса
@@ -47,19 +73,19 @@ class AbstractParser(ABC):
             # Проверяем, первый ли это вызов данного класса
             if _class_name not in AbstractParser._first_instance_called:
                 AbstractParser._first_instance_called[_class_name] = True
-                parser_logger.info(f"Первый вызов класса {self.__class__.__name__}")
+                parser_logger.info("Первый вызов класса %s", self.__class__.__name__)
             else:
                 AbstractParser._first_instance_called[_class_name] = False
-                parser_logger.warning(f"Повторный вызов класса {self.__class__.__name__}, _run_once() не будет запущен")
+                parser_logger.warning("Повторный вызов класса %s, _run_once() не будет запущен", self.__class__.__name__)
 
             # Вызываем _run_once(), если это первый экземпляр
             self._run_once()
 
             parser_logger.info(
-                f"Экземпляр парсера {self.__class__.__name__} успешно создан: URL={self.url}, Request={self.request}")
+                "Экземпляр парсера %s успешно создан: URL=%s, Request=%s", self.__class__.__name__, self.url, self.request)
 
         except Exception as e:
-            parser_logger.exception(f"Ошибка при инициализации {self.__class__.__name__}: {e}")
+            parser_logger.exception("Ошибка при инициализации %s: %s", self.__class__.__name__, e)
 
     def _is_first_instance(self):
         """ Проверяет, является ли этот объект первым экземпляром класса. """
@@ -67,14 +93,21 @@ class AbstractParser(ABC):
 
     def _setup(self, reuse_driver=None):
         """Sets up Chrome WebDriver or reuses an existing one."""
-        from src.logger.logger import parser_logger
         try:
             if reuse_driver:
                 self.driver = reuse_driver
-                parser_logger.info(f"{self.__class__.__name__}: Reusing existing Chrome WebDriver instance")
+                parser_logger.info("%s: Reusing existing Chrome WebDriver instance", self.__class__.__name__)
                 return
 
-            parser_logger.info(f"{self.__class__.__name__}: Настройка Chrome WebDriver")
+            if getattr(self, "driver", None) is not None:
+                self._quit_driver()  # Не оставляем предыдущий браузер висеть в памяти
+
+            parser_logger.info("%s: Настройка Chrome WebDriver", self.__class__.__name__)
+
+            # Selenium и undetected_chromedriver тяжёлые, поэтому загружаются при первом запуске браузера
+            import undetected_chromedriver as uc
+            from selenium.webdriver.chrome.options import Options
+            from webdriver_manager.chrome import ChromeDriverManager
 
             # Создание объекта настроек Chrome
             chrome_options = Options()
@@ -92,8 +125,23 @@ class AbstractParser(ABC):
             chrome_options.add_argument("--disable-blink-features=AutomationControlled")
             chrome_options.add_argument("--no-sandbox")  # Отключает режим песочницы (ускоряет запуск)
 
+            # Прокси закрепляется за сессией браузера до её закрытия (см. ProxyPool)
+            self._stop_local_proxy()  # Остался от прошлой попытки запуска, если браузер так и не открылся
+            self.proxy = None
+            proxy_pool = get_proxy_pool()
+            if proxy_pool is not None:
+                self.proxy = proxy_pool.acquire(id(self), domain_of(self.url))
+                if self.proxy is not None:
+                    server = self.proxy.server
+                    if self.proxy.has_credentials:
+                        # Chrome не передаёт логин и пароль прокси: их добавляет локальный пересылающий прокси
+                        self._local_proxy = LocalProxy(self.proxy.url).start()
+                        server = self._local_proxy.url
+                    chrome_options.add_argument(f"--proxy-server={server}")
+                    parser_logger.info("%s: Прокси сессии: %s", self.__class__.__name__, self.proxy.server)
+
             # Запуск Chrome с использованием webdriver-manager
-            parser_logger.info(f"{self.__class__.__name__}: Запуск Chrome WebDriver")
+            parser_logger.info("%s: Запуск Chrome WebDriver", self.__class__.__name__)
             self.driver = uc.Chrome(
                 options=chrome_options,
                 headless=False,
@@ -101,37 +149,240 @@ class AbstractParser(ABC):
                 driver_executable_path=ChromeDriverManager().install()  # Automatically manage ChromeDriver
             )
 
-            parser_logger.info(f"{self.__class__.__name__}: Chrome WebDriver успешно запущен")
+            parser_logger.info("%s: Chrome WebDriver успешно запущен", self.__class__.__name__)
 
         except Exception as e:
-            parser_logger.exception(f"{self.__class__.__name__}: Ошибка при запуске Chrome WebDriver: {e}")
+            parser_logger.exception("%s: Ошибка при запуске Chrome WebDriver: %s", self.__class__.__name__, e)
+            raise  # Без браузера продолжать бессмысленно, решение о повторе принимает StagePolicy
 
     def _quit_driver(self):
         """Closes the WebDriver explicitly."""
-        from src.logger.logger import parser_logger
         try:
             if hasattr(self, "driver") and self.driver is not None:
-                parser_logger.info(f"{self.__class__.__name__}: Quitting WebDriver")
+                parser_logger.info("%s: Quitting WebDriver", self.__class__.__name__)
                 self.driver.quit()
                 self.driver = None
+                proxy_pool = get_proxy_pool()
+                if proxy_pool is not None:
+                    proxy_pool.release(id(self))
+                self._stop_local_proxy()
             else:
-                parser_logger.warning(f"{self.__class__.__name__}: WebDriver already closed or not initialized")
+                parser_logger.warning("%s: WebDriver already closed or not initialized", self.__class__.__name__)
         except Exception as e:
-            parser_logger.exception(f"{self.__class__.__name__}: Error while quitting WebDriver: {e}")
+            parser_logger.exception("%s: Error while quitting WebDriver: %s", self.__class__.__name__, e)
+
+    def _stop_local_proxy(self):
+        local_proxy = getattr(self, "_local_proxy", None)
+        if local_proxy is not None:
+            local_proxy.stop()
+            self._local_proxy = None
 
     def _get_url(self, reload=False):
         """Loads the page in Chrome WebDriver. Reloads only if specified."""
-        from src.logger.logger import parser_logger
         try:
+            if getattr(self, "driver", None) is None:
+                self._setup()  # Браузер закрыт, например после смены сессии
             if reload or not hasattr(self, "_url_loaded") or not self._url_loaded:
-                parser_logger.info(f"{self.__class__.__name__}: Открытие URL {self.url}")
-                self.driver.get(self.url)
+                parser_logger.info("%s: Открытие URL %s", self.__class__.__name__, self.url)
+                self._throttled(lambda: self.driver.get(self.url))
                 self._url_loaded = True
-                parser_logger.info(f"{self.__class__.__name__}: Успешно загружен URL {self.url}")
+                parser_logger.info("%s: Успешно загружен URL %s", self.__class__.__name__, self.url)
             else:
-                parser_logger.info(f"{self.__class__.__name__}: URL {self.url} уже загружен, пропускаем повторную загрузку")
+                parser_logger.info("%s: URL %s уже загружен, пропускаем повторную загрузку", self.__class__.__name__, self.url)
         except Exception as e:
-            parser_logger.exception(f"{self.__class__.__name__}: Ошибка при загрузке URL {self.url}: {e}")
+            parser_logger.exception("%s: Ошибка при загрузке URL %s: %s", self.__class__.__name__, self.url, e)
+            raise
+
+    def _ensure_driver(self):
+        """Запускает браузер, если он ещё не запущен (или был закрыт при смене сессии)."""
+        if getattr(self, "driver", None) is None:
+            self._setup()
+        profiler = get_profiler()
+        if profiler is not None:
+            profiler.attach(self.driver)
+        self.driver.set_page_load_timeout(self.stage_policy.deadlines["navigate"])
+
+    def _set_stage_deadline(self, deadline):
+        self._stage_deadline = deadline
+
+    def _wait(self, timeout, scope=None):
+        """
+        WebDriverWait по драйверу или элементу `scope`, ограниченный временем, оставшимся у текущего этапа.
+
+        Когда время этапа вышло, ожидания не блокируют: отсутствующий элемент сразу даёт TimeoutException.
+        """
+        from selenium.webdriver.support.wait import WebDriverWait
+
+        deadline = getattr(self, "_stage_deadline", None)
+        if deadline is not None:
+            timeout = min(timeout, deadline.remaining())
+        wait = WebDriverWait(scope if scope is not None else self.driver, timeout)
+        profiler = get_profiler()
+        return profiler.wait(wait) if profiler is not None else wait
+
+    def _collect_results(self):
+        """Этап parse: загружает ранее сохранённые данные и разбирает страницу результатов."""
+        self._load_data()
+        self._pars_page()
+
+    def _store_results(self):
+        """Этап save: добавляет найденные карточки к данным и сохраняет их."""
+        self._add_request()
+        self._save_data()
+
+    def parse(self):
+        """
+        Запускает полный цикл парсинга одного запроса по этапам: setup, navigate, search, parse, save.
+
+        Этапы выполняются по правилам stage_policy: у каждого своё предельное время и число повторов.
+        После сбоя этапа остальные не запускаются, типизированная ошибка сохраняется в self.stage_failure.
+        """
+        parser_logger.info("%s: Начало парсинга для запроса '%s'", self.__class__.__name__, self.request)
+        self.stage_failure = None
+        self.request_records = []
+        started = time.monotonic()
+        profiler = get_profiler()
+        if profiler is not None:
+            profiler.set_context(self.__class__.__name__, self.request)
+
+        stages = (
+            ("setup", self._ensure_driver, None),
+            ("navigate", self._get_url, None),
+            # Перед повтором поиска страница открывается заново, чтобы не вводить запрос поверх прежнего
+            ("search", self._entering_request, lambda: self._get_url(reload=True)),
+            ("parse", self._collect_results, None),
+            ("save", self._store_results, None),
+        )
+        try:
+            for stage, action, before_retry in stages:
+                if profiler is not None:
+                    profiler.set_stage(stage)
+                stage_started = time.monotonic()
+                try:
+                    self.stage_policy.run(stage, action, before_retry=before_retry,
+                                          on_attempt=self._set_stage_deadline)
+                except StageError:
+                    self.stage_timings.append((stage, time.monotonic() - stage_started, False))
+                    raise
+                self.stage_timings.append((stage, time.monotonic() - stage_started, True))
+        except StageError as e:
+            self.stage_failure = e
+            parser_logger.error("%s: Запрос '%s' прерван: %s", self.__class__.__name__, self.request, e)
+        finally:
+            self._stage_deadline = None
+            if profiler is not None:
+                profiler.flush()
+
+        parser_logger.info("%s: Парсинг запроса '%s' завершён за %.1f с, записей %s", self.__class__.__name__,
+                           self.request, time.monotonic() - started, len(self.request_records))
+
+    def _navigation_outcome(self):
+        """Проверяет по заголовку и адресу страницы, не ответил ли сайт 429, капчей или блокировкой."""
+        try:
+            title, url = self.driver.title, self.driver.current_url
+        except Exception:
+            return OK
+        return THROTTLED if self.page_classifier.is_throttled(title, url) else OK
+
+    def classify_page(self):
+        """
+        Классифицирует текущую страницу после поиска (см. PageClassifier).
+
+        Считаются карточки до отбора по релевантности (self.cards_found, если парсер его ведёт): выдача,
+        в которой все карточки отсеяны, — всё равно ответ магазина с результатами, а не пустая страница.
+        """
+        cards_found = getattr(self, "cards_found", None)
+        if cards_found is None:
+            cards_found = len(getattr(self, "new_data", None) or [])
+        try:
+            title, url = self.driver.title, self.driver.current_url
+            text = self.driver.execute_script("return document.body ? document.body.innerText.slice(0, 5000) : '';")
+        except Exception:
+            title, url, text = "", "", ""
+        return self.page_classifier.classify(cards_found, title, url, text or "")
+
+    def _rotate_session(self):
+        """Закрывает браузер, чтобы следующий запрос пошёл из новой сессии с чистым профилем и другим прокси."""
+        parser_logger.warning("%s: Смена сессии браузера", self.__class__.__name__)
+        self._quit_driver()
+        self._url_loaded = False
+
+    def parse_with_recovery(self):
+        """
+        Запускает parse() и классифицирует ответ магазина.
+
+        При капче или блокировке сессия браузера меняется и запрос повторяется, не больше
+        max_session_rotations раз.
+
+        Если этап parse() не удался (self.stage_failure), ответ считается error, кроме капчи и блокировки.
+
+        :return: Класс ответа (results, empty, captcha, block или error), он же в self.page_status
+        """
+        for attempt in range(self.max_session_rotations + 1):
+            self.new_data = []
+            self.cards_found = None
+            self.request_records = []
+            if not attempt:
+                self.stage_timings = []  # Этапы всех попыток запроса, включая смены сессии
+            self.parse()
+            self.page_status = self.classify_page()
+            if getattr(self, "stage_failure", None) is not None and self.page_status not in BLOCKED:
+                self.page_status = PAGE_ERROR  # Этап не удался: пустой результат нельзя считать ответом магазина
+            if self.page_status not in BLOCKED or attempt == self.max_session_rotations:
+                break
+
+            parser_logger.warning("%s: Запрос '%s': %s, попытка %s из %s", self.__class__.__name__, self.request,
+                                  self.page_status, attempt + 1, self.max_session_rotations + 1)
+            get_limiter(self.url).report(0.0, THROTTLED, cooldown=self._domain_cooldown())
+            self._report_proxy(THROTTLED)  # Следующая сессия получит другой прокси
+            self._rotate_session()
+
+        parser_logger.info("%s: Запрос '%s': ответ магазина %s", self.__class__.__name__, self.request, self.page_status)
+        return self.page_status
+
+    def _throttled(self, action):
+        """
+        Выполняет навигацию (загрузку URL, клик поиска или пагинации) через ограничитель скорости домена
+        и сообщает ему длительность и результат.
+        """
+        limiter = get_limiter(self.url)
+        waited = limiter.acquire()
+        deadline = getattr(self, "_stage_deadline", None)
+        if deadline is not None:
+            deadline.extend(waited)  # Ожидание очереди к сайту не засчитывается во время этапа
+        started = time.monotonic()
+        try:
+            result = action()
+        except Exception:
+            limiter.report(time.monotonic() - started, ERROR)
+            self._report_proxy(ERROR)
+            raise
+        outcome = limiter.report(time.monotonic() - started, self._navigation_outcome(),
+                                 cooldown=self._domain_cooldown())
+        self._report_proxy(outcome)
+        return result
+
+    def _domain_cooldown(self):
+        """
+        Нужна ли пауза запросов ко всему домену после капчи или 429. Через прокси — нет: заблокированный
+        прокси пул отстраняет от домена, а новая сессия сразу идёт через другой. Без прокси все сессии
+        выходят с одного адреса, и пауза нужна.
+        """
+        return getattr(self, "proxy", None) is None
+
+    def _report_proxy(self, outcome):
+        """Передаёт пулу прокси результат навигации через прокси текущей сессии."""
+        proxy = getattr(self, "proxy", None)
+        proxy_pool = get_proxy_pool()
+        if proxy is None or proxy_pool is None:
+            return
+        domain = domain_of(self.url)
+        if outcome == THROTTLED:
+            proxy_pool.report_failure(proxy, domain, blocked=True)
+        elif outcome == ERROR:
+            proxy_pool.report_failure(proxy, domain)
+        else:
+            proxy_pool.report_success(proxy, domain)
 
     @abstractmethod
     def _run_once(self):
@@ -145,32 +396,51 @@ class AbstractParser(ABC):
     def _pars_page(self):
         pass
 
+    def _filter_relevant(self, cards):
+        """
+        Оставляет карточки страницы, описание которых относится к искомым артикулам `self.items`.
+
+        Все карточки проверяются одной пачкой, каждой записывается оценка в поле 'relevance'.
+        """
+        scores = get_matcher(self.items).score_batch([card.get('description') for card in cards])
+        relevant = []
+        for card, score in zip(cards, scores):
+            card['relevance'] = score
+            if score >= self.relevance_threshold:
+                relevant.append(card)
+
+        parser_logger.debug("%s: Релевантных карточек %s из %s", self.__class__.__name__, len(relevant), len(cards))
+        return relevant
+
     def _add_request(self):
         """Добавляет новые данные в self.data, связывая их с текущим запросом."""
-        from src.logger.logger import parser_logger
         try:
-            parser_logger.info(f"{self.__class__.__name__}: Добавление данных для запроса {self.request}")
+            parser_logger.info("%s: Добавление данных для запроса %s", self.__class__.__name__, self.request)
 
             # Проверка, есть ли новые данные
             if not hasattr(self, 'new_data') or not self.new_data:
-                parser_logger.warning(f"{self.__class__.__name__}: new_data пуст или отсутствует, данные не добавлены")
+                parser_logger.warning("%s: new_data пуст или отсутствует, данные не добавлены", self.__class__.__name__)
                 return
 
             for data in self.new_data:
                 new_data = {self.request: data}
                 self.data.append(new_data)
+                self.request_records.append(new_data)
 
-            parser_logger.info(f"{self.__class__.__name__}: Добавлено {len(self.new_data)} записей в self.data")
+            parser_logger.info("%s: Добавлено %s записей в self.data", self.__class__.__name__, len(self.new_data))
 
         except Exception as e:
             parser_logger.exception(
-                f"{self.__class__.__name__}: Ошибка при добавлении данных для запроса {self.request}: {e}")
+                "%s: Ошибка при добавлении данных для запроса %s: %s", self.__class__.__name__, self.request, e)
 
     def _load_data(self):
-        """Загружает данные из JSON-файла в self.data."""
-        from src.logger.logger import parser_logger
+        """Загружает данные из JSON-файла в self.data (в режиме пачек файл не перечитывается)."""
+        if self.result_batch_size:
+            self.data = AbstractParser._pending
+            return
+
         try:
-            parser_logger.info(f"{self.__class__.__name__}: Загрузка данных из файла {AbstractParser._filepath}")
+            parser_logger.info("%s: Загрузка данных из файла %s", self.__class__.__name__, AbstractParser._filepath)
 
             # Чтение файла
             with open(AbstractParser._filepath, 'r', encoding='utf-8') as file:
@@ -179,26 +449,30 @@ class AbstractParser(ABC):
             # Извлечение данных (игнорирование метаинформации)
             self.data = file_data.get("Данные", [])
 
-            parser_logger.info(f"{self.__class__.__name__}: Успешно загружено {len(self.data)} записей из JSON")
+            parser_logger.info("%s: Успешно загружено %s записей из JSON", self.__class__.__name__, len(self.data))
 
         except FileNotFoundError:
             parser_logger.error(
-                f"{self.__class__.__name__}: Файл {AbstractParser._filepath} не найден, загрузка данных невозможна")
+                "%s: Файл %s не найден, загрузка данных невозможна", self.__class__.__name__, AbstractParser._filepath)
             self.data = []
         except json.JSONDecodeError as e:
             parser_logger.error(
-                f"{self.__class__.__name__}: Ошибка декодирования JSON в {AbstractParser._filepath}: {e}")
+                "%s: Ошибка декодирования JSON в %s: %s", self.__class__.__name__, AbstractParser._filepath, e)
             self.data = []
         except Exception as e:
             parser_logger.exception(
-                f"{self.__class__.__name__}: Ошибка при загрузке данных из {AbstractParser._filepath}: {e}")
+                "%s: Ошибка при загрузке данных из %s: %s", self.__class__.__name__, AbstractParser._filepath, e)
             self.data = []
 
     def _save_data(self):
-        """Сохраняет данные в JSON-файл, обновляя или создавая его."""
-        from src.logger.logger import parser_logger
+        """Сохраняет данные в JSON-файл, обновляя или создавая его (в режиме пачек — когда буфер заполнен)."""
+        if self.result_batch_size:
+            if len(AbstractParser._pending) >= self.result_batch_size:
+                self.flush_data()
+            return
+
         try:
-            parser_logger.info(f"{self.__class__.__name__}: Сохранение данных в файл {AbstractParser._filepath}")
+            parser_logger.info("%s: Сохранение данных в файл %s", self.__class__.__name__, AbstractParser._filepath)
 
             # Попытка загрузить существующий файл, чтобы сохранить метаинформацию
             try:
@@ -207,11 +481,11 @@ class AbstractParser(ABC):
 
                 # Обновляем только поле "Данные"
                 file_data["Данные"] = self.data
-                parser_logger.info(f"{self.__class__.__name__}: Файл найден, обновляем данные")
+                parser_logger.info("%s: Файл найден, обновляем данные", self.__class__.__name__)
 
             except (json.JSONDecodeError, FileNotFoundError):
                 # Если файл отсутствует или повреждён, создаем новую структуру
-                parser_logger.warning(f"{self.__class__.__name__}: Файл отсутствует или повреждён, создаем новый")
+                parser_logger.warning("%s: Файл отсутствует или повреждён, создаем новый", self.__class__.__name__)
                 file_data = {
                     "Дата и время создания файла": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                     "Данные": self.data
@@ -222,42 +496,90 @@ class AbstractParser(ABC):
                 json.dump(file_data, file, ensure_ascii=False, indent=4)
 
             parser_logger.info(
-                f"{self.__class__.__name__}: Данные успешно сохранены в {AbstractParser._filepath}, записано {len(self.data)} записей")
+                "%s: Данные успешно сохранены в %s, записано %s записей", self.__class__.__name__, AbstractParser._filepath, len(self.data))
 
         except Exception as e:
             parser_logger.exception(
-                f"{self.__class__.__name__}: Ошибка при сохранении данных в {AbstractParser._filepath}: {e}")
+                "%s: Ошибка при сохранении данных в %s: %s", self.__class__.__name__, AbstractParser._filepath, e)
+
+    @staticmethod
+    def _append_json_records(filepath, records):
+        """
+        Дописывает записи в конец массива "Данные" (последний ключ файла) без чтения всего файла.
+
+        :raises ValueError: Если конец файла не похож на '...]}', например файл повреждён
+        """
+        with open(filepath, 'r+b') as file:
+            file.seek(0, os.SEEK_END)
+            tail_start = max(0, file.tell() - 4096)
+            file.seek(tail_start)
+            tail = file.read().rstrip()
+            if not tail.endswith(b"}"):
+                raise ValueError("файл не заканчивается объектом JSON")
+            body = tail[:-1].rstrip()
+            if not body.endswith(b"]"):
+                raise ValueError("последнее значение файла не массив")
+            before = body[:-1].rstrip()
+            if not before:
+                raise ValueError("не найдено начало массива")
+
+            lines = ",\n".join("        " + json.dumps(record, ensure_ascii=False) for record in records)
+            file.seek(tail_start + len(body) - 1)  # Позиция закрывающей скобки массива
+            file.truncate()
+            file.write(("\n" if before.endswith(b"[") else ",\n").encode() + lines.encode('utf-8') + b"\n    ]\n}\n")
+
+    @classmethod
+    def flush_data(cls):
+        """Дописывает накопленные записи в AbstractParser._filepath одной пачкой и очищает буфер."""
+        pending = AbstractParser._pending
+        if not pending or not AbstractParser._filepath:
+            return
+        try:
+            cls._append_json_records(AbstractParser._filepath, pending)
+        except (OSError, ValueError) as e:
+            # Файла нет или он повреждён: переписываем целиком, как в прежнем режиме
+            parser_logger.warning("%s: Дозапись в %s невозможна (%s), файл будет перезаписан", cls.__name__,
+                                  AbstractParser._filepath, e)
+            try:
+                with open(AbstractParser._filepath, 'r', encoding='utf-8') as file:
+                    file_data = json.load(file)
+            except (OSError, json.JSONDecodeError):
+                file_data = {"Дата и время создания файла": datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+            file_data["Данные"] = file_data.get("Данные", []) + pending
+            with open(AbstractParser._filepath, 'w', encoding='utf-8') as file:
+                json.dump(file_data, file, ensure_ascii=False, indent=4)
+
+        parser_logger.info("%s: В %s дописано %s записей", cls.__name__, AbstractParser._filepath, len(pending))
+        pending.clear()  # Очищаем на месте: экземпляры парсеров держат ссылку на этот список
 
     def _wait_for_debug(self):
         """Ожидает нажатие клавиши '8' для продолжения работы."""
-        from src.logger.logger import parser_logger
         try:
             parser_logger.info(
-                f"{self.__class__.__name__}: Включен режим ожидания отладки (нажмите '8' для продолжения)")
+                "%s: Включен режим ожидания отладки (нажмите '8' для продолжения)", self.__class__.__name__)
             print("Ожидание нажатия клавиши '8' для продолжения...")
 
             while True:
                 user_input = input("Введите '8' чтобы продолжить: ")
-                parser_logger.debug(f"{self.__class__.__name__}: Введено '{user_input}'")
+                parser_logger.debug("%s: Введено '%s'", self.__class__.__name__, user_input)
 
                 if user_input == "8":
-                    parser_logger.info(f"{self.__class__.__name__}: Ввод подтверждён, продолжаем выполнение")
+                    parser_logger.info("%s: Ввод подтверждён, продолжаем выполнение", self.__class__.__name__)
                     break
 
         except Exception as e:
-            parser_logger.exception(f"{self.__class__.__name__}: Ошибка во время ожидания отладки: {e}")
+            parser_logger.exception("%s: Ошибка во время ожидания отладки: %s", self.__class__.__name__, e)
 
 
     @staticmethod
     def clear_terminal():
         """Очищает терминал в Windows, Linux, macOS и поддерживает PyCharm/VSCode."""
-        from src.logger.logger import parser_logger
         try:
             parser_logger.info("Очистка терминала запущена")
 
             # Определяем ОС
             os_type = "Windows" if os.name == 'nt' else "Linux/macOS"
-            parser_logger.debug(f"Операционная система: {os_type}")
+            parser_logger.debug("Операционная система: %s", os_type)
 
             # Альтернативная очистка (работает в PyCharm/VSCode)
             print("\n" * 100)
@@ -285,23 +607,26 @@ class AbstractParser(ABC):
             parser_logger.info("Очистка терминала выполнена успешно")
 
         except Exception as e:
-            parser_logger.exception(f"Ошибка очистки терминала: {e}")
+            parser_logger.exception("Ошибка очистки терминала: %s", e)
 
     def __del__(self):
         """Закрывает WebDriver при удалении объекта."""
-        from src.logger.logger import parser_logger
         try:
             if hasattr(self, "driver") and self.driver is not None:
-                parser_logger.info(f"{self.__class__.__name__}: Завершение WebDriver")
+                parser_logger.info("%s: Завершение WebDriver", self.__class__.__name__)
                 self.driver.quit()
-                parser_logger.info(f"{self.__class__.__name__}: WebDriver успешно завершён")
+                parser_logger.info("%s: WebDriver успешно завершён", self.__class__.__name__)
             else:
-                parser_logger.warning(f"{self.__class__.__name__}: WebDriver уже был закрыт или не инициализирован")
+                parser_logger.warning("%s: WebDriver уже был закрыт или не инициализирован", self.__class__.__name__)
 
         except Exception as e:
-            parser_logger.exception(f"{self.__class__.__name__}: Ошибка при завершении WebDriver: {e}")
+            parser_logger.exception("%s: Ошибка при завершении WebDriver: %s", self.__class__.__name__, e)
+
+
 
 
+# Остаток буфера сохраняется при обычном завершении программы (рабочие процессы вызывают flush_data сами)
+atexit.register(AbstractParser.flush_data)
 
 
 class Loading_Source_Data:
@@ -311,30 +636,25 @@ class Loading_Source_Data:
 
         :param file_path: Путь к Excel-файлу.
         """
-        from src.logger.logger import parser_logger
         self.file_path = file_path
-        parser_logger.info(f"Инициализирован загрузчик данных, файл: {self.file_path}")
+        parser_logger.info("Инициализирован загрузчик данных, файл: %s", self.file_path)
 
     def loading_articles(self):
-        """Загружает артикулы из первого столбца Excel-файла."""
-        from src.logger.logger import parser_logger
+        """Загружает уникальные артикулы из первого столбца (или столбца «Артикул») Excel- или CSV-файла."""
+        from src.utils.ArticleLoader import ArticleLoader
+
         try:
-            parser_logger.info(f"Загрузка артикулов из файла: {self.file_path}")
+            parser_logger.info("Загрузка артикулов из файла: %s", self.file_path)
 
-            # Читаем Excel
-            articles = pd.read_excel(self.file_path, sheet_name=0, usecols=[0], header=None)
-            articles_list = articles.iloc[:, 0].dropna().astype(str).tolist()
+            # Файл читается потоково, без загрузки всего листа в память
+            articles_list = [row.article for row in ArticleLoader(self.file_path).rows()]
 
-            parser_logger.info(f"Успешно загружено {len(articles_list)} артикулов из {self.file_path}")
+            parser_logger.info("Успешно загружено %s артикулов из %s", len(articles_list), self.file_path)
             return articles_list
 
         except FileNotFoundError:
-            parser_logger.error(f"Файл {self.file_path} не найден, загрузка невозможна")
-            return []
-        except pd.errors.EmptyDataError:
-            parser_logger.error(f"Файл {self.file_path} пуст, данные не загружены")
+            parser_logger.error("Файл %s не найден, загрузка невозможна", self.file_path)
             return []
         except Exception as e:
-            parser_logger.exception(f"Ошибка при загрузке артикулов из {self.file_path}: {e}")
+            parser_logger.exception("Ошибка при загрузке артикулов из %s: %s", self.file_path, e)
             return []
-
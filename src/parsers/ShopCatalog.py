@@ -0,0 +1,197 @@
+"""
+Описания магазинов для ShopEngine.
+
+Модуль импортирует только ShopDefinition, поэтому список магазинов строится без Selenium.
+Чтобы добавить магазин, опишите его здесь и добавьте в SHOP_DEFINITIONS: он появится в GUI и CLI.
+
+Селекторы с хешированными классами (mui-style-…, _2rw4E, …__e15tmk) ломаются при обновлении сайта,
+поэтому за ними в цепочке стоят запасные: data-атрибуты и устойчивые части имён классов. canary —
+контрольный запрос, по которому магазин проверяется перед запуском (см. ShopHealth).
+"""
+from src.parsers.ShopDefinition import Field, Pagination, ShopDefinition, Step
+from src.utils.RelevanceMatcher import MIN_SCORE
+
+CHIPDIP = ShopDefinition(
+    key="ChipDip",
+    shop_id=1,
+    site_url="https://www.chipdip.ru/",
+    canary="LM317",
+    search_steps=(
+        Step("type", '[class="header__input header__search-input auc__input"]', timeout=10,
+             label="Поле ввода поиска"),
+        Step("click", '[class="btn-reset header__button header__search-button"]', timeout=10, navigates=True,
+             label="Кнопка поиска"),
+    ),
+    cards_selector='[class="with-hover"]',
+    fields=(
+        Field("name", "b"),
+        Field("description", "a", "innerText", default="Описание не загружено", required=True),
+        Field("url", ('[class="link"]', "a.link"), "href", required=True),
+        Field("price", ("span.price-main > span", ".price-main")),
+        Field("cards_ID", None, "id"),
+    ),
+)
+
+EBAY = ShopDefinition(
+    key="eBay",
+    shop_id=2,
+    site_url="https://www.ebay.com/",
+    canary="LM317",
+    search_steps=(
+        Step("type", ('[class="gh-search-input gh-tb ui-autocomplete-input"]', "input.gh-search-input", "#gh-ac"),
+             label="Поле ввода поиска"),
+        Step("click", ('[class="gh-search-button btn btn--primary"]', "button.gh-search-button", "#gh-btn"),
+             navigates=True, label="Кнопка поиска"),
+    ),
+    cards_selector=('[class="s-item s-item__pl-on-bottom"]', "li.s-item"),
+    cards_timeout=0,
+    fields=(
+        Field("description", ('[role="heading"]', ".s-item__title"), "innerText", required=True),
+        Field("url", ('[class="s-item__link"]', "a.s-item__link"), "href", required=True),
+        Field("price", "span.s-item__price", "innerText"),
+        Field("cards_ID", None, "id"),
+    ),
+    relevance_threshold=MIN_SCORE,
+)
+
+ETM = ShopDefinition(
+    key="ETM",
+    shop_id=3,
+    site_url="https://www.etm.ru/",
+    canary="ВА47-29",
+    search_steps=(
+        Step("type", ('[class="MuiInputBase-input MuiOutlinedInput-input MuiInputBase-inputAdornedStart '
+                      'MuiInputBase-inputAdornedEnd mui-style-17dpdqx"]',
+                      "input.MuiInputBase-inputAdornedStart.MuiInputBase-inputAdornedEnd"), label="Поле ввода поиска"),
+        Step("click", '[data-testid="okay-button"]', timeout=2, optional=True, label="Ваш город -> ДА"),
+        Step("click", '[data-testid="understand-button"]', timeout=2, optional=True,
+             label="Использовать куки -> Ок"),
+        Step("click", '[data-testid="catalog-search-button-adaptive"]', navigates=True, label="Кнопка 'Найти'"),
+    ),
+    # Уменьшенный масштаб показывает больше карточек
+    page_script="document.body.style.zoom='0.25';",
+    cards_selector=('[class="tss-o60ib4-grid_item"]', '[class*="-grid_item"]',
+                    '[data-testid^="catalog-list-item"]'),
+    # Цены догружаются после карточек
+    ready_selector=('[class="MuiTypography-root MuiTypography-title4 tss-1mz6fdu-priceColor-priceCount '
+                    'mui-style-1rtbk0o"]', '[class*="priceCount"]'),
+    fields=(
+        Field("description", ('[class="MuiTypography-root MuiTypography-inherit MuiLink-root '
+                              'MuiLink-underlineHover tss-lrg5ji-root-blue-title mui-style-i8aqv9"]',
+                              'a[class*="blue-title"]'), "innerText", required=True),
+        Field("url", "a.MuiTypography-root.MuiTypography-inherit.MuiLink-root.MuiLink-underlineHover", "href",
+              required=True),
+        Field("price", ('[class="MuiTypography-root MuiTypography-title4 tss-1mz6fdu-priceColor-priceCount '
+                        'mui-style-1rtbk0o"]', '[class*="priceCount"]')),
+        Field("product_code", ('[class="tss-ao7i46-text MuiBox-root mui-style-0"]', '[class*="-text"].MuiBox-root')),
+        Field("article", ('[class="tss-9cdrin-good_descr_value"]', '[class*="good_descr_value"]')),
+    ),
+)
+
+YANDEX_MARKET = ShopDefinition(
+    key="YandexMarket",
+    shop_id=4,
+    site_url="https://market.yandex.ru/",
+    canary="LM317",
+    search_steps=(
+        Step("click", '[class="ds-button ds-button_variant_text ds-button_type_primary ds-button_size_m '
+                      'ds-button_brand_market"]', timeout=10, optional=True, label="Баннер"),
+        Step("click", '[class="PreviousStepButton PreviousStepButton_alignVertical"]', timeout=10, optional=True,
+             label="Кнопка 'Назад'"),
+        Step("type", ('[class="_3TbaT mini-suggest__input"]', "input.mini-suggest__input"), timeout=10,
+             label="Поле ввода поиска"),
+        Step("click", ('[class="_30-fz button-focus-ring MySdj _1VU42 _2rdh3 mini-suggest__button"]',
+                       "button.mini-suggest__button"), navigates=True, label="Кнопка поиска"),
+    ),
+    cards_selector=("div._2rw4E._2O5qi", '[data-zone-name="productSnippet"]'),
+    ready_selector="div[data-baobab-name='price'] span.ds-visuallyHidden",
+    fields=(
+        Field("description", ('[itemprop="name"]', '[data-auto="snippet-title"]'), required=True),
+        Field("url", ("a.EQlfk.Gqfzd", 'a[href*="/product"]'), "href", required=True),
+        Field("price", "div[data-baobab-name='price'] span.ds-visuallyHidden"),
+    ),
+    relevance_threshold=MIN_SCORE,
+)
+
+BONPET = ShopDefinition(
+    key="Bonpet.tech",
+    class_name="BonpetParser",
+    shop_id=5,
+    site_url="https://bonpet.tech/",
+    json_folder="data/JSON/BonpetData",
+    search_steps=(
+        Step("type", '[class="form-control"]', label="Поле ввода поиска"),
+        Step("click", '[class="button-search"]', navigates=True, label="Кнопка поиска"),
+    ),
+    cards_selector='[class="product-item"]',
+    cards_timeout=0,
+    fields=(
+        Field("description", ('[class="name textS tight pt-2"]', ".name"), "innerText", required=True),
+        Field("url", "a", "href", required=True),
+        Field("price", '[class="price"]', "innerText"),
+        Field("cards_ID", None, "id"),
+    ),
+)
+
+ALIEXPRESS = ShopDefinition(
+    key="Aliexpress",
+    shop_id=6,
+    site_url="https://aliexpress.ru/",
+    keep_browser=True,
+    canary="LM317",
+    # Первый запрос сессии вводится как у человека и прогревает сессию, следующие открываются ссылкой
+    search_url="https://aliexpress.ru/wholesale?SearchText={query}",
+    search_steps=(
+        Step("click", '[class="ShipToHeaderItem_ButtonCTA__button__17o6s ShipToHeaderItem_Button__button__wso54 '
+                      'ShipToHeaderItem_GeoTooltip__mapGeoButton__h6wam"]', timeout=10, optional=True,
+             label="Кнопка 'Верно'"),
+        Step("pause", seconds=(1.0, 2.0)),
+        Step("type", ('[class="RedSearchBar_RedSearchBar__input__7hkcj"]', '[class*="RedSearchBar__input"]'),
+             timeout=10, clear=True, humanize=(0.05, 0.2), label="Поле ввода поиска"),
+        Step("pause", seconds=(1.0, 3.0)),
+        Step("click", ('[class="RedSearchBar_RedSearchBar__submit__7hkcj"]', '[class*="RedSearchBar__submit"]'),
+             timeout=10, clickable=True, navigates=True, label="Кнопка поиска"),
+        Step("pause", seconds=(1.0, 3.0)),
+    ),
+    cards_selector=('[class="red-snippet_RedSnippet__mainBlock__e15tmk"]', '[class*="RedSnippet__mainBlock"]'),
+    fields=(
+        Field("description", (".red-snippet_RedSnippet__title__e15tmk", '[class*="RedSnippet__title"]'),
+              required=True),
+        Field("url", (".red-snippet_RedSnippet__content__e15tmk", '[class*="RedSnippet__content"]'), "href",
+              required=True),
+        Field("price", (".red-snippet_RedSnippet__priceNew__e15tmk span", '[class*="RedSnippet__priceNew"] span')),
+    ),
+)
+
+ZAKUPKI = ShopDefinition(
+    key="Zakupki",
+    shop_id=7,
+    site_url="https://www.zakupki.ru/",
+    canary="кабель",
+    search_steps=(
+        Step("pause", seconds=(3.0, 3.0)),
+        Step("click_at", offset=(10, 10), optional=True, label="Скрыть информационное окно"),
+        Step("click", '[class="main-link  _order "]', optional=True, label="Меню закупки"),
+        Step("check", '[id="af"]', optional=True, label="Чекбокс 'Подача заявок'"),
+        Step("check", '[id="ca"]', optional=True, label="Чекбокс 'Работа комиссии'"),
+        Step("uncheck", '[id="pc"]', optional=True, label="Чекбокс 'Закупка завершена'"),
+        Step("uncheck", '[id="pa"]', optional=True, label="Чекбокс 'Закупка отменена'"),
+        Step("js_click", '[class="btn btn-primary"]', optional=True, label="Кнопка 'Применить'"),
+        Step("type", '[id="searchString"]', label="Поле ввода поиска"),
+        Step("click", '[class="search__btn"]', navigates=True, label="Кнопка поиска"),
+    ),
+    cards_selector='[class="row no-gutters registry-entry__form mr-0"]',
+    cards_timeout=0,
+    fields=(
+        Field("description", ".registry-entry__body-value", required=True),
+        Field("url", '[target="_blank"]', "href", required=True),
+        Field("price", '[class="price-block__value"]', "innerText"),
+    ),
+    pagination=Pagination("a.paginator-button.paginator-button-next", timeout=10),
+    # В описаниях закупок артикул часто не указан, поэтому карточки только оцениваются, но не отбрасываются
+    relevance_threshold=0.0,
+    # Этап parse включает пагинацию, поэтому на него отводится больше времени
+    stage_deadlines={"parse": 600.0},
+)
+
+SHOP_DEFINITIONS = (CHIPDIP, EBAY, ETM, YANDEX_MARKET, BONPET, ALIEXPRESS, ZAKUPKI)
@@ -0,0 +1,235 @@
+def _check_selector(selector):
+    """Проверяет CSS-селектор без браузера: непустой, скобки и кавычки закрыты."""
+    if not isinstance(selector, str) or not selector.strip():
+        raise ValueError(f"Пустой селектор: {selector!r}")
+    closing = {"[": "]", "(": ")"}
+    stack = []
+    quote = None
+    for char in selector:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in closing:
+            stack.append(closing[char])
+        elif char in ")]":
+            if not stack or stack.pop() != char:
+                raise ValueError(f"Лишняя скобка {char!r} в селекторе {selector!r}")
+    if quote or stack:
+        raise ValueError(f"Незакрытая кавычка или скобка в селекторе {selector!r}")
+    return selector.strip()
+
+
+def selector_chain(selectors):
+    """
+    Цепочка селекторов: основной и запасные, которые пробуются по порядку, если основной ничего не нашёл.
+
+    Хешированные классы (mui-style-i8aqv9, _2rw4E) меняются при обновлении сайта, поэтому за ними
+    ставят более устойчивые селекторы (data-атрибуты, части имён классов).
+
+    :param selectors: Строка или последовательность строк
+    :return: Кортеж проверенных селекторов
+    """
+    if isinstance(selectors, str):
+        selectors = (selectors,)
+    chain = tuple(_check_selector(selector) for selector in selectors)
+    if not chain:
+        raise ValueError("Пустая цепочка селекторов")
+    return chain
+
+
+class Step:
+    """
+    Шаг поиска на сайте.
+
+    Действия:
+        "type"      — ввести запрос в поле selector (с humanize — по символу со случайными паузами)
+        "click"     — нажать на элемент
+        "js_click"  — нажать через JavaScript (элемент перекрыт или не кликабелен для Selenium)
+        "check"     — включить чекбокс, если он выключен; "uncheck" — выключить
+        "click_at"  — щелчок мыши со смещением offset от текущего положения (закрыть всплывающее окно)
+        "script"    — выполнить JavaScript из value
+        "pause"     — случайная пауза от seconds[0] до seconds[1] сек
+    """
+
+    ACTIONS = ("type", "click", "js_click", "check", "uncheck", "click_at", "script", "pause")
+
+    __slots__ = ("action", "selector", "timeout", "optional", "navigates", "clickable", "humanize", "clear",
+                 "offset", "value", "seconds", "label")
+
+    def __init__(self, action, selector=None, timeout=0, optional=False, navigates=False, clickable=False,
+                 humanize=None, clear=False, offset=(10, 10), value=None, seconds=(0.0, 0.0), label=None):
+        """
+        :param action: Действие (см. ACTIONS)
+        :param selector: CSS-селектор элемента или цепочка селекторов (см. selector_chain)
+        :param timeout: Сколько ждать появления элемента, сек (0 — искать сразу, без ожидания)
+        :param optional: Элемента может не быть (баннер, выбор города): ошибка только пишется в лог
+        :param navigates: Действие загружает новую страницу и идёт через ограничитель скорости
+        :param clickable: Ждать, пока элемент станет кликабельным, а не просто появится
+        :param humanize: Границы паузы между символами запроса, сек, например (0.05, 0.2); None — ввод целиком
+        :param clear: Очистить поле перед вводом
+        :param offset: Смещение для click_at
+        :param value: JavaScript для script
+        :param seconds: Границы паузы для pause
+        :param label: Название шага для логов (например, "Кнопка 'Найти'")
+        """
+        if action not in self.ACTIONS:
+            raise ValueError(f"Неизвестное действие шага: {action}")
+        if selector is None and action not in ("click_at", "script", "pause"):
+            raise ValueError(f"Шагу {action} нужен selector")
+        self.action = action
+        self.selector = selector_chain(selector) if selector is not None else None
+        self.timeout = timeout
+        self.optional = optional
+        self.navigates = navigates
+        self.clickable = clickable
+        self.humanize = humanize
+        self.clear = clear
+        self.offset = offset
+        self.value = value
+        self.seconds = seconds
+        self.label = label or (f"{action} {self.selector[0]}" if selector else action)
+
+    def __repr__(self):
+        return f"Step({self.label!r})"
+
+
+# Значения по умолчанию, как их писали парсеры магазинов (PriceNormalizer понимает 'Цена не найдена')
+FIELD_DEFAULTS = {
+    "name": "Имя не найдено",
+    "description": "Описание не найдено",
+    "url": "Ссылка не найдена",
+    "price": "Цена не найдена",
+    "cards_ID": "ID не найден",
+    "product_code": "Код продукта не найден",
+    "article": "Артикул не найден",
+}
+
+
+def _strip(value):
+    return value.strip()
+
+
+class Field:
+    """Поле карточки товара: где его искать внутри карточки и какой атрибут брать."""
+
+    __slots__ = ("name", "selector", "attribute", "default", "normalize", "required")
+
+    def __init__(self, name, selector=None, attribute="text", default=None, normalize=_strip, required=False):
+        """
+        :param name: Ключ поля в записи ('description', 'price', ...)
+        :param selector: CSS-селектор внутри карточки или цепочка селекторов (None — сама карточка)
+        :param attribute: "text" (видимый текст), "innerText", "href", "id" или другое свойство/атрибут элемента
+        :param default: Значение, если элемента нет или он пуст (по умолчанию из FIELD_DEFAULTS)
+        :param normalize: Обработка найденной строки (по умолчанию — обрезать пробелы)
+        :param required: Поле есть у любой исправной выдачи; проверка магазина (ShopHealth) считает его
+                         пропажу во всех карточках поломкой селектора
+        """
+        self.name = name
+        self.selector = selector_chain(selector) if selector is not None else None
+        self.attribute = attribute
+        self.default = default if default is not None else FIELD_DEFAULTS.get(name, f"{name} не найдено")
+        self.normalize = normalize
+        self.required = required
+
+    def __repr__(self):
+        return f"Field({self.name!r}, {self.selector!r}, {self.attribute!r})"
+
+
+class Pagination:
+    """Переход по страницам выдачи кнопкой "Следующая страница"."""
+
+    __slots__ = ("next_selector", "max_pages", "timeout")
+
+    def __init__(self, next_selector, max_pages=50, timeout=10):
+        """
+        :param next_selector: CSS-селектор кнопки следующей страницы или цепочка селекторов
+        :param max_pages: Сколько страниц разбирать не больше
+        :param timeout: Сколько ждать кнопку и смену страницы, сек
+        """
+        self.next_selector = selector_chain(next_selector)
+        self.max_pages = max_pages
+        self.timeout = timeout
+
+
+class ShopDefinition:
+    """
+    Описание магазина для ShopEngine: как искать, где карточки и поля, как листать страницы.
+
+    Один движок выполняет все описания, поэтому ускорения движка (например, разбор всех карточек страницы
+    одним запросом к браузеру) действуют для всех магазинов сразу. Новый магазин — это новое описание
+    в ShopCatalog, без отдельного класса парсера.
+    """
+
+    def __init__(self, key, shop_id, site_url, cards_selector, fields, search_steps=(), search_url=None,
+                 json_folder=None, cards_timeout=10, ready_selector=None, ready_timeout=5, page_script=None,
+                 pagination=None, keep_browser=False, relevance_threshold=None, stage_deadlines=None,
+                 class_name=None, canary=None):
+        """
+        :param key: Название магазина (ключ SHOP_MAP) и имя класса парсера без "Parser"
+        :param shop_id: Порядковый номер магазина в списках GUI и CLI
+        :param site_url: Стартовая страница сайта
+        :param cards_selector: CSS-селектор карточки товара в выдаче или цепочка селекторов
+        :param fields: Поля карточки (Field)
+        :param search_steps: Шаги поиска на странице сайта (Step)
+        :param search_url: Адрес выдачи с {query} вместо запроса, если поиск можно открыть ссылкой. Вместе
+                           с search_steps шаги выполняются только для первого запроса сессии браузера
+                           (и после её смены при блокировке), дальше выдача открывается ссылкой
+        :param json_folder: Папка JSON магазина (по умолчанию data/JSON/<key>Data)
+        :param cards_timeout: Сколько ждать первую карточку, сек (0 — не ждать: выдача уже загружена)
+        :param ready_selector: Элемент, который догружается после карточек (например, цена); его ждут один
+                               раз на страницу вместо ожиданий в каждой карточке
+        :param ready_timeout: Сколько ждать ready_selector, сек
+        :param page_script: JavaScript, выполняемый перед разбором страницы
+        :param pagination: Pagination, если нужно листать выдачу
+        :param keep_browser: Не закрывать браузер между артикулами
+        :param relevance_threshold: Минимальная оценка релевантности карточки (None — карточки не фильтруются)
+        :param stage_deadlines: {этап: сек} поверх DEFAULT_DEADLINES (см. StagePolicy)
+        :param class_name: Имя класса парсера (по умолчанию <key>Parser); им подписаны логи и профиль
+        :param canary: Контрольный запрос, по которому у исправного магазина всегда есть карточки
+                       (проверка перед запуском, см. ShopHealth); None — не проверять
+        """
+        if not fields:
+            raise ValueError(f"{key}: не заданы поля карточки")
+        if not search_steps and not search_url:
+            raise ValueError(f"{key}: нужен search_url или search_steps")
+        if search_url is not None and "{query}" not in search_url:
+            raise ValueError(f"{key}: в search_url нет {{query}}")
+        names = [field.name for field in fields]
+        if len(set(names)) != len(names):
+            raise ValueError(f"{key}: повторяются поля {names}")
+
+        self.key = key
+        self.shop_id = shop_id
+        self.site_url = site_url
+        self.cards_selector = selector_chain(cards_selector)
+        self.fields = tuple(fields)
+        self.search_steps = tuple(search_steps)
+        self.search_url = search_url
+        self.json_folder = json_folder or f"data/JSON/{key}Data"
+        self.cards_timeout = cards_timeout
+        self.ready_selector = selector_chain(ready_selector) if ready_selector else None
+        self.ready_timeout = ready_timeout
+        self.page_script = page_script
+        self.pagination = pagination
+        self.keep_browser = keep_browser
+        self.relevance_threshold = relevance_threshold
+        self.stage_deadlines = dict(stage_deadlines or {})
+        self.class_name = class_name or f"{key}Parser"
+        if not self.class_name.isidentifier():
+            raise ValueError(f"{key}: имя класса {self.class_name!r} недопустимо, задайте class_name")
+        self.canary = canary
+
+        # Аргументы извлечения карточек собираются один раз, а не на каждой странице (см. ShopEngine)
+        self.extract_args = (list(self.cards_selector),
+                             [[field.name, list(field.selector) if field.selector else None, field.attribute]
+                              for field in self.fields])
+
+    def registry_entry(self, parser_path):
+        """Запись для SHOP_MAP."""
+        return {"id": self.shop_id, "site_name": self.site_url, "json_folder": self.json_folder,
+                "parser": parser_path, "keep_browser": self.keep_browser}
+
+    def __repr__(self):
+        return f"ShopDefinition({self.key!r})"
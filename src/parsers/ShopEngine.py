@@ -0,0 +1,413 @@
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime
+from urllib.parse import quote_plus
+
+from src.logger.logger import get_logger
+from src.parsers.AbstractParser import AbstractParser
+from src.utils.DriverProfiler import get_profiler
+from src.utils.StagePolicy import StagePolicy
+
+parser_logger = get_logger(__name__)
+
+# Все карточки страницы и их поля разбираются одним вызовом JavaScript вместо нескольких команд
+# WebDriver на каждую карточку. Карточки и поля ищутся по цепочкам селекторов: следующий селектор
+# пробуется, только если предыдущий ничего не нашёл. Поле: [имя, цепочка или null (сама карточка), атрибут].
+# hits — сколько раз сработал каждый селектор цепочки поля, cardsChoice — номер селектора карточек.
+# Для профилировщика скрипт замеряет поиски: cardsTimes — мс на каждый опробованный селектор карточек,
+# tries и times — число поисков и суммарные мс по каждому селектору цепочки поля.
+EXTRACT_CARDS_JS = """
+const [cardsSelectors, fields] = arguments;
+let cards = [];
+let cardsChoice = -1;
+const cardsTimes = [];
+for (let i = 0; i < cardsSelectors.length && !cards.length; i++) {
+    const started = performance.now();
+    cards = document.querySelectorAll(cardsSelectors[i]);
+    cardsTimes.push(performance.now() - started);
+    if (cards.length) cardsChoice = i;
+}
+const hits = fields.map(([, selectors]) => (selectors || []).map(() => 0));
+const tries = fields.map(([, selectors]) => (selectors || []).map(() => 0));
+const times = fields.map(([, selectors]) => (selectors || []).map(() => 0));
+const rows = Array.from(cards, card => {
+    const values = {};
+    fields.forEach(([name, selectors, attribute], index) => {
+        let element = selectors === null ? card : null;
+        for (let i = 0; selectors !== null && i < selectors.length && !element; i++) {
+            const started = performance.now();
+            element = card.querySelector(selectors[i]);
+            times[index][i] += performance.now() - started;
+            tries[index][i]++;
+            if (element) hits[index][i]++;
+        }
+        let value = null;
+        if (element) {
+            if (attribute === "text") {
+                value = element.innerText;
+            } else {
+                value = element[attribute] ?? element.getAttribute(attribute);
+            }
+        }
+        values[name] = value === null || value === undefined ? null : String(value);
+    });
+    return values;
+});
+return {cards: rows, cardsChoice: cardsChoice, hits: hits, cardsTimes: cardsTimes, tries: tries, times: times};
+"""
+
+
+class ShopEngineParser(AbstractParser):
+    """
+    Парсер, который выполняет описание магазина (ShopDefinition): поиск по ссылке или шагами на сайте,
+    разбор карточек выдачи одним запросом к браузеру и перелистывание страниц.
+
+    Класс парсера конкретного магазина создаёт parser_for().
+    """
+
+    definition = None
+
+    # Логгер магазина; parser_for() заменяет его на логгер src.parsers.<Имя>Parser, чтобы уровни логов
+    # по магазинам (--log-levels) задавались как прежде
+    shop_logger = parser_logger
+
+    # Запасные селекторы, о срабатывании которых процесс уже сообщил: (поле, селектор)
+    _fallbacks_reported = set()
+
+    def _run_once(self):
+        """Создаёт JSON-файл с данными в папке магазина, если метод вызывается впервые."""
+        try:
+            if self._is_first_instance():
+                self.shop_logger.info("%s: Первый вызов _run_once(), создаём JSON-файл", self.__class__.__name__)
+
+                directory = self.definition.json_folder
+                current_time = datetime.now().strftime("%H-%M-%S_%d-%m-%Y")
+                filename = f"{os.path.basename(directory.rstrip('/'))}_{current_time}.json"
+                AbstractParser._filepath = os.path.join(directory, filename)
+                os.makedirs(directory, exist_ok=True)
+
+                metadata = {
+                    "Дата и время создания файла": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    "Данные": self.data
+                }
+                with open(AbstractParser._filepath, 'w', encoding='utf-8') as file:
+                    json.dump(metadata, file, ensure_ascii=False, indent=4)
+
+                self.shop_logger.info(
+                    "%s: Файл %s успешно создан, записано %s записей", self.__class__.__name__, filename, len(self.data))
+            else:
+                self.shop_logger.warning(
+                    "%s: Метод _run_once() уже был вызван ранее, повторный запуск игнорируется", self.__class__.__name__)
+
+        except Exception as e:
+            self.shop_logger.exception("%s: Ошибка при выполнении _run_once(): %s", self.__class__.__name__, e)
+
+    def _find(self, selectors, timeout=0, clickable=False, name="элемент"):
+        """
+        Находит элемент по цепочке CSS-селекторов: первый селектор, который что-то нашёл.
+
+        С timeout ожидание одно на всю цепочку (любой из селекторов), а не полный тайм-аут на каждый.
+        """
+        if timeout:
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support import expected_conditions as EC
+
+            condition = EC.element_to_be_clickable if clickable else EC.presence_of_element_located
+            found = self._wait(timeout).until(condition((By.CSS_SELECTOR, ", ".join(selectors))))
+            if len(selectors) == 1:
+                return found
+
+        error = None
+        for index, selector in enumerate(selectors):
+            try:
+                element = self.driver.find_element("css selector", selector)
+            except Exception as e:
+                error = e
+                continue
+            if index:
+                self._report_fallback(name, selector)
+            return element
+        raise error
+
+    def _report_fallback(self, name, selector):
+        """Сообщает (один раз за процесс), что основной селектор больше не находит элемент."""
+        key = (self.__class__.__name__, name, selector)
+        if key in ShopEngineParser._fallbacks_reported:
+            return
+        ShopEngineParser._fallbacks_reported.add(key)
+        self.shop_logger.warning("%s: Основной селектор '%s' не сработал, используется запасной %s",
+                                 self.__class__.__name__, name, selector)
+
+    def _navigate(self, step, action):
+        """Действие, которое загружает новую страницу, идёт через ограничитель скорости домена."""
+        return self._throttled(action) if step.navigates else action()
+
+    def _type(self, element, step):
+        if step.clear:
+            element.clear()
+        if not step.humanize:
+            element.send_keys(self.request)
+            return
+        low, high = step.humanize
+        for char in self.request:
+            element.send_keys(char)
+            time.sleep(random.uniform(low, high))
+
+    def _run_step(self, step):
+        """Выполняет шаг поиска; ошибка необязательного шага только пишется в лог."""
+        try:
+            if step.action == "pause":
+                time.sleep(random.uniform(*step.seconds))
+                return
+            if step.action == "click_at":
+                from selenium.webdriver.common.action_chains import ActionChains
+
+                ActionChains(self.driver).move_by_offset(*step.offset).click().perform()
+            elif step.action == "script":
+                self._navigate(step, lambda: self.driver.execute_script(step.value))
+            else:
+                element = self._find(step.selector, step.timeout, step.clickable, name=step.label)
+                if step.action == "type":
+                    self._type(element, step)
+                elif step.action == "click":
+                    self._navigate(step, element.click)
+                elif step.action == "js_click" or element.is_selected() != (step.action == "check"):
+                    # js_click, а также чекбокс не в нужном состоянии (check / uncheck)
+                    self._navigate(step, lambda: self.driver.execute_script("arguments[0].click();", element))
+            self.shop_logger.debug("%s: Шаг '%s' выполнен", self.__class__.__name__, step.label)
+        except Exception as e:
+            if not step.optional:
+                self.shop_logger.warning("%s: Шаг '%s' не выполнен", self.__class__.__name__, step.label)
+                raise
+            self.shop_logger.warning("%s: Необязательный шаг '%s' пропущен (%s)", self.__class__.__name__, step.label,
+                                     type(e).__name__)
+
+    def _session_warm(self):
+        """Прошёл ли в текущем браузере поиск шагами (после смены сессии браузер новый и снова холодный)."""
+        driver = getattr(self, "driver", None)
+        return driver is not None and getattr(self, "_warm_driver", None) is driver
+
+    def _entering_request(self):
+        """
+        Открывает выдачу по search_url или вводит запрос шагами search_steps.
+
+        Если заданы и шаги, и search_url, шагами (с паузами и вводом по символу) ищется только первый запрос
+        сессии браузера, в том числе после смены сессии из-за капчи или блокировки. Следующие запросы
+        открываются ссылкой в том же «прогретом» браузере — одна загрузка страницы на артикул.
+        """
+        definition = self.definition
+        try:
+            self.shop_logger.info("%s: Начало ввода запроса '%s'", self.__class__.__name__, self.request)
+            if definition.search_url is not None and (not definition.search_steps or self._session_warm()):
+                url = definition.search_url.format(query=quote_plus(self.request))
+                self.shop_logger.debug("%s: Переход к выдаче %s", self.__class__.__name__, url)
+                self._throttled(lambda: self.driver.get(url))
+            else:
+                for step in definition.search_steps:
+                    self._run_step(step)
+                self._warm_driver = self.driver
+            self.shop_logger.info("%s: Поиск по запросу '%s' выполнен", self.__class__.__name__, self.request)
+
+        except Exception as e:
+            self.shop_logger.exception(
+                "%s: Ошибка на этапе ввода запроса '%s': %s", self.__class__.__name__, self.request, e)
+            raise  # Без поиска разбирать нечего, решение о повторе принимает StagePolicy
+
+    def _extract_cards(self):
+        """Поля всех карточек страницы: значения по умолчанию вместо пустых, после normalize."""
+        definition = self.definition
+        extracted = self.driver.execute_script(EXTRACT_CARDS_JS, *definition.extract_args) or {}
+        raw_cards = extracted.get("cards") or []
+
+        if extracted.get("cardsChoice", -1) > 0:
+            self._report_fallback("карточка", definition.cards_selector[extracted["cardsChoice"]])
+        for field, hits in zip(definition.fields, extracted.get("hits") or []):
+            if hits and not hits[0]:
+                for selector, count in zip(field.selector[1:], hits[1:]):
+                    if count:
+                        self._report_fallback(field.name, selector)
+        profiler = get_profiler()
+        if profiler is not None:
+            profiler.record_script("executeScript", self._script_timings(extracted))
+
+        cards = []
+        for raw in raw_cards:
+            card = {}
+            for field in definition.fields:
+                value = raw.get(field.name)
+                value = field.normalize(value) if value is not None else ""
+                card[field.name] = value if value else field.default
+            cards.append(card)
+        return cards
+
+    def _script_timings(self, extracted):
+        """Замеры поисков внутри EXTRACT_CARDS_JS: (поле, селектор, поиски, находки, секунды)."""
+        definition = self.definition
+        choice = extracted.get("cardsChoice", -1)
+        timings = [("карточка", selector, 1, int(index == choice), ms / 1000)
+                   for index, (selector, ms) in enumerate(zip(definition.cards_selector,
+                                                              extracted.get("cardsTimes") or []))]
+        for field, hits, tries, times in zip(definition.fields, extracted.get("hits") or [],
+                                             extracted.get("tries") or [], extracted.get("times") or []):
+            timings.extend((field.name, selector, calls, found, ms / 1000)
+                           for selector, found, calls, ms in zip(field.selector or (), hits, tries, times) if calls)
+        return timings
+
+    def _pars_page(self):
+        """Разбирает карточки текущей страницы выдачи в self.new_data."""
+        definition = self.definition
+        self.new_data = []
+        self.page_cards = []
+        self.shop_logger.info("%s: Начало парсинга страницы", self.__class__.__name__)
+
+        if definition.page_script:
+            self.driver.execute_script(definition.page_script)
+
+        if definition.cards_timeout:
+            try:
+                self._find(definition.cards_selector, definition.cards_timeout, name="карточка")
+            except Exception as e:
+                self.shop_logger.warning("%s: Карточки товаров не появились: %s", self.__class__.__name__,
+                                         type(e).__name__)
+                return
+
+        if definition.ready_selector:
+            # Одно ожидание на страницу: поля, которые догружаются позже карточек, успевают появиться
+            try:
+                self._find(definition.ready_selector, definition.ready_timeout, name="ready_selector")
+            except Exception:
+                self.shop_logger.debug("%s: Элемент %s не дождались", self.__class__.__name__,
+                                       definition.ready_selector)
+
+        cards = self._extract_cards()
+        self.page_cards = cards  # Все карточки страницы до отбора по релевантности (для проверки магазина)
+        self.cards_found = (getattr(self, "cards_found", None) or 0) + len(cards)  # По всем страницам запроса
+        self.shop_logger.info("%s: Найдено %s карточек товаров", self.__class__.__name__, len(cards))
+        if definition.relevance_threshold is not None:
+            cards = self._filter_relevant(cards)
+
+        self.new_data = cards
+        if self.shop_logger.isEnabledFor(logging.DEBUG):  # Без DEBUG карточки даже не перебираются
+            for data in cards:
+                self.shop_logger.debug("%s: Добавлена карточка товара: %s", self.__class__.__name__, data)
+        self.shop_logger.info("%s: Парсинг завершён, добавлено %s карточек", self.__class__.__name__, len(cards))
+
+    def _next_page(self):
+        """Нажимает "Следующая страница" и ждёт смены страницы. :return: False, если страниц больше нет."""
+        from selenium.webdriver.support import expected_conditions as EC
+
+        pagination = self.definition.pagination
+        try:
+            next_button = self._find(pagination.next_selector, pagination.timeout, clickable=True)
+            self._throttled(lambda: self.driver.execute_script("arguments[0].click();", next_button))
+            self._wait(pagination.timeout).until(EC.staleness_of(next_button))
+            return True
+        except Exception as e:
+            self.shop_logger.info("%s: Пагинация завершена (%s)", self.__class__.__name__, type(e).__name__)
+            return False
+
+    def _collect_results(self):
+        """Этап parse: разбирает выдачу, при заданной пагинации — страницу за страницей."""
+        self._load_data()
+        self.cards_found = 0
+        self._pars_page()
+
+        pagination = self.definition.pagination
+        if pagination is None:
+            return
+        cards = self.new_data
+        page = 1
+        deadline = getattr(self, "_stage_deadline", None)
+        while page < pagination.max_pages and not (deadline is not None and deadline.expired()):
+            if not self._next_page():
+                break
+            page += 1
+            self.shop_logger.info("%s: Парсинг страницы %s", self.__class__.__name__, page)
+            self._pars_page()
+            cards.extend(self.new_data)
+        self.new_data = cards
+
+    def probe_health(self):
+        """
+        Проверка магазина перед запуском: поиск по контрольному запросу definition.canary.
+
+        Магазин неисправен, если поиск не удался, карточек нет или обязательное поле (Field.required)
+        не нашлось ни в одной карточке. Капча и блокировка поломкой не считаются: по ним нельзя судить
+        о селекторах. Найденные карточки не сохраняются.
+
+        :return: (исправен ли магазин, описание результата)
+        """
+        from src.utils.PageClassifier import BLOCKED
+        from src.utils.StagePolicy import StageError
+
+        definition = self.definition
+        if not definition.canary:
+            return True, "контрольный запрос не задан"
+
+        self.request = definition.canary
+        self.items = [definition.canary]
+        self.new_data = []
+        self.page_cards = []
+        self.cards_found = 0
+        stages = (
+            ("setup", self._ensure_driver, None),
+            ("navigate", self._get_url, None),
+            ("search", self._entering_request, lambda: self._get_url(reload=True)),
+            ("parse", self._pars_page, None),
+        )
+        profiler = get_profiler()
+        if profiler is not None:
+            profiler.set_context(self.__class__.__name__, self.request)
+        failure = None
+        try:
+            for stage, action, before_retry in stages:
+                if profiler is not None:
+                    profiler.set_stage(stage)
+                self.stage_policy.run(stage, action, before_retry=before_retry, on_attempt=self._set_stage_deadline)
+        except StageError as e:
+            failure = e
+        finally:
+            self._stage_deadline = None
+            if profiler is not None:
+                profiler.flush()
+
+        cards = self.page_cards
+        status = self.classify_page() if getattr(self, "driver", None) is not None else None
+        self.new_data = []
+        self.page_cards = []
+        self.cards_found = None
+        if status in BLOCKED:
+            return True, f"проверка не выполнена: {status}"
+        if failure is not None:
+            return False, f"запрос '{definition.canary}': {failure}"
+        if not cards:
+            return False, f"по запросу '{definition.canary}' не найдено карточек ({definition.cards_selector[0]})"
+        missing = [field.name for field in definition.fields
+                   if field.required and all(card[field.name] == field.default for card in cards)]
+        if missing:
+            return False, f"по запросу '{definition.canary}' нет полей {', '.join(missing)} ни в одной карточке"
+        return True, f"по запросу '{definition.canary}' найдено карточек: {len(cards)}"
+
+
+_parser_classes = {}
+
+
+def parser_for(definition):
+    """Класс парсера магазина по его описанию (один класс на описание)."""
+    parser_class = _parser_classes.get(definition.key)
+    if parser_class is None:
+        attributes = {
+            "definition": definition,
+            "shop_logger": get_logger(f"src.parsers.{definition.class_name}"),
+            "__module__": __name__,
+        }
+        if definition.relevance_threshold is not None:
+            attributes["relevance_threshold"] = definition.relevance_threshold
+        if definition.stage_deadlines:
+            attributes["stage_policy"] = StagePolicy(deadlines=definition.stage_deadlines)
+        parser_class = type(definition.class_name, (ShopEngineParser,), attributes)
+        _parser_classes[definition.key] = parser_class
+    return parser_class
@@ -0,0 +1,38 @@
+import importlib
+
+from src.parsers import ShopCatalog
+from src.parsers.ShopDefinition import ShopDefinition
+
+# Описание магазинов: общий список для GUI и консольного запуска, строится из ShopCatalog.
+# parser — путь к описанию магазина (или к классу парсера); движок импортируется только когда магазин выбран.
+# keep_browser — не закрывать браузер между артикулами.
+_CATALOG_NAMES = {id(value): name for name, value in vars(ShopCatalog).items() if isinstance(value, ShopDefinition)}
+SHOP_MAP = {
+    definition.key: definition.registry_entry(f"{ShopCatalog.__name__}.{_CATALOG_NAMES[id(definition)]}")
+    for definition in ShopCatalog.SHOP_DEFINITIONS
+}
+
+
+def shop_names():
+    """Возвращает названия магазинов в порядке их идентификаторов."""
+    return sorted(SHOP_MAP, key=lambda name: SHOP_MAP[name]["id"])
+
+
+def load_parser_class(path):
+    """
+    Импортирует класс парсера по пути вида 'src.parsers.ShopCatalog.CHIPDIP'.
+
+    Если путь ведёт к описанию магазина (ShopDefinition), возвращается класс ShopEngine для него.
+    """
+    module_name, class_name = path.rsplit(".", 1)
+    target = getattr(importlib.import_module(module_name), class_name)
+    if isinstance(target, ShopDefinition):
+        from src.parsers.ShopEngine import parser_for
+
+        return parser_for(target)
+    return target
+
+
+def get_parser_class(shop):
+    """Возвращает класс парсера магазина, импортируя его модуль при первом обращении."""
+    return load_parser_class(SHOP_MAP[shop]["parser"])
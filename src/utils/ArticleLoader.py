@@ -0,0 +1,202 @@
+import csv
+import os
+import re
+
+from src.logger.logger import get_logger
+
+parser_logger = get_logger(__name__)
+
+# Названия столбцов в строке заголовка (без учёта регистра). Без заголовка читается только первый столбец.
+ARTICLE_HEADERS = ("артикул", "артикулы", "article", "articles", "part number", "part no", "pn")
+QUANTITY_HEADERS = ("количество", "кол-во", "кол.", "quantity", "qty")
+SHOPS_HEADERS = ("магазины", "магазин", "shops", "shop", "preferred shops")
+
+CSV_EXTENSIONS = (".csv", ".txt")
+CHUNK_SIZE = 1000
+
+WHITESPACE = re.compile(r"\s+")
+SHOPS_SEPARATORS = re.compile(r"[,;|]")
+
+
+def normalize_article(value):
+    """Артикул из ячейки: без лишних пробелов; число 12345.0 из числовой ячейки становится "12345"."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return WHITESPACE.sub(" ", str(value)).strip()
+
+
+def parse_quantity(value):
+    """Количество из ячейки (число или строка с запятой) или None."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        quantity = float(str(value).replace(" ", "").replace(",", "."))
+    except ValueError:
+        return None
+    return int(quantity) if quantity.is_integer() else quantity
+
+
+def parse_shops(value):
+    """Предпочитаемые магазины из ячейки ("ChipDip, eBay") — кортеж названий."""
+    if value is None:
+        return ()
+    return tuple(shop.strip() for shop in SHOPS_SEPARATORS.split(str(value)) if shop.strip())
+
+
+class ArticleRow:
+    """Строка входного файла: артикул, количество и предпочитаемые магазины (пусто — все выбранные)."""
+
+    __slots__ = ("article", "quantity", "shops", "row")
+
+    def __init__(self, article, quantity=None, shops=(), row=None):
+        self.article = article
+        self.quantity = quantity
+        self.shops = shops
+        self.row = row  # Номер строки в файле (с 1)
+
+    def wants(self, shop):
+        """Нужно ли искать артикул в магазине `shop`."""
+        return not self.shops or shop.lower() in (name.lower() for name in self.shops)
+
+    def __repr__(self):
+        return f"ArticleRow({self.article!r}, quantity={self.quantity!r}, shops={self.shops!r})"
+
+
+class ArticleLoader:
+    """
+    Потоковое чтение артикулов из Excel (openpyxl read_only) или CSV.
+
+    Файл читается построчно, артикулы нормализуются и отдаются пачками по chunk_size, поэтому парсинг
+    может начаться до того, как прочитан весь файл. Повторы артикула схлопываются в первую строку:
+    количество суммируется, списки магазинов объединяются. Строка могла уже уйти в предыдущей пачке,
+    поэтому строки, которым повтор добавил магазины, отдаются ещё и через widened().
+    """
+
+    def __init__(self, file_path, chunk_size=CHUNK_SIZE):
+        """
+        :param file_path: Путь к .xlsx или .csv
+        :param chunk_size: Сколько уникальных артикулов в одной пачке (None — весь файл одной пачкой)
+        """
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.duplicates = 0  # Сколько повторяющихся строк схлопнуто
+        self._widened = {}  # Артикул -> строка, которой повтор добавил магазины (см. widened)
+
+    def _excel_rows(self):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+    def _csv_rows(self):
+        # Выгрузки из Excel часто в cp1251 и с разделителем ";"
+        with open(self.file_path, 'rb') as file:
+            sample = file.read(65536)
+        try:
+            sample.decode('utf-8-sig')
+            encoding = 'utf-8-sig'
+        except UnicodeDecodeError:
+            encoding = 'cp1251'
+
+        text_sample = sample.decode(encoding, errors='ignore')
+        try:
+            dialect = csv.Sniffer().sniff(text_sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+
+        with open(self.file_path, 'r', encoding=encoding, newline='') as file:
+            yield from csv.reader(file, dialect)
+
+    def _raw_rows(self):
+        if os.path.splitext(self.file_path)[1].lower() in CSV_EXTENSIONS:
+            return self._csv_rows()
+        return self._excel_rows()
+
+    @staticmethod
+    def _header_columns(row):
+        """{поле: номер столбца}, если строка — заголовок с известными названиями, иначе None."""
+        names = [normalize_article(cell).lower() for cell in row]
+        columns = {}
+        for field, headers in (("article", ARTICLE_HEADERS), ("quantity", QUANTITY_HEADERS), ("shops", SHOPS_HEADERS)):
+            for index, name in enumerate(names):
+                if name in headers:
+                    columns[field] = index
+                    break
+        return columns if "article" in columns else None
+
+    def rows(self):
+        """Уникальные строки файла (ArticleRow) в порядке первого появления."""
+        seen = {}
+        columns = None
+        self.duplicates = 0
+        self._widened = {}
+        for number, row in enumerate(self._raw_rows(), start=1):
+            if not row or all(cell is None or cell == "" for cell in row):
+                continue
+            if columns is None:
+                columns = self._header_columns(row)
+                if columns is not None:
+                    continue  # Строка заголовка
+                columns = {"article": 0}  # Без заголовка — только первый столбец, как раньше
+
+            def cell(field):
+                index = columns.get(field)
+                return row[index] if index is not None and index < len(row) else None
+
+            article = normalize_article(cell("article"))
+            if not article:
+                continue
+            quantity = parse_quantity(cell("quantity"))
+            shops = parse_shops(cell("shops"))
+
+            existing = seen.get(article)
+            if existing is not None:
+                self.duplicates += 1
+                if quantity is not None:
+                    existing.quantity = (existing.quantity or 0) + quantity
+                if existing.shops:
+                    previous = existing.shops
+                    # Пустой список — одна из строк просит все магазины
+                    existing.shops = tuple(dict.fromkeys(existing.shops + shops)) if shops else ()
+                    if existing.shops != previous:
+                        self._widened[article] = existing
+                continue
+
+            seen[article] = ArticleRow(article, quantity, shops, number)
+            yield seen[article]
+
+        parser_logger.info("%s: Прочитано %s уникальных артикулов из %s, повторов: %s", self.__class__.__name__,
+                           len(seen), self.file_path, self.duplicates)
+
+    def widened(self):
+        """
+        Строки, которым повторы добавили магазины с прошлого вызова (список магазинов уже объединён).
+
+        Артикул таких строк нужно отправить в добавленные магазины, даже если сама строка ушла в прошлой пачке.
+        """
+        rows = list(self._widened.values())
+        self._widened.clear()
+        return rows
+
+    def chunks(self):
+        """
+        Пачки по chunk_size строк (ArticleRow).
+
+        Если после последней пачки повторы добавили магазины уже отданным строкам, в конце отдаётся
+        пустая пачка, чтобы их успели забрать через widened().
+        """
+        chunk = []
+        for row in self.rows():
+            chunk.append(row)
+            if self.chunk_size and len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk or self._widened:
+            yield chunk
@@ -0,0 +1,340 @@
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from src.logger.logger import get_logger
+from src.parsers.ShopRegistry import SHOP_MAP
+from src.utils.ArticleLoader import CHUNK_SIZE, ArticleLoader
+from src.utils.ColumnarExport import columnar_available, export_offer_batches
+from src.utils.DriverProfiler import PROFILE_ENV, build_report, reset_profile
+from src.utils.ExcelSaver import ExcelSaver
+from src.utils.PageClassifier import BLOCKED
+from src.utils.ParserPool import ParserSupervisor
+from src.utils.PriceDatabase import PriceDatabase
+from src.utils.PriceRanking import rates_from_config
+from src.utils.ProxyPool import get_proxy_pool
+from src.utils.QueryPlanner import QueryPlan
+from src.utils.RescrapeScheduler import RescrapeScheduler
+from src.utils.ResourceSampler import ResourceSampler
+from src.utils.ShopHealth import ShopHealth
+
+parser_logger = get_logger(__name__)
+
+
+class BatchRunner:
+    """
+    Полный цикл обработки без GUI: загрузка артикулов, парсинг выбранных магазинов,
+    сохранение листов магазинов и сводного листа в Excel.
+    """
+
+    def __init__(self, articles_file, shops, output_file="output.xlsx", max_workers=None, shards_per_shop=1,
+                 article_timeout=180, data_root=".", db_path=None, incremental=False, budget=None, on_event=None,
+                 on_progress=None, chunk_size=CHUNK_SIZE, export_format=None, metrics=None, recycle_rss_mb=None,
+                 health_check=None, fail_fast_after=None, rates=None):
+        """
+        :param articles_file: Excel- или CSV-файл с артикулами (см. ArticleLoader)
+        :param shops: Названия магазинов из SHOP_MAP
+        :param output_file: Итоговый Excel-файл
+        :param max_workers: Сколько процессов парсеров работает одновременно
+        :param shards_per_shop: На сколько процессов делить артикулы одного магазина
+        :param article_timeout: Предельное время обработки одного артикула, сек
+        :param data_root: Каталог, относительно которого лежат папки data/JSON
+        :param db_path: Файл базы истории цен (по умолчанию data/prices.sqlite3 внутри data_root)
+        :param incremental: Проверять только пары (магазин, артикул), срок которых наступил (RescrapeScheduler)
+        :param budget: Сколько пар (магазин, артикул) можно проверить за запуск в режиме incremental
+        :param on_event: Функция для текстовых сообщений о ходе работы
+        :param on_progress: Функция для событий прогресса по магазинам
+        :param chunk_size: Сколько артикулов читается из файла и отправляется парсерам за раз
+        :param export_format: "parquet" или "arrow" — дополнительно выгрузить предложения запуска в data/Export
+                              (нужен pyarrow, см. ColumnarExport)
+        :param metrics: RunMetrics для GUI и эндпоинта /metrics (обнуляется в начале run())
+        :param recycle_rss_mb: Порог памяти рабочего вместе с Chrome, МБ, выше которого браузер перезапускается
+                               (по умолчанию EMPARSER_RECYCLE_RSS_MB; замеры нужны psutil, см. ResourceSampler)
+        :param health_check: Проверять магазины контрольным запросом перед запуском
+                             (по умолчанию EMPARSER_HEALTH_CHECK, включено; см. ShopHealth)
+        :param fail_fast_after: Сколько неудачных артикулов подряд отключают магазин до конца запуска
+                                (по умолчанию EMPARSER_FAIL_FAST или 20; 0 — не отключать)
+        :param rates: Курсы валют к рублю для сводного листа: {валюта: курс} или строка "USD=92.5,EUR=100"
+                      (по умолчанию EMPARSER_RATES); без курса предложения сравниваются в своей валюте
+        """
+        self.articles_file = articles_file
+        self.shops = list(shops)
+        self.output_file = output_file
+        self.max_workers = max_workers
+        self.shards_per_shop = shards_per_shop
+        self.article_timeout = article_timeout
+        self.data_root = data_root
+        self.db_path = db_path or os.path.join(data_root, "data", "prices.sqlite3")
+        self.incremental = incremental
+        self.budget = budget
+        self.on_event = on_event
+        self.on_progress = on_progress
+        self.chunk_size = chunk_size
+        self.export_format = export_format
+        self.metrics = metrics
+        self.recycle_rss_mb = recycle_rss_mb
+        self.health_check = health_check
+        self.fail_fast_after = fail_fast_after
+        self.rates = rates_from_config(rates)
+        self.health = None  # ShopHealth последнего run()
+        self.rows = []  # Строки входного файла (ArticleRow) после последнего run()
+        self.query_plan = QueryPlan()  # Артикулы с одинаковым написанием ищутся одним запросом
+
+    def _log(self, message):
+        if self.on_event:
+            self.on_event(message)
+        else:
+            parser_logger.info("%s: %s", self.__class__.__name__, message)
+
+    def _shop_jobs(self):
+        """Собирает описания выбранных магазинов для ParserSupervisor."""
+        shops = []
+        for shop in self.shops:
+            shop_info = SHOP_MAP.get(shop)
+            if not shop_info:
+                self._log(f"Unknown shop: {shop}")
+                continue
+
+            shops.append({
+                "shop": shop,
+                "parser_class": shop_info["parser"],
+                "site_name": shop_info["site_name"],
+                "json_folder": os.path.join(self.data_root, shop_info["json_folder"]),
+                "keep_browser": shop_info["keep_browser"],
+            })
+            self._log(f"Starting parser for: {shop_info['site_name']} "
+                      f"(Close browser after each article: {not shop_info['keep_browser']})")
+        return shops
+
+    @staticmethod
+    def _merge_results(results, chunk_results):
+        """Добавляет результаты одной пачки артикулов к результатам запуска."""
+        for shop, shop_result in chunk_results.items():
+            merged = results.setdefault(shop, {"offers": 0, "failed": {}, "statuses": {}, "json_file": None,
+                                               "run_id": None})
+            merged["offers"] = shop_result["offers"]  # Супервизор считает предложения за весь запуск
+            merged["failed"].update(shop_result["failed"])
+            merged["statuses"].update(shop_result.get("statuses", {}))
+            merged["json_file"] = shop_result["json_file"]  # Один файл магазина на весь запуск
+            merged["run_id"] = shop_result["run_id"]
+
+    def _export_columnar(self, results, observed_at, database):
+        """
+        Выгружает предложения каждого магазина в разделы run=<id>/shop=<магазин> (Parquet или Arrow).
+
+        Предложения читаются из базы пачками, поэтому выгрузка не держит весь запуск в памяти.
+        """
+        if not columnar_available():
+            self._log(f"pyarrow is not installed, {self.export_format} export skipped")
+            return
+        root = os.path.join(self.data_root, "data", "Export")
+        for shop, shop_result in results.items():
+            if not shop_result["offers"] or shop_result.get("run_id") is None:
+                continue
+            try:
+                filepath = export_offer_batches(database.run_records(shop_result["run_id"]), shop,
+                                                shop_result["run_id"], observed_at=observed_at, root=root,
+                                                export_format=self.export_format)
+                self._log(f"Exported {shop} offers to {filepath}")
+            except Exception as e:
+                self._log(f"Error exporting {shop} offers: {e}")
+
+    def _write_profile_report(self, profile_dir):
+        """Собирает отчёт профиля команд WebDriver за запуск."""
+        try:
+            report = build_report(profile_dir)
+            if report:
+                self._log(f"WebDriver profile saved to {report}")
+            else:
+                self._log("WebDriver profile is empty")
+        except Exception as e:
+            self._log(f"Error building WebDriver profile: {e}")
+
+    def _write_change_feed(self, changes):
+        """Сохраняет изменения предложений всех магазинов отдельным небольшим JSON-файлом."""
+        directory = os.path.join(self.data_root, "data", "JSON", "Changes")
+        os.makedirs(directory, exist_ok=True)
+        filepath = os.path.join(directory, f"Changes_{datetime.now().strftime('%H-%M-%S_%d-%m-%Y')}.json")
+        with open(filepath, 'w', encoding='utf-8') as file:
+            json.dump({
+                "Дата и время создания файла": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                "Изменения": changes
+            }, file, ensure_ascii=False, indent=4)
+        return filepath
+
+    def run(self):
+        """
+        Запускает обработку.
+
+        :return: {магазин: {"offers": сколько записей сохранено, "failed": {артикул: причина}, "json_file": путь,
+                  "run_id": id запуска в базе, "changes": [изменения относительно предыдущей проверки]}}
+        """
+        if not self.shops:
+            self._log("No parsers selected.")
+            return {}
+
+        self._log(f"Selected parsers: {', '.join(self.shops)}")
+
+        shops = self._shop_jobs()
+        if not shops:
+            return {}
+
+        # С бюджетом планировщик выбирает артикулы по всему файлу сразу, иначе пачки отправляются по мере чтения
+        chunk_size = None if self.incremental and self.budget is not None else self.chunk_size
+        loader = ArticleLoader(self.articles_file, chunk_size=chunk_size)
+
+        started_at = datetime.now()
+        if self.metrics is not None:
+            self.metrics.reset()
+        # Процессы парсеров наследуют EMPARSER_PROFILE и пишут туда свои команды WebDriver (см. DriverProfiler)
+        profile_dir = os.environ.get(PROFILE_ENV, "").strip()
+        if profile_dir:
+            reset_profile(profile_dir)
+        # Память и CPU каждого рабочего вместе с Chrome, с привязкой к магазину и шарду
+        sampler = ResourceSampler.from_config(recycle_rss_mb=self.recycle_rss_mb)
+        # Магазин со сломанными селекторами отключается один раз на весь запуск, для всех пачек
+        self.health = ShopHealth.from_config(health_check=self.health_check, fail_fast_after=self.fail_fast_after)
+        database = PriceDatabase(self.db_path)
+        try:
+            self.rows = []
+            self.query_plan = QueryPlan()
+            dispatched = {shop_info["shop"]: set() for shop_info in shops}
+            results = {}
+            # Один супервизор на весь запуск: общий прогресс, запуск в базе и JSON магазина для всех пачек.
+            # Каждый магазин работает в своём процессе, поэтому зависший браузер не останавливает остальные
+            supervisor = ParserSupervisor(
+                max_workers=self.max_workers,
+                article_timeout=self.article_timeout,
+                on_event=self.on_event,
+                on_progress=self.on_progress,
+                database=database,
+                metrics=self.metrics,
+                resource_sampler=sampler,
+                health=self.health,
+                proxy_pool=get_proxy_pool(),  # Загружается и проверяется один раз, затем делится между рабочими
+            )
+            scheduler = RescrapeScheduler(database) if self.incremental else None
+            chunks = loader.chunks()
+            while True:
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    self._log(f"Error loading articles from {self.articles_file}: {e}")
+                    break
+
+                self.rows.extend(chunk)
+                # Написания одного артикула сводятся к одному запросу; строка с выбранными магазинами уходит
+                # только в них, и каждый магазин ищет запрос один раз за запуск
+                plan = {shop_info["shop"]: [] for shop_info in shops}
+                wanted = dict.fromkeys(plan, 0)
+                for row in chunk:
+                    query = self.query_plan.add(row.article)
+                    for shop, shop_queries in plan.items():
+                        if not row.wants(shop):
+                            continue
+                        wanted[shop] += 1
+                        if query not in dispatched[shop]:
+                            dispatched[shop].add(query)
+                            shop_queries.append(query)
+                # Повтор строки ниже по файлу добавил магазины строке из прошлой пачки
+                for row in loader.widened():
+                    query = self.query_plan.query_of[row.article]
+                    for shop, shop_queries in plan.items():
+                        if row.wants(shop) and query not in dispatched[shop]:
+                            wanted[shop] += 1
+                            dispatched[shop].add(query)
+                            shop_queries.append(query)
+                if scheduler is not None:
+                    # Проверяются только пары (магазин, артикул), срок перепроверки которых наступил
+                    plan = scheduler.plan(list(plan), plan, budget=self.budget)
+                if self.metrics is not None:
+                    # Строки, найденные под другим написанием или пропущенные как свежие, — попадания в кэш
+                    for shop, shop_queries in plan.items():
+                        self.metrics.cache_lookup(shop, hits=wanted[shop] - len(shop_queries),
+                                                  misses=len(shop_queries))
+                self._log(f"Read {len(self.rows)} articles, dispatching: "
+                          + ", ".join(f"{shop} {len(shop_articles)}" for shop, shop_articles in plan.items()))
+
+                due_shops = [dict(shop_info, articles=plan[shop_info["shop"]])
+                             for shop_info in shops if plan[shop_info["shop"]]]
+                if not due_shops:
+                    continue
+                jobs = ParserSupervisor.jobs_for(due_shops, [row.article for row in chunk],
+                                                 shards_per_shop=self.shards_per_shop)
+                self._merge_results(results, supervisor.run(jobs))
+
+            articles = [row.article for row in self.rows]
+            self._log(f"Loaded {len(articles)} articles for parsing ({loader.duplicates} duplicate rows merged, "
+                      f"{self.query_plan.collapsed} more searched under another spelling).")
+            if sampler is not None and sampler.peaks:
+                self._log("Peak memory per worker with Chrome: " + ", ".join(
+                    f"{shop} {peak:.0f} MB" for shop, peak in sampler.shop_peaks().items()))
+            for shop, reason in self.health.disabled.items():
+                self._log(f"{shop} was disabled for the run: {reason}")
+            if not articles:
+                return {}
+
+            for shop_info in shops:
+                results.setdefault(shop_info["shop"], {"offers": 0, "failed": {}, "json_file": None, "run_id": None})
+
+            if self.export_format:
+                self._export_columnar(results, started_at, database)
+
+            # Каждый запуск начинается с чистого итогового файла
+            ExcelSaver._is_file_cleaned = False
+            shop_offers = []
+            for shop_info in shops:
+                shop = shop_info["shop"]
+                for article, reason in results.get(shop, {}).get("failed", {}).items():
+                    self._log(f"Error parsing article {article} in {shop}: {reason}")
+                blocked = [article for article, status in results[shop].get("statuses", {}).items()
+                           if status in BLOCKED]
+                if blocked:
+                    self._log(f"{shop}: captcha/block after session rotation for {len(blocked)} articles: "
+                              f"{', '.join(blocked)}")
+
+                try:
+                    json_folder = shop_info["json_folder"]
+                    saver = ExcelSaver(json_folder=json_folder, articles=articles, excel_file=self.output_file,
+                                       shop=shop, database=database, queries=self.query_plan.query_of)
+                    saver.process_data()
+                    if saver.offers is not None:
+                        shop_offers.append(saver.offers)
+                    self._log(f"Saved parsed data to JSON folder: {json_folder}")
+                except Exception as e:
+                    self._log(f"Error parsing shop {shop}: {e}")
+
+            # Сводный лист по всем магазинам
+            try:
+                saver_aggregate = ExcelSaver(excel_file=self.output_file, articles=articles)
+                # Предложения уже нормализованы, поэтому сводка не перечитывает листы магазинов
+                offers = pd.concat(shop_offers, ignore_index=True) if shop_offers else None
+                saver_aggregate.aggregate_prices_to_first_sheet(offers=offers, rates=self.rates)
+                self._log("All data successfully aggregated into Excel.")
+            except Exception as e:
+                self._log(f"Error aggregating data into Excel: {e}")
+
+            # В ленту изменений и на лист "Changes" попадают только новые, исчезнувшие и переоценённые предложения
+            changes = []
+            for shop_info in shops:
+                shop_result = results.get(shop_info["shop"], {})
+                if shop_result.get("run_id") is None:
+                    continue
+                shop_result["changes"] = [dict(row) for row in database.run_changes(shop_result["run_id"])]
+                changes.extend(shop_result["changes"])
+            try:
+                feed_file = self._write_change_feed(changes)
+                ExcelSaver(excel_file=self.output_file, articles=articles).save_changes_sheet(changes)
+                self._log(f"Changes since previous run: {len(changes)} (saved to {feed_file})")
+            except Exception as e:
+                self._log(f"Error saving changes: {e}")
+        finally:
+            database.close()
+            if profile_dir:
+                self._write_profile_report(profile_dir)
+
+        return results
@@ -0,0 +1,163 @@
+import importlib.util
+import os
+import re
+from datetime import datetime
+
+from src.logger.logger import get_logger
+from src.utils.PriceNormalizer import normalize_records
+
+parser_logger = get_logger(__name__)
+
+# Столбцы выгрузки в фиксированном порядке и их типы Arrow
+EXPORT_COLUMNS = [
+    ("shop", "string"),
+    ("query", "string"),
+    ("description", "string"),
+    ("price", "float64"),
+    ("currency", "string"),
+    ("url", "string"),
+    ("product_code", "string"),
+    ("observed_at", "timestamp[ms]"),  # Parquet не хранит секундную точность, поэтому сразу миллисекунды
+]
+
+# Формат -> расширение файла
+EXPORT_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+DEFAULT_EXPORT_ROOT = os.path.join("data", "Export")
+
+
+def columnar_available():
+    """Установлен ли pyarrow (необязательная зависимость: pip install pyarrow)."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def export_schema():
+    """Схема Arrow для выгрузки предложений."""
+    import pyarrow as pa
+
+    return pa.schema([(name, pa.type_for_alias(type_name)) for name, type_name in EXPORT_COLUMNS])
+
+
+def _partition_value(value):
+    """Значение для имени каталога раздела (run=..., shop=...) без символов, недопустимых в путях."""
+    return re.sub(r"[^\w.-]+", "_", str(value))
+
+
+def offers_table(records, shop, observed_at=None):
+    """
+    Таблица Arrow из записей парсера (список {запрос: {...}}, как их собирает _add_request).
+
+    :param records: Записи магазина
+    :param shop: Название магазина
+    :param observed_at: Время проверки (по умолчанию — текущее)
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    offers = normalize_records(records, shop=shop)
+    frame = pd.DataFrame({
+        "shop": offers["shop"],
+        "query": offers["article"],
+        "description": offers["description"],
+        "price": offers["price"].astype(float),
+        "currency": offers["currency"],
+        "url": offers["url"],
+        "product_code": offers["product_code"].map(lambda code: None if code is None else str(code), na_action="ignore"),
+        "observed_at": pd.Timestamp(observed_at or datetime.now()).floor("s"),
+    })
+    return pa.Table.from_pandas(frame, schema=export_schema(), preserve_index=False)
+
+
+def export_offers(records, shop, run_id, observed_at=None, root=DEFAULT_EXPORT_ROOT, export_format="parquet"):
+    """
+    Пишет предложения одного магазина за один запуск в раздел root/run=<run_id>/shop=<shop>/.
+
+    :param run_id: Идентификатор запуска (id в PriceDatabase или метка времени)
+    :param export_format: "parquet" (сжатый, для BI) или "arrow" (Arrow IPC, читается через memory map без копирования)
+    :return: Путь к записанному файлу
+    """
+    return export_offer_batches([records], shop, run_id, observed_at=observed_at, root=root,
+                                export_format=export_format)
+
+
+def export_offer_batches(batches, shop, run_id, observed_at=None, root=DEFAULT_EXPORT_ROOT, export_format="parquet"):
+    """
+    То же, что export_offers, но записи приходят пачками (например, PriceDatabase.run_records) и пишутся
+    в файл по одной: в памяти одновременно только одна пачка.
+
+    :param batches: Итерируемое списков записей {запрос: {...}}
+    :return: Путь к записанному файлу
+    """
+    import pyarrow as pa
+
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Неизвестный формат выгрузки: {export_format}")
+
+    directory = os.path.join(root, f"run={_partition_value(run_id)}", f"shop={_partition_value(shop)}")
+    os.makedirs(directory, exist_ok=True)
+    filepath = os.path.join(directory, f"offers{EXPORT_FORMATS[export_format]}")
+
+    schema = export_schema()
+    rows = 0
+    if export_format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(filepath, schema, compression="zstd")
+    else:
+        sink = pa.OSFile(filepath, "wb")
+        writer = pa.ipc.new_file(sink, schema)
+    try:
+        for records in batches:
+            if not records:
+                continue
+            table = offers_table(records, shop, observed_at)
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        writer.close()
+        if export_format != "parquet":
+            sink.close()
+
+    parser_logger.info("Выгрузка %s: %s предложений магазина %s записано в %s", export_format, rows, shop, filepath)
+    return filepath
+
+
+def read_offers(root=DEFAULT_EXPORT_ROOT, runs=None, shops=None, memory_map=True):
+    """
+    Читает выгрузку в одну таблицу Arrow.
+
+    Файлы читаются через memory map: Arrow IPC — без копирования в память, Parquet — без промежуточного
+    буфера. Столбец run берётся из имени раздела.
+
+    :param runs: Только эти запуски (значения run=...)
+    :param shops: Только эти магазины
+    :return: pyarrow.Table со столбцами EXPORT_COLUMNS и run
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    runs = {_partition_value(run) for run in runs} if runs is not None else None
+    shops = {_partition_value(shop) for shop in shops} if shops is not None else None
+
+    tables = []
+    for run_dir in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+        if not run_dir.startswith("run=") or (runs is not None and run_dir[4:] not in runs):
+            continue
+        for shop_dir in sorted(os.listdir(os.path.join(root, run_dir))):
+            if not shop_dir.startswith("shop=") or (shops is not None and shop_dir[5:] not in shops):
+                continue
+            for filename in sorted(os.listdir(os.path.join(root, run_dir, shop_dir))):
+                filepath = os.path.join(root, run_dir, shop_dir, filename)
+                if filename.endswith(EXPORT_FORMATS["parquet"]):
+                    table = pq.read_table(filepath, memory_map=memory_map)
+                elif filename.endswith(EXPORT_FORMATS["arrow"]):
+                    source = pa.memory_map(filepath) if memory_map else pa.OSFile(filepath)
+                    table = pa.ipc.open_file(source).read_all()
+                else:
+                    continue
+                table = table.select([name for name, _ in EXPORT_COLUMNS]).cast(export_schema())
+                tables.append(table.append_column("run", pa.array([run_dir[4:]] * table.num_rows, pa.string())))
+
+    if not tables:
+        return export_schema().append(pa.field("run", pa.string())).empty_table()
+    return pa.concat_tables(tables)
@@ -0,0 +1,334 @@
+import glob
+import json
+import os
+import threading
+import time
+
+from src.logger.logger import get_logger
+
+parser_logger = get_logger(__name__)
+
+# Каталог профиля команд WebDriver; если переменная не задана, профилирование выключено.
+# Переменная окружения наследуется рабочими процессами парсеров.
+PROFILE_ENV = "EMPARSER_PROFILE"
+
+EVENTS_PATTERN = "commands_*.jsonl"
+FOLDED_FILE = "folded.txt"
+REPORT_FILE = "report.txt"
+
+# Команды, у которых в параметрах есть селектор
+FIND_COMMANDS = ("findElement", "findElements", "findChildElement", "findChildElements")
+
+
+def _selector(params):
+    """Селектор команды поиска в виде "css selector=div.price" или None."""
+    if not params or "using" not in params:
+        return None
+    return f"{params['using']}={params.get('value')}"
+
+
+class ProfiledWait:
+    """Обёртка WebDriverWait: записывает длительность ожидания и тайм-ауты вместе с ожидаемым селектором."""
+
+    def __init__(self, profiler, wait):
+        self._profiler = profiler
+        self._wait = wait
+
+    def _run(self, kind, method, message):
+        start_index = self._profiler.begin_wait()
+        started = time.perf_counter()
+        try:
+            result = getattr(self._wait, kind)(method, message)
+        except Exception as e:
+            self._profiler.end_wait(start_index, kind, time.perf_counter() - started, type(e).__name__)
+            raise
+        self._profiler.end_wait(start_index, kind, time.perf_counter() - started, None)
+        return result
+
+    def until(self, method, message=""):
+        return self._run("until", method, message)
+
+    def until_not(self, method, message=""):
+        return self._run("until_not", method, message)
+
+
+class DriverProfiler:
+    """
+    Профилировщик команд WebDriver (включается переменной EMPARSER_PROFILE).
+
+    Подменяет у драйвера метод execute, через который проходят все команды драйвера и элементов, и пишет
+    каждую команду: магазин, артикул, этап, тип команды, селектор, длительность, успех. Ожидания
+    WebDriverWait записываются отдельно, команды внутри ожидания помечаются его селектором. Поиски, которые
+    скрипт выполнил сам и замерил (record_script), записываются вложенными в его команду executeScript.
+    События процесса дописываются в <каталог>/commands_<pid>.jsonl после каждого артикула.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.shop = None
+        self.article = None
+        self.stage = None
+        self._events = []
+        self._last_selector = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def set_context(self, shop, article):
+        """Магазин и артикул, к которым относятся следующие команды."""
+        self.shop = shop
+        self.article = article
+        self.stage = None
+
+    def set_stage(self, stage):
+        self.stage = stage
+
+    def attach(self, driver):
+        """Подключает профилировщик к драйверу (повторный вызов для того же драйвера ничего не делает)."""
+        if getattr(driver, "_emparser_profiled", False):
+            return driver
+        execute = driver.execute
+        profiler = self
+
+        def profiled_execute(driver_command, params=None):
+            started = time.perf_counter()
+            error = None
+            try:
+                return execute(driver_command, params)
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                profiler._record_command(driver_command, params, time.perf_counter() - started, error)
+
+        driver.execute = profiled_execute  # WebElement вызывает parent.execute, поэтому команды элементов тоже видны
+        driver._emparser_profiled = True
+        return driver
+
+    def wait(self, wait):
+        """Оборачивает WebDriverWait."""
+        return ProfiledWait(self, wait)
+
+    def _event(self, **fields):
+        return dict(fields, shop=self.shop, article=self.article, stage=self.stage)
+
+    def _record_command(self, command, params, seconds, error):
+        selector = _selector(params) if command in FIND_COMMANDS else None
+        with self._lock:
+            if selector is not None:
+                self._last_selector = selector
+            self._events.append(self._event(kind="command", command=command, selector=selector, seconds=seconds,
+                                            ok=error is None, error=error, wait=None))
+
+    def record_script(self, command, timings):
+        """
+        Записывает поиски, выполненные внутри скрипта браузера, — без них скрипт виден одной командой.
+
+        Время поисков уже входит в длительность команды скрипта, отчёт показывает их вложенными в неё.
+
+        :param command: Команда, которой выполнялся скрипт (executeScript)
+        :param timings: (поле, CSS-селектор, число поисков, число находок, секунды) по каждому селектору
+        """
+        with self._lock:
+            for field, selector, calls, hits, seconds in timings:
+                self._events.append(self._event(kind="script", command=command, selector=f"css selector={selector}",
+                                                field=field, calls=calls, hits=hits, seconds=seconds, ok=hits > 0,
+                                                error=None, wait=None))
+
+    def begin_wait(self):
+        with self._lock:
+            self._last_selector = None
+            return len(self._events)
+
+    def end_wait(self, start_index, kind, seconds, error):
+        """Записывает ожидание; его селектор — последний селектор, который искали во время ожидания."""
+        with self._lock:
+            selector = self._last_selector or "-"
+            for event in self._events[start_index:]:
+                if event["kind"] == "command" and event["wait"] is None:
+                    event["wait"] = selector
+            self._events.append(self._event(kind="wait", command=kind, selector=selector, seconds=seconds,
+                                            ok=error is None, error=error, wait=None))
+
+    def flush(self):
+        """Дописывает накопленные события в файл процесса."""
+        with self._lock:
+            events, self._events = self._events, []
+        if not events:
+            return
+        filepath = os.path.join(self.directory, f"commands_{os.getpid()}.jsonl")
+        try:
+            with open(filepath, 'a', encoding='utf-8') as file:
+                file.writelines(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+        except OSError as e:
+            parser_logger.error("%s: Не удалось записать профиль в %s: %s", self.__class__.__name__, filepath, e)
+
+
+_profiler = None
+_profiler_loaded = False
+_profiler_lock = threading.Lock()
+
+
+def get_profiler():
+    """Профилировщик процесса, если задана переменная EMPARSER_PROFILE, иначе None."""
+    global _profiler, _profiler_loaded
+    with _profiler_lock:
+        if not _profiler_loaded:
+            directory = os.environ.get(PROFILE_ENV, "").strip()
+            _profiler = DriverProfiler(directory) if directory else None
+            _profiler_loaded = True
+        return _profiler
+
+
+def reset_profile(directory):
+    """Удаляет события прошлого запуска из каталога профиля."""
+    for filepath in glob.glob(os.path.join(directory, EVENTS_PATTERN)):
+        os.remove(filepath)
+
+
+def load_events(directory):
+    """Все события профиля из каталога."""
+    events = []
+    for filepath in sorted(glob.glob(os.path.join(directory, EVENTS_PATTERN))):
+        with open(filepath, 'r', encoding='utf-8') as file:
+            events.extend(json.loads(line) for line in file if line.strip())
+    return events
+
+
+def _frame(text):
+    # В формате folded ";" разделяет кадры, а пробел отделяет значение
+    return str(text).replace(";", ",").replace("\n", " ")
+
+
+def folded_stacks(events):
+    """
+    Стеки в формате folded (flamegraph.pl, speedscope): "магазин;этап;ожидание;команда селектор мс".
+
+    У ожидания собственное время — длительность за вычетом команд внутри него (паузы между опросами),
+    у скрипта — за вычетом замеренных в нём поисков.
+    """
+    stacks = {}
+
+    def add(frames, seconds):
+        key = ";".join(_frame(frame) for frame in frames)
+        stacks[key] = stacks.get(key, 0.0) + seconds
+
+    inner = {}  # (магазин, этап, селектор ожидания) -> время команд внутри ожиданий
+    for event in events:
+        base = [event["shop"] or "-", event["stage"] or "-"]
+        if event["kind"] == "command":
+            command = f"{event['command']} {event['selector']}" if event["selector"] else event["command"]
+            if event["wait"] is not None:
+                add(base + [f"wait {event['wait']}", command], event["seconds"])
+                key = (event["shop"], event["stage"], event["wait"])
+                inner[key] = inner.get(key, 0.0) + event["seconds"]
+            else:
+                add(base + [command], event["seconds"])
+        elif event["kind"] == "script":
+            add(base + [event["command"], f"{event['field']} {event['selector']}"], event["seconds"])
+            add(base + [event["command"]], -event["seconds"])
+
+    for event in events:
+        if event["kind"] == "wait":
+            add([event["shop"] or "-", event["stage"] or "-", f"wait {event['selector']}"], event["seconds"])
+    for (shop, stage, selector), seconds in inner.items():
+        add([shop or "-", stage or "-", f"wait {selector}"], -seconds)
+
+    return {stack: max(0.0, seconds) for stack, seconds in stacks.items()}
+
+
+def selector_stats(events):
+    """
+    Статистика по (магазин, селектор): команды поиска и ожидания.
+
+    :return: Список словарей, самые затратные селекторы первыми
+    """
+    stats = {}
+    for event in events:
+        if not event["selector"]:
+            continue
+        row = stats.setdefault((event["shop"], event["selector"]), {
+            "shop": event["shop"], "selector": event["selector"], "calls": 0, "seconds": 0.0, "failed": 0,
+            "failed_seconds": 0.0, "waits": 0, "wait_seconds": 0.0, "timeouts": 0, "timeout_seconds": 0.0})
+        if event["kind"] == "wait":
+            row["waits"] += 1
+            row["wait_seconds"] += event["seconds"]
+            if not event["ok"]:
+                row["timeouts"] += 1
+                row["timeout_seconds"] += event["seconds"]
+        elif event["kind"] == "script":
+            # Поиски внутри скрипта: в одном событии все поиски селектора, неудачные — без находки
+            calls = event["calls"]
+            row["calls"] += calls
+            row["seconds"] += event["seconds"]
+            if calls > event["hits"]:
+                row["failed"] += calls - event["hits"]
+                row["failed_seconds"] += event["seconds"] * (calls - event["hits"]) / calls
+        elif event["wait"] is None:
+            # Поиски внутри ожидания уже учтены во времени ожидания
+            row["calls"] += 1
+            row["seconds"] += event["seconds"]
+            if not event["ok"]:
+                row["failed"] += 1
+                row["failed_seconds"] += event["seconds"]
+    return sorted(stats.values(), key=lambda row: row["seconds"] + row["wait_seconds"], reverse=True)
+
+
+def build_report(directory, top=30):
+    """
+    Собирает отчёт по событиям каталога: folded.txt для флейм-графа и report.txt с самыми затратными
+    селекторами, временем, потерянным на тайм-аутах, и самыми медленными артикулами.
+
+    :return: Путь к report.txt или None, если событий нет
+    """
+    events = load_events(directory)
+    if not events:
+        return None
+
+    stacks = folded_stacks(events)
+    with open(os.path.join(directory, FOLDED_FILE), 'w', encoding='utf-8') as file:
+        for stack, seconds in sorted(stacks.items()):
+            file.write(f"{stack} {round(seconds * 1000)}\n")  # Значения в миллисекундах
+
+    total = sum(event["seconds"] for event in events
+                if event["kind"] == "wait" or (event["kind"] == "command" and event["wait"] is None))
+    timeouts = sum(event["seconds"] for event in events if event["kind"] == "wait" and not event["ok"])
+    failed_finds = sum(event["seconds"] for event in events
+                       if event["kind"] == "command" and event["wait"] is None and event["selector"]
+                       and not event["ok"])
+
+    articles = {}
+    for event in events:
+        # Поиски скрипта уже входят во время его команды
+        if event["kind"] == "wait" or (event["kind"] == "command" and event["wait"] is None):
+            key = (event["shop"], event["article"])
+            articles[key] = articles.get(key, 0.0) + event["seconds"]
+
+    lines = [
+        f"Время в командах WebDriver: {total:.1f} с",
+        f"Потеряно на тайм-аутах ожиданий: {timeouts:.1f} с, на неудачных поисках: {failed_finds:.1f} с",
+        "",
+        f"Самые затратные селекторы (топ {top}):",
+        f"{'с всего':>8} {'ожид.':>7} {'т/аут':>7} {'вызовы':>7} {'ошибки':>7}  магазин  селектор",
+    ]
+    stats = selector_stats(events)
+    heaviest = (stats[0]["seconds"] + stats[0]["wait_seconds"]) if stats else 0.0
+    for row in stats[:top]:
+        spent = row["seconds"] + row["wait_seconds"]
+        bar = "#" * round(30 * spent / heaviest) if heaviest else ""
+        lines.append(f"{spent:8.1f} {row['wait_seconds']:7.1f} {row['timeout_seconds']:7.1f} "
+                     f"{row['calls'] + row['waits']:7} {row['failed'] + row['timeouts']:7}  {row['shop']}  "
+                     f"{row['selector']}  {bar}")
+
+    lines += ["", f"Самые медленные артикулы (топ {top}):"]
+    for (shop, article), seconds in sorted(articles.items(), key=lambda item: item[1], reverse=True)[:top]:
+        lines.append(f"{seconds:8.1f}  {shop}  {article}")
+
+    lines += ["", f"Стеки (магазин;этап;ожидание;команда), топ {top}:"]
+    for stack, seconds in sorted(stacks.items(), key=lambda item: item[1], reverse=True)[:top]:
+        lines.append(f"{seconds:8.1f}  {stack}")
+
+    filepath = os.path.join(directory, REPORT_FILE)
+    with open(filepath, 'w', encoding='utf-8') as file:
+        file.write("\n".join(lines) + "\n")
+    parser_logger.info("Отчёт профиля WebDriver: %s событий, %s", len(events), filepath)
+    return filepath
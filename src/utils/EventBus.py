@@ -0,0 +1,40 @@
+import queue
+
+
+class EventBus:
+    """
+    Потокобезопасная очередь событий от парсеров к GUI.
+
+    Рабочие потоки только публикуют события, а GUI забирает их пачками по таймеру `after()`
+    в своём потоке, поэтому виджеты Tk трогает только главный поток.
+
+    События — словари с ключом "type":
+        {"type": "log", "message": str}
+        {"type": "progress", "shop": str, "article": str, "done": int, "failed": int, "total": int,
+         "rate": float, "eta": float | None}
+    """
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+
+    def publish(self, event):
+        """Кладёт событие в очередь (можно вызывать из любого потока)."""
+        self._queue.put(event)
+
+    def log(self, message):
+        """Публикует текстовое сообщение для консоли."""
+        self.publish({"type": "log", "message": message})
+
+    def progress(self, event):
+        """Публикует событие прогресса, сформированное супервизором парсеров."""
+        self.publish(dict(event, type="progress"))
+
+    def drain(self, max_events=1000):
+        """Забирает из очереди не больше `max_events` событий, не блокируясь."""
+        events = []
+        while len(events) < max_events:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
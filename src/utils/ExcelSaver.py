@@ -4,58 +4,104 @@ import pandas as pd
 from openpyxl import load_workbook, Workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Alignment
-from src.logger.logger import parser_logger
+from src.logger.logger import get_logger
+from src.utils.PriceNormalizer import OFFER_COLUMNS, normalize_prices, normalize_records
+from src.utils.PriceRanking import rank_offers
+from src.utils.QueryPlanner import fan_out_offers
+
+parser_logger = get_logger(__name__)
+
+# Формат числовой цены в ячейке в зависимости от валюты
+CURRENCY_FORMATS = {
+    "RUB": '#,##0.00 "₽"',
+    "USD": '"$"#,##0.00',
+    "EUR": '"€"#,##0.00',
+    "CNY": '"¥"#,##0.00',
+}
+
+# Лист с изменениями предложений относительно предыдущего запуска
+CHANGES_SHEET = "Changes"
+CHANGES_COLUMNS = ["change", "shop", "article", "description", "previous_price", "price", "url"]
+
+
+def price_number_format(currency, unit=None):
+    """Формат ячейки Excel для цены в заданной валюте и единице измерения."""
+    number_format = CURRENCY_FORMATS.get(currency, "#,##0.00")
+    if unit:
+        number_format += f' "/{unit}"'
+    return number_format
+
+
+def currency_from_number_format(number_format):
+    """Восстанавливает валюту по формату ячейки, записанному price_number_format."""
+    for currency, currency_format in CURRENCY_FORMATS.items():
+        if number_format and number_format.startswith(currency_format):
+            return currency
+    return None
 
 
 class ExcelSaver:
     # Add a class-level flag to track if the file has been cleaned
     _is_file_cleaned = False
 
-    def __init__(self, excel_file="output.xlsx", json_folder="json_data", articles=None):
-        """Инициализирует объект для работы с Excel и JSON-данными."""
+    def __init__(self, excel_file="output.xlsx", json_folder="json_data", articles=None, shop=None, database=None,
+                 queries=None):
+        """
+        Инициализирует объект для работы с Excel и JSON-данными.
+
+        :param shop: Название магазина в базе цен
+        :param database: PriceDatabase; если задана вместе с shop, данные берутся из последних проверок артикулов
+                         в базе, а не из самого свежего JSON-файла папки
+        :param queries: {артикул: поисковый запрос} (QueryPlan.query_of): предложения запроса показываются
+                        у каждого артикула, который искался под этим запросом
+        """
         
         try:
-            parser_logger.info(f"{self.__class__.__name__}: Инициализация класса")
+            parser_logger.info("%s: Инициализация класса", self.__class__.__name__)
 
             self.excel_file = excel_file  # Фиксированный путь к Excel-файлу
             self.json_folder = json_folder
             self.articles = articles or []  # Список артикулов передаётся из GUI
+            self.shop = shop
+            self.database = database
+            self.queries = queries or {}
             self.workbook = None  # Workbook для работы с несколькими листами
+            self.offers = None  # Нормализованные предложения последнего созданного листа
 
             parser_logger.debug(
-                f"{self.__class__.__name__}: Экземпляр создан с excel_file='{self.excel_file}', json_folder='{self.json_folder}', articles={len(self.articles)}")
+                "%s: Экземпляр создан с excel_file='%s', json_folder='%s', articles=%s", self.__class__.__name__, self.excel_file, self.json_folder, len(self.articles))
 
         except Exception as e:
-            parser_logger.exception(f"{self.__class__.__name__}: Ошибка при инициализации класса: {e}")
+            parser_logger.exception("%s: Ошибка при инициализации класса: %s", self.__class__.__name__, e)
 
     def _get_latest_json(self, folder):
         """Находит самый свежий JSON-файл в указанной папке."""
         
         try:
-            parser_logger.info(f"{self.__class__.__name__}: Поиск самого свежего JSON-файла в папке '{folder}'")
+            parser_logger.info("%s: Поиск самого свежего JSON-файла в папке '%s'", self.__class__.__name__, folder)
 
             # Получаем список JSON-файлов
             json_files = [os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".json")]
-            parser_logger.debug(f"{self.__class__.__name__}: Найдено {len(json_files)} JSON-файлов: {json_files}")
+            parser_logger.debug("%s: Найдено %s JSON-файлов: %s", self.__class__.__name__, len(json_files), json_files)
 
             # Если файлов нет — выдаем предупреждение и исключение
             if not json_files:
                 parser_logger.warning(
-                    f"{self.__class__.__name__}: Нет JSON-файлов в папке '{folder}', поиск невозможен")
+                    "%s: Нет JSON-файлов в папке '%s', поиск невозможен", self.__class__.__name__, folder)
                 raise FileNotFoundError("Нет JSON-файлов в указанной папке.")
 
             # Определяем самый свежий файл
             latest_file = max(json_files, key=os.path.getmtime)
-            parser_logger.info(f"{self.__class__.__name__}: Выбран самый свежий JSON-файл: '{latest_file}'")
+            parser_logger.info("%s: Выбран самый свежий JSON-файл: '%s'", self.__class__.__name__, latest_file)
 
             return latest_file
 
         except FileNotFoundError:
-            parser_logger.warning(f"{self.__class__.__name__}: Ошибка: Папка '{folder}' не найдена или пустая")
+            parser_logger.warning("%s: Ошибка: Папка '%s' не найдена или пустая", self.__class__.__name__, folder)
             raise
 
         except Exception as e:
-            parser_logger.exception(f"{self.__class__.__name__}: Ошибка при поиске JSON-файлов в '{folder}': {e}")
+            parser_logger.exception("%s: Ошибка при поиске JSON-файлов в '%s': %s", self.__class__.__name__, folder, e)
             raise
 
     def _load_price_from_json(self):
@@ -63,61 +109,76 @@ class ExcelSaver:
         
         try:
             self.json_file = self._get_latest_json(self.json_folder)  # Выбираем самый свежий JSON-файл
-            parser_logger.info(f"{self.__class__.__name__}: Начало загрузки данных из {self.json_file}")
+            parser_logger.info("%s: Начало загрузки данных из %s", self.__class__.__name__, self.json_file)
 
             # Читаем JSON
             with open(self.json_file, 'r', encoding='utf-8') as file:
                 data = json.load(file)
 
             parser_logger.info(
-                f"{self.__class__.__name__}: Данные из {self.json_file} успешно загружены ({len(data)} записей)")
+                "%s: Данные из %s успешно загружены (%s записей)", self.__class__.__name__, self.json_file, len(data))
             return data
 
         except FileNotFoundError:
             parser_logger.warning(
-                f"{self.__class__.__name__}: Файл JSON не найден ({self.json_file}), данные не загружены")
+                "%s: Файл JSON не найден (%s), данные не загружены", self.__class__.__name__, self.json_file)
             return {}
 
         except json.JSONDecodeError as e:
-            parser_logger.exception(f"{self.__class__.__name__}: Ошибка при разборе JSON-файла {self.json_file}: {e}")
+            parser_logger.exception("%s: Ошибка при разборе JSON-файла %s: %s", self.__class__.__name__, self.json_file, e)
             return {}
 
     def _open_excel(self):
         """Открывает существующий Excel-файл."""
         
         try:
-            parser_logger.info(f"{self.__class__.__name__}: Открытие Excel-файла '{self.excel_file}'")
+            parser_logger.info("%s: Открытие Excel-файла '%s'", self.__class__.__name__, self.excel_file)
 
             # Загружаем книгу
             self.workbook = load_workbook(self.excel_file)
 
         except FileNotFoundError:
-            parser_logger.warning(f"{self.__class__.__name__}: Файл '{self.excel_file}' не найден, процесс остановлен")
+            parser_logger.warning("%s: Файл '%s' не найден, процесс остановлен", self.__class__.__name__, self.excel_file)
             raise  # Останавливаем выполнение
 
         except Exception as e:
             parser_logger.exception(
-                f"{self.__class__.__name__}: Ошибка при загрузке Excel-файла '{self.excel_file}': {e}")
+                "%s: Ошибка при загрузке Excel-файла '%s': %s", self.__class__.__name__, self.excel_file, e)
             raise
 
     def _create_json_sheet(self):
         """Создаёт новый лист с именем JSON-файла и записывает данные по артикулам в заданном формате."""
         
+        sheet_name = None
         try:
-            self.json_file = self._get_latest_json(self.json_folder)
-            parser_logger.info(f"{self.__class__.__name__}: Создание нового листа из JSON-файла '{self.json_file}'")
-
-            self.data = self._load_price_from_json()
-            sheet_name = os.path.basename(self.json_file).split('.')[0].split("_")[0].removesuffix('Data')
-            parser_logger.debug(f"{self.__class__.__name__}: Имя нового листа: {sheet_name}")
+            if self.database is not None and self.shop:
+                # Индексированный запрос к базе вместо перебора файлов в папке
+                parser_logger.info("%s: Создание нового листа из базы цен для '%s'", self.__class__.__name__, self.shop)
+                self.data = {"Данные": self.database.latest_checked_records(self.shop)}
+                sheet_name = os.path.basename(os.path.normpath(self.json_folder)).removesuffix('Data')
+            else:
+                self.json_file = self._get_latest_json(self.json_folder)
+                parser_logger.info(
+                    "%s: Создание нового листа из JSON-файла '%s'", self.__class__.__name__, self.json_file)
+
+                self.data = self._load_price_from_json()
+                sheet_name = os.path.basename(self.json_file).split('.')[0].split("_")[0].removesuffix('Data')
+            parser_logger.debug("%s: Имя нового листа: %s", self.__class__.__name__, sheet_name)
 
             if sheet_name in self.workbook.sheetnames:
-                parser_logger.warning(f"{self.__class__.__name__}: Лист '{sheet_name}' уже существует, удаляем его")
+                parser_logger.warning("%s: Лист '%s' уже существует, удаляем его", self.__class__.__name__, sheet_name)
                 self.workbook.remove(self.workbook[sheet_name])
 
             self.workbook.create_sheet(sheet_name)
             ws = self.workbook[sheet_name]
 
+            # Цены переводятся в числа одной пачкой, предложения по артикулу — от дешёвых к дорогим
+            offers = normalize_records(self.data.get("Данные", []), shop=sheet_name)
+            offers = fan_out_offers(offers, self.queries)  # Одинаковые артикулы искались один раз
+            offers = offers.sort_values("price", na_position="last", kind="stable")
+            offers_by_article = {article: group for article, group in offers.groupby("article", sort=False)}
+            self.offers = offers
+
             current_col = 1  # Начальная колонка
             for article in self.articles:
                 col_letter = get_column_letter(current_col)
@@ -135,157 +196,206 @@ class ExcelSaver:
                 ws[f"{link_col_letter}2"] = "link"
 
                 row = 3  # Начальная строка для данных
-                for item in self.data.get("Данные", []):
-                    if article in item:
-                        description = item[article].get("description", "Не найдено")
-                        price = item[article].get("price", "Не найдено")
-                        link = item[article].get("url", "")
-                        ws[f"{col_letter}{row}"] = description
-                        ws[f"{next_col_letter}{row}"] = price
-                        ws[f"{link_col_letter}{row}"] = link
-                        if link:  # Если есть ссылка, делаем её кликабельной
-                            ws[f"{link_col_letter}{row}"].hyperlink = link
-                            ws[f"{link_col_letter}{row}"].style = "Hyperlink"
-                        row += 1
+                group = offers_by_article.get(article)
+                for offer in group.itertuples(index=False) if group is not None else ():
+                    link = offer.url if isinstance(offer.url, str) else ""
+                    ws[f"{col_letter}{row}"] = offer.description if isinstance(offer.description, str) else "Не найдено"
+                    price_cell = ws[f"{next_col_letter}{row}"]
+                    if offer.price == offer.price:  # Не NaN: пишем число с форматом валюты
+                        price_cell.value = float(offer.price)
+                        price_cell.number_format = price_number_format(
+                            offer.currency, offer.unit if isinstance(offer.unit, str) else None)
+                    else:
+                        price_cell.value = offer.raw_price if isinstance(offer.raw_price, str) else "Не найдено"
+                    ws[f"{link_col_letter}{row}"] = link
+                    if link:  # Если есть ссылка, делаем её кликабельной
+                        ws[f"{link_col_letter}{row}"].hyperlink = link
+                        ws[f"{link_col_letter}{row}"].style = "Hyperlink"
+                    row += 1
 
                 current_col += 3  # Переход к следующей тройке колонок
 
-            parser_logger.info(f"{self.__class__.__name__}: Создан новый лист '{sheet_name}' в заданном формате")
+            parser_logger.info("%s: Создан новый лист '%s' в заданном формате", self.__class__.__name__, sheet_name)
 
         except Exception as e:
-            parser_logger.exception(f"{self.__class__.__name__}: Ошибка при создании листа '{sheet_name}': {e}")
+            parser_logger.exception("%s: Ошибка при создании листа '%s': %s", self.__class__.__name__, sheet_name, e)
 
     def _save_to_excel(self):
         """Сохраняет изменения в Excel-файл."""
         
         try:
-            parser_logger.info(f"{self.__class__.__name__}: Сохранение изменений в '{self.excel_file}'")
+            parser_logger.info("%s: Сохранение изменений в '%s'", self.__class__.__name__, self.excel_file)
 
             self.workbook.save(self.excel_file)
 
-            parser_logger.info(f"{self.__class__.__name__}: Изменения успешно сохранены в '{self.excel_file}'")
+            parser_logger.info("%s: Изменения успешно сохранены в '%s'", self.__class__.__name__, self.excel_file)
 
         except PermissionError:
             parser_logger.exception(
-                f"{self.__class__.__name__}: Ошибка: Файл '{self.excel_file}' открыт в другой программе, сохранение невозможно")
+                "%s: Ошибка: Файл '%s' открыт в другой программе, сохранение невозможно", self.__class__.__name__, self.excel_file)
         except Exception as e:
             parser_logger.exception(
-                f"{self.__class__.__name__}: Ошибка при сохранении в Excel-файл '{self.excel_file}': {e}")
+                "%s: Ошибка при сохранении в Excel-файл '%s': %s", self.__class__.__name__, self.excel_file, e)
 
     def process_data(self):
         """Performs the full data processing cycle: loading, updating, and saving."""
         try:
-            parser_logger.info(f"{self.__class__.__name__}: Начало обработки данных")
+            parser_logger.info("%s: Начало обработки данных", self.__class__.__name__)
 
             # Clean the Excel file only if it hasn't been cleaned yet
             if not ExcelSaver._is_file_cleaned:
-                parser_logger.info(f"{self.__class__.__name__}: Очистка файла '{self.excel_file}'")
+                parser_logger.info("%s: Очистка файла '%s'", self.__class__.__name__, self.excel_file)
                 self.workbook = Workbook()  # Create a new workbook
                 self.workbook.save(self.excel_file)  # Save the empty workbook
-                parser_logger.info(f"{self.__class__.__name__}: Файл '{self.excel_file}' успешно очищен")
+                parser_logger.info("%s: Файл '%s' успешно очищен", self.__class__.__name__, self.excel_file)
                 ExcelSaver._is_file_cleaned = True  # Mark the file as cleaned
 
             # Open the existing Excel file
             self._open_excel()
-            parser_logger.info(f"{self.__class__.__name__}: Excel-файл успешно загружен")
+            parser_logger.info("%s: Excel-файл успешно загружен", self.__class__.__name__)
 
             # Create a new sheet with JSON data
             self._create_json_sheet()
-            parser_logger.info(f"{self.__class__.__name__}: Новый лист с JSON-данными успешно создан")
+            parser_logger.info("%s: Новый лист с JSON-данными успешно создан", self.__class__.__name__)
 
             # Save changes to the Excel file
             self._save_to_excel()
-            parser_logger.info(f"{self.__class__.__name__}: Изменения сохранены в Excel-файл")
+            parser_logger.info("%s: Изменения сохранены в Excel-файл", self.__class__.__name__)
 
-            parser_logger.info(f"{self.__class__.__name__}: Обработка данных завершена")
+            parser_logger.info("%s: Обработка данных завершена", self.__class__.__name__)
 
         except Exception as e:
-            parser_logger.exception(f"{self.__class__.__name__}: Ошибка во время обработки данных: {e}")
-
-    def aggregate_prices_to_first_sheet(self):
-        """Собирает все цены с каждого листа и аккумулирует их на первом листе."""
+            parser_logger.exception("%s: Ошибка во время обработки данных: %s", self.__class__.__name__, e)
+
+    def _read_sheet_offers(self):
+        """Собирает предложения с листов магазинов (тройки колонок name/price/link) в нормализованную таблицу."""
+        rows = []
+        for sheet_name in self.workbook.sheetnames[1:]:
+            if sheet_name == CHANGES_SHEET:
+                continue
+            sheet = self.workbook[sheet_name]
+            parser_logger.info("%s: Обрабатываем лист '%s'", self.__class__.__name__, sheet_name)
+
+            sheet_rows = list(sheet.iter_rows())
+            if not sheet_rows:
+                continue
+            for col in range(0, sheet.max_column, 3):  # Обрабатываем тройки колонок
+                article = sheet_rows[0][col].value
+                if not article:
+                    continue
+                for data_row in sheet_rows[2:]:
+                    name_cell, price_cell, link_cell = data_row[col:col + 3]
+                    if name_cell.value or price_cell.value:  # Добавляем только если есть данные
+                        rows.append((sheet_name, article, name_cell.value, link_cell.value, price_cell.value,
+                                     price_cell.number_format))
+
+        frame = pd.DataFrame(rows, columns=["shop", "article", "description", "url", "raw_price", "number_format"])
+        frame["product_code"] = None
+        frame["relevance"] = None
+        frame["unit"] = None
+
+        # Числа уже записаны _create_json_sheet с форматом валюты, строки разбираем заново
+        numeric = frame["raw_price"].map(lambda value: isinstance(value, (int, float))).astype(bool)
+        frame["price"] = frame["raw_price"].where(numeric).astype(float)
+        frame["currency"] = frame["number_format"].where(numeric).map(currency_from_number_format, na_action="ignore")
+        if (~numeric).any():
+            parsed = normalize_prices(frame.loc[~numeric, "raw_price"])
+            frame.loc[~numeric, "price"] = parsed["price"]
+            frame.loc[~numeric, "currency"] = parsed["currency"]
+        return frame[OFFER_COLUMNS]
+
+    def aggregate_prices_to_first_sheet(self, offers=None, top_n=3, base_currency="RUB", rates=None):
+        """
+        Пишет на первый лист сводку по артикулам: число предложений, минимальную и медианную цену,
+        самый дешёвый магазин и top_n лучших предложений среди всех магазинов.
+
+        :param offers: Нормализованные предложения всех магазинов (PriceNormalizer.normalize_records);
+                       если не заданы, читаются с листов магазинов
+        :param top_n: Сколько лучших предложений выводить по каждому артикулу
+        :param base_currency: Валюта сравнения цен
+        :param rates: Курсы других валют к base_currency (см. PriceRanking.rank_offers); предложения в валютах
+                      без курса сравниваются в отдельных строках артикула
+        """
         
         try:
-            parser_logger.info(f"{self.__class__.__name__}: Начало агрегации цен в Excel-файл '{self.excel_file}'")
+            parser_logger.info("%s: Начало агрегации цен в Excel-файл '%s'", self.__class__.__name__, self.excel_file)
 
             # Открываем Excel
             self._open_excel()
             first_sheet_name = self.workbook.sheetnames[0]
             first_sheet = self.workbook[first_sheet_name]
-            parser_logger.debug(f"{self.__class__.__name__}: Первый лист для агрегации: '{first_sheet_name}'")
+            parser_logger.debug("%s: Первый лист для агрегации: '%s'", self.__class__.__name__, first_sheet_name)
 
-            # Очистка первой страницы от старых данных
+            # Очистка первой страницы от старых данных (вместе с объединёнными ячейками прежнего формата)
+            for merged_range in list(first_sheet.merged_cells.ranges):
+                first_sheet.unmerge_cells(str(merged_range))
             first_sheet.delete_rows(1, first_sheet.max_row)
 
-            # Словарь для хранения данных по артикулам
-            aggregated_data = {}
-
-            for sheet_name in self.workbook.sheetnames[1:]:
-                sheet = self.workbook[sheet_name]
-                parser_logger.info(f"{self.__class__.__name__}: Обрабатываем лист '{sheet_name}'")
-
-                for col in range(1, sheet.max_column + 1, 3):  # Обрабатываем тройки колонок
-                    article_cell = sheet.cell(row=1, column=col)
-                    if not article_cell.value:
-                        continue
-
-                    article = article_cell.value
-                    shop_name = sheet_name  # Название магазина — имя листа
-
-                    # Инициализируем список для артикула, если его ещё нет
-                    if article not in aggregated_data:
-                        aggregated_data[article] = []
-
-                    # Собираем данные
-                    for data_row in range(3, sheet.max_row + 1):
-                        name = sheet.cell(row=data_row, column=col).value
-                        price = sheet.cell(row=data_row, column=col + 1).value
-                        link = sheet.cell(row=data_row, column=col + 2).value
-                        if name or price:  # Добавляем только если есть данные
-                            aggregated_data[article].append({
-                                "shop": shop_name,
-                                "name": name,
-                                "price": price,
-                                "link": link
-                            })
-
-            # Записываем данные на первый лист
-            current_col = 1
-            for article, records in aggregated_data.items():
-                # Объединяем четыре колонки для артикула
-                first_sheet.merge_cells(
-                    start_row=1, start_column=current_col, end_row=1, end_column=current_col + 3
-                )
-                first_sheet.cell(row=1, column=current_col).value = article
-                first_sheet.cell(row=1, column=current_col).alignment = Alignment(horizontal="center", vertical="center")
-
-                # Записываем заголовки "shop", "name", "price" и "link"
-                first_sheet.cell(row=2, column=current_col).value = "shop"
-                first_sheet.cell(row=2, column=current_col + 1).value = "name"
-                first_sheet.cell(row=2, column=current_col + 2).value = "price"
-                first_sheet.cell(row=2, column=current_col + 3).value = "link"
-
-                # Записываем данные
-                row = 3
-                for record in records:
-                    first_sheet.cell(row=row, column=current_col).value = record["shop"]
-                    first_sheet.cell(row=row, column=current_col + 1).value = record["name"]
-                    first_sheet.cell(row=row, column=current_col + 2).value = record["price"]
-                    link_cell = first_sheet.cell(row=row, column=current_col + 3)
-                    link_cell.value = record["link"]
-                    if link_cell.value:  # Если есть ссылка, делаем её кликабельной
+            if offers is None:
+                offers = self._read_sheet_offers()
+
+            summary = rank_offers(offers, articles=self.articles or None, top_n=top_n,
+                                  base_currency=base_currency, rates=rates)
+
+            columns = list(summary.columns)
+            price_columns = [index + 1 for index, name in enumerate(columns)
+                             if name in ("min_price", "median_price") or name.startswith("price_")]
+            link_columns = [index + 1 for index, name in enumerate(columns) if name.startswith("link_")]
+            currency_column = columns.index("currency")
+
+            first_sheet.append(columns)
+            for row in summary.itertuples(index=False, name=None):
+                first_sheet.append([None if value is None or value != value else value for value in row])
+
+            # Форматы цен и кликабельные ссылки
+            for row in first_sheet.iter_rows(min_row=2):
+                number_format = price_number_format(row[currency_column].value or base_currency)
+                for column in price_columns:
+                    row[column - 1].number_format = number_format
+                for column in link_columns:
+                    link_cell = row[column - 1]
+                    if link_cell.value:
                         link_cell.hyperlink = link_cell.value
                         link_cell.style = "Hyperlink"
-                    row += 1
 
-                current_col += 4  # Переход к следующей четвёрке колонок
+            for column in range(1, len(columns) + 1):
+                first_sheet.column_dimensions[get_column_letter(column)].width = 16
+            first_sheet.freeze_panes = "B2"
 
-            parser_logger.info(f"{self.__class__.__name__}: Агрегация завершена, данные сохранены в '{self.excel_file}'")
+            parser_logger.info("%s: Агрегация завершена (%s артикулов), данные сохранены в '%s'",
+                               self.__class__.__name__, len(summary), self.excel_file)
 
             # Сохранение изменений
             self._save_to_excel()
 
         except Exception as e:
-            parser_logger.exception(f"{self.__class__.__name__}: Ошибка при агрегации цен: {e}")
+            parser_logger.exception("%s: Ошибка при агрегации цен: %s", self.__class__.__name__, e)
 
+    def save_changes_sheet(self, changes):
+        """
+        Пишет лист "Changes": новые, исчезнувшие и подорожавшие/подешевевшие предложения.
 
+        :param changes: Словари со столбцами CHANGES_COLUMNS (см. PriceDatabase.run_changes)
+        """
+        try:
+            parser_logger.info("%s: Запись %s изменений на лист '%s'", self.__class__.__name__, len(changes), CHANGES_SHEET)
+
+            self._open_excel()
+            if CHANGES_SHEET in self.workbook.sheetnames:
+                self.workbook.remove(self.workbook[CHANGES_SHEET])
+            ws = self.workbook.create_sheet(CHANGES_SHEET)
+
+            ws.append(CHANGES_COLUMNS)
+            link_column = CHANGES_COLUMNS.index("url")
+            for change in changes:
+                ws.append([change.get(column) for column in CHANGES_COLUMNS])
+                link_cell = ws.cell(row=ws.max_row, column=link_column + 1)
+                if isinstance(link_cell.value, str) and link_cell.value.startswith("http"):
+                    link_cell.hyperlink = link_cell.value
+                    link_cell.style = "Hyperlink"
+            ws.freeze_panes = "A2"
+
+            self._save_to_excel()
+
+        except Exception as e:
+            parser_logger.exception("%s: Ошибка при записи листа изменений: %s", self.__class__.__name__, e)
@@ -0,0 +1,58 @@
+RESULTS = "results"  # На странице есть карточки товаров
+EMPTY = "empty"  # Сайт честно ответил, что ничего не найдено
+CAPTCHA = "captcha"  # Капча или проверка «вы не робот»
+BLOCK = "block"  # Доступ запрещён, 429 и т. п.
+ERROR = "error"  # Карточек нет, и страница не похожа ни на один из вариантов выше
+
+# Классы, после которых имеет смысл сменить сессию браузера и повторить запрос
+BLOCKED = (CAPTCHA, BLOCK)
+
+# Проверки, результатам которых можно доверять при сравнении запусков
+TRUSTED = (RESULTS, EMPTY)
+
+CAPTCHA_MARKERS = ("captcha", "капча", "showcaptcha", "smartcaptcha", "are you a robot", "вы робот", "не робот",
+                   "подтвердите, что запросы отправляли вы", "verify you are human", "hcaptcha", "recaptcha")
+# Код "429" сам по себе не ищем: он бывает частью артикула, а страница ответа 429 содержит "too many requests"
+BLOCK_MARKERS = ("too many requests", "access denied", "доступ ограничен", "доступ запрещён",
+                 "доступ запрещен", "forbidden", "blocked", "заблокирован", "unusual traffic", "подозрительн")
+EMPTY_MARKERS = ("ничего не найдено", "не найдено", "нет результатов", "по вашему запросу", "no results",
+                 "no exact matches", "0 results", "не нашлось", "ничего не нашлось")
+
+
+class PageClassifier:
+    """
+    Определяет, что вернул магазин в ответ на поиск: результаты, пустую выдачу, капчу, блокировку или ошибку.
+
+    Маркеры ищутся в заголовке, адресе и начале текста страницы (без учёта регистра). Парсеры магазинов
+    могут дополнить маркеры своими фразами.
+    """
+
+    def __init__(self, captcha_markers=CAPTCHA_MARKERS, block_markers=BLOCK_MARKERS, empty_markers=EMPTY_MARKERS):
+        self.captcha_markers = tuple(marker.lower() for marker in captcha_markers)
+        self.block_markers = tuple(marker.lower() for marker in block_markers)
+        self.empty_markers = tuple(marker.lower() for marker in empty_markers)
+
+    def classify(self, cards_found, title="", url="", text=""):
+        """
+        :param cards_found: Сколько карточек нашёл парсер на странице
+        :param title: Заголовок страницы
+        :param url: Текущий адрес
+        :param text: Видимый текст страницы (достаточно первых нескольких килобайт)
+        :return: RESULTS, EMPTY, CAPTCHA, BLOCK или ERROR
+        """
+        page = f"{title}\n{url}\n{text}".lower()
+        if any(marker in page for marker in self.captcha_markers):
+            return CAPTCHA
+        if cards_found:
+            return RESULTS
+        if any(marker in page for marker in self.block_markers):
+            return BLOCK
+        if any(marker in page for marker in self.empty_markers):
+            return EMPTY
+        return ERROR
+
+    def is_throttled(self, title="", url=""):
+        """Быстрая проверка сразу после навигации: капча в заголовке или адресе, блокировка в заголовке."""
+        title, url = title.lower(), url.lower()
+        return any(marker in title or marker in url for marker in self.captcha_markers) or \
+            any(marker in title for marker in self.block_markers)
@@ -0,0 +1,575 @@
+import json
+import os
+import platform
+import queue
+import signal
+import subprocess
+import time
+import multiprocessing as mp
+from datetime import datetime
+
+from src.logger.logger import Logger, get_logger
+from src.utils.ProxyPool import ProxyPool, use_proxy_pool
+from src.utils.RateLimiter import domain_of, shared_state, use_shared_states
+
+parser_logger = get_logger(__name__)
+
+
+class ParserJob:
+    """Задание для одного рабочего процесса: магазин и его доля (шард) артикулов."""
+
+    def __init__(self, shop, parser_class, site_url, json_folder, articles, keep_browser=False, shard=0):
+        """
+        :param shop: Название магазина (ключ из списка магазинов GUI)
+        :param parser_class: Класс парсера или путь к нему ('src.parsers.ShopCatalog.CHIPDIP')
+        :param site_url: URL сайта магазина
+        :param json_folder: Папка, куда сохраняется итоговый JSON магазина
+        :param articles: Артикулы, которые обрабатывает этот шард
+        :param keep_browser: Не закрывать браузер между артикулами (как у Aliexpress)
+        :param shard: Номер шарда внутри магазина
+        """
+        self.shop = shop
+        self.parser_class = parser_class
+        self.site_url = site_url
+        self.json_folder = json_folder
+        self.articles = list(articles)
+        self.keep_browser = keep_browser
+        self.shard = shard
+
+        self.position = 0  # Индекс следующего необработанного артикула
+        self.restarts = 0
+        self.current_started = None  # Время начала обработки текущего артикула или контрольного запроса
+        self.probing = False  # Процесс выполняет контрольный запрос (см. ShopHealth)
+        self.finished = False
+        self.failed = {}  # Артикул -> причина сбоя
+        self.statuses = {}  # Артикул -> ответ магазина (results, empty, captcha, block, error)
+        self.process = None
+        self.queue = None
+        self.recycle = None  # Событие: перезапустить браузер перед следующим артикулом (см. ResourceSampler)
+
+    @property
+    def name(self):
+        return f"{self.shop}#{self.shard}"
+
+
+def _kill_process_tree(pid):
+    """Убивает рабочий процесс вместе с дочерними chromedriver/Chrome."""
+    try:
+        if platform.system() == "Windows":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            # Рабочий процесс запускается в своей группе, поэтому гасим всю группу
+            os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+def _probe_shop(parser_instance):
+    """Проверка магазина контрольным запросом (см. ShopEngineParser.probe_health). :return: (исправен, описание)"""
+    probe = getattr(parser_instance, "probe_health", None)
+    if probe is None:
+        return True, "парсер не поддерживает проверку"
+    try:
+        return probe()
+    except Exception as e:
+        return True, f"проверка не выполнена: {type(e).__name__}: {e}"
+
+
+def _worker_main(parser_class, site_url, articles, start, keep_browser, result_queue, log_queue,
+                 recycle_event=None, probe=False, limiter_states=None, proxies=None):
+    """
+    Точка входа рабочего процесса: парсит артикулы, начиная с `start`, и стримит результаты в очередь.
+
+    Записи артикула уходят супервизору сразу после обработки, сам процесс их не копит и в файлы не пишет.
+
+    С probe сначала проверяет магазин контрольным запросом и, если магазин сломан, не берётся за артикулы.
+    limiter_states — {домен: состояние ограничителя скорости} от супервизора, общее для всех шардов магазина.
+    proxies — доля прокси, выданная супервизором (None — без прокси); результаты запросов через них
+    отправляются супервизору сообщениями "proxy".
+    """
+    Logger().use_queue(log_queue)  # Логи пишет родительский процесс
+    if limiter_states:
+        use_shared_states(limiter_states)
+    # Пул процесса не читает настройки и не проверяет прокси заново: это уже сделал супервизор
+    use_proxy_pool(None if proxies is None else ProxyPool(
+        proxies, on_report=lambda proxy, domain, outcome: result_queue.put(("proxy", proxy.url, domain, outcome))))
+
+    from src.parsers.AbstractParser import AbstractParser
+    from src.parsers.ShopRegistry import load_parser_class
+
+    if isinstance(parser_class, str):
+        parser_class = load_parser_class(parser_class)  # Модуль магазина импортируется только в воркере
+
+    if platform.system() != "Windows":
+        os.setsid()  # Своя группа процессов, чтобы супервизор мог убить Chrome вместе с воркером
+
+    # JSON магазина пишет супервизор: _run_once() не должен заводить новый файл в этом процессе
+    AbstractParser._first_instance_called[parser_class.__name__] = False
+    AbstractParser._filepath = ""
+
+    parser_instance = None
+    if keep_browser:
+        # Браузер запускается на этапе setup первого артикула и дальше переиспользуется
+        parser_instance = parser_class(url=site_url, request="", items=[])
+
+    if probe:
+        result_queue.put(("probing",))  # Зависший контрольный запрос супервизор остановит, как зависший артикул
+        probe_instance = parser_instance or parser_class(url=site_url, request="", items=[])
+        ok, details = _probe_shop(probe_instance)
+        result_queue.put(("health", ok, details))
+        if not keep_browser:
+            probe_instance._quit_driver()
+        if not ok:
+            if keep_browser:
+                parser_instance._quit_driver()
+            result_queue.put(("finished",))
+            return
+
+    for index in range(start, len(articles)):
+        article = articles[index]
+        result_queue.put(("started", index))
+
+        if not keep_browser:
+            parser_instance = parser_class(url=site_url, request="", items=[])
+        parser_instance.request = article
+        parser_instance.items = [article]
+        status = parser_instance.parse_with_recovery()  # При капче/блокировке сессия меняется и запрос повторяется
+
+        # Записи этого артикула; буфер парсера очищается, чтобы память процесса не росла с числом артикулов
+        new_records = list(parser_instance.request_records)
+        AbstractParser._pending.clear()
+        failure = getattr(parser_instance, "stage_failure", None)
+        failure = str(failure) if failure else None
+        stage_timings = list(getattr(parser_instance, "stage_timings", []))
+        result_queue.put(("done", index, new_records, status, failure, stage_timings))
+
+        if not keep_browser:
+            parser_instance._quit_driver()
+        elif recycle_event is not None and recycle_event.is_set():
+            # Chrome разросся выше порога памяти: следующий артикул откроется в новом браузере
+            parser_instance._rotate_session()
+            recycle_event.clear()
+
+    if keep_browser:
+        parser_instance._quit_driver()
+
+    result_queue.put(("finished",))
+
+
+class ParserSupervisor:
+    """
+    Запускает парсеры магазинов в отдельных процессах и следит за ними.
+
+    Каждый магазин (или его шард) работает в своём процессе со своим браузером. Супервизор
+    получает результаты через очереди, ограничивает время обработки одного артикула, убивает
+    зависшие процессы вместе с Chrome и перезапускает их со следующего артикула.
+
+    Один супервизор обслуживает весь запуск: run() можно вызывать для каждой пачки артикулов, счётчики
+    прогресса, id запусков в базе и JSON-файл магазина при этом общие для всех пачек.
+    """
+
+    def __init__(self, jobs=(), max_workers=None, article_timeout=180, max_restarts=3, poll_interval=0.5,
+                 on_event=None, on_progress=None, database=None, run_ids=None, metrics=None, resource_sampler=None,
+                 health=None, database_batch_size=100, proxy_pool=None):
+        """
+        :param jobs: Список ParserJob (задания пачки можно передать и в run())
+        :param max_workers: Сколько процессов работает одновременно (по умолчанию — по числу ядер)
+        :param article_timeout: Предельное время обработки одного артикула, сек
+        :param max_restarts: Сколько раз можно перезапустить процесс одного задания
+        :param poll_interval: Период опроса очередей и процессов, сек
+        :param on_event: Функция для текстовых сообщений о ходе работы (например, консоль GUI)
+        :param on_progress: Функция для событий прогресса по магазинам (см. EventBus)
+        :param database: PriceDatabase, в которую пачками сохраняются результаты каждого артикула
+        :param run_ids: {магазин: id запуска в базе} (заполняется при старте)
+        :param metrics: RunMetrics, куда пишутся скорость, длительность этапов, число браузеров и очередь
+        :param resource_sampler: ResourceSampler для замеров памяти и CPU рабочих вместе с Chrome
+        :param health: ShopHealth — проверка магазинов контрольным запросом и отключение сломанных
+        :param database_batch_size: Сколько обработанных артикулов магазина копится до записи в базу (одной
+                                    транзакцией) и в JSON магазина
+        :param proxy_pool: Проверенный ProxyPool; каждый рабочий процесс получает из него свою долю прокси
+        """
+        self.jobs = list(jobs)
+        self.max_workers = max_workers  # None — по числу ядер, но не больше числа заданий пачки
+        self.article_timeout = article_timeout
+        self.max_restarts = max_restarts
+        self.poll_interval = poll_interval
+        self.on_event = on_event
+        self.on_progress = on_progress
+        self.database = database
+        self._run_ids = run_ids if run_ids is not None else {}
+        self.metrics = metrics
+        self.resource_sampler = resource_sampler
+        self.health = health
+        self.database_batch_size = database_batch_size
+        self.proxy_pool = proxy_pool
+        self._pending_checks = {}  # Магазин -> артикулы, ещё не записанные в базу и JSON (см. _flush_checks)
+        self._offers = {}  # Магазин -> сколько записей сохранено за запуск
+        self._progress = {}  # Магазин -> счётчики прогресса за весь запуск
+        self._json_files = {}  # Магазин -> JSON-файл запуска, куда дописываются записи пачками
+        self._limiter_states = {}  # Домен -> состояние ограничителя скорости, общее для шардов и перезапусков
+        self._context = mp.get_context("spawn")  # fork небезопасен рядом с Tk и потоками Selenium
+
+    @classmethod
+    def from_shops(cls, shops, articles, shards_per_shop=1, **kwargs):
+        """Создаёт супервизор с заданиями из описаний магазинов (см. jobs_for)."""
+        return cls(cls.jobs_for(shops, articles, shards_per_shop), **kwargs)
+
+    @staticmethod
+    def jobs_for(shops, articles, shards_per_shop=1):
+        """
+        Собирает задания из описаний магазинов.
+
+        :param shops: Список словарей с ключами shop, parser_class, site_name, json_folder, keep_browser
+                      и необязательным articles — свой список артикулов магазина (parser_class — класс или путь к нему)
+        :param articles: Список артикулов
+        :param shards_per_shop: На сколько процессов делить артикулы одного магазина
+        """
+        jobs = []
+        for shop_info in shops:
+            shop_articles = shop_info.get("articles", articles)
+            shard_count = max(1, min(shards_per_shop, len(shop_articles)))
+            for shard in range(shard_count):
+                jobs.append(ParserJob(
+                    shop=shop_info["shop"],
+                    parser_class=shop_info["parser_class"],
+                    site_url=shop_info["site_name"],
+                    json_folder=shop_info["json_folder"],
+                    articles=shop_articles[shard::shard_count],
+                    keep_browser=shop_info.get("keep_browser", False),
+                    shard=shard,
+                ))
+        return jobs
+
+    def _notify(self, message):
+        parser_logger.info("%s: %s", self.__class__.__name__, message)
+        if self.on_event:
+            self.on_event(message)
+
+    def _report_progress(self, job, article, failed=False, status=None, stage_timings=()):
+        """Обновляет счётчики магазина и метрики запуска, отправляет событие прогресса."""
+        if self.metrics is not None:
+            seconds = time.monotonic() - job.current_started if job.current_started else None
+            self.metrics.article_done(job.shop, status or "error", failed=failed, seconds=seconds,
+                                      stages=stage_timings)
+        stats = self._progress[job.shop]
+        stats["failed" if failed else "done"] += 1
+        if not self.on_progress:
+            return
+
+        processed = stats["done"] + stats["failed"]
+        elapsed = time.monotonic() - stats["started"]
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        remaining = stats["total"] - processed
+        self.on_progress({
+            "shop": job.shop,
+            "article": article,
+            "done": stats["done"],
+            "failed": stats["failed"],
+            "total": stats["total"],
+            "rate": rate,
+            "eta": remaining / rate if rate > 0 else None,
+        })
+
+    def _start(self, job):
+        """Запускает (или перезапускает) процесс задания с позиции job.position."""
+        job.queue = self._context.Queue()
+        job.recycle = self._context.Event()
+        probe = self.health is not None and not job.restarts and self.health.claim_probe(job.shop)
+        domain = domain_of(job.site_url)
+        if domain not in self._limiter_states:
+            self._limiter_states[domain] = shared_state(domain, self._context)
+        proxies = None
+        if self.proxy_pool is not None:
+            # Прокси делятся поровну между заданиями; перезапущенный процесс получает свежую долю без заблокированных
+            share = max(1, len(self.proxy_pool.proxies) // max(1, len(self.jobs)))
+            proxies = self.proxy_pool.assign(job.name, domain, share)
+        job.process = self._context.Process(
+            target=_worker_main,
+            args=(job.parser_class, job.site_url, job.articles, job.position, job.keep_browser,
+                  job.queue, Logger().process_queue(self._context), job.recycle, probe,
+                  {domain: self._limiter_states[domain]}, proxies),
+            name=f"parser-{job.name}",
+            daemon=True,
+        )
+        job.current_started = None
+        job.probing = False
+        job.process.start()
+        if self.metrics is not None:
+            self.metrics.worker_started(job.shop)
+        parser_logger.info(
+            "%s: Запущен процесс %s (pid=%s), с артикула %s", self.__class__.__name__, job.name, job.process.pid, job.position)
+
+    def _drain(self, job):
+        """Забирает все накопившиеся сообщения рабочего процесса."""
+        while True:
+            try:
+                message = job.queue.get_nowait()
+            except queue.Empty:
+                return
+            except (EOFError, OSError, ValueError):
+                return
+
+            kind = message[0]
+            if kind == "probing":
+                job.probing = True
+                job.current_started = time.monotonic()
+            elif kind == "health":
+                ok, details = message[1:3]
+                job.probing = False
+                job.current_started = None
+                self._notify(f"{job.shop}: проверка контрольным запросом: {details}")
+                if self.health.probe_done(job.shop, ok, details):
+                    self._shop_disabled(job.shop)
+            elif kind == "started":
+                job.position = message[1]
+                job.current_started = time.monotonic()
+            elif kind == "done":
+                index, records, status, failure, stage_timings = message[1:6]
+                job.statuses[job.articles[index]] = status
+                if failure:
+                    job.failed[job.articles[index]] = failure  # Этап парсинга не удался (см. StagePolicy)
+                # Записи не копятся в памяти: пачками уходят в базу и в JSON магазина
+                pending = self._pending_checks.setdefault(job.shop, [])
+                pending.append((job.articles[index], records, status, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+                if len(pending) >= self.database_batch_size:
+                    self._flush_checks(job.shop)
+                job.position = index + 1
+                self._notify(f"{job.shop}: артикул {job.articles[index]} обработан ({status}), записей: {len(records)}"
+                             + (f", сбой: {failure}" if failure else ""))
+                self._report_progress(job, job.articles[index], failed=bool(failure), status=status,
+                                      stage_timings=stage_timings)
+                job.current_started = None
+                if self.health is not None and self.health.record(job.shop, status, failed=bool(failure)):
+                    self._shop_disabled(job.shop)
+            elif kind == "proxy":
+                self.proxy_pool.report(*message[1:4])
+            elif kind == "finished":
+                job.finished = True
+
+    def _flush_checks(self, shop=None):
+        """
+        Записывает накопленные артикулы магазина (или всех магазинов) в базу одной транзакцией на магазин
+        и дописывает их записи в JSON магазина.
+        """
+        for pending_shop in [shop] if shop is not None else list(self._pending_checks):
+            pending = self._pending_checks.pop(pending_shop, None)
+            if not pending:
+                continue
+            if self.database is not None:
+                self.database.save_checks(self._run_ids[pending_shop], pending_shop, pending)
+            records = [record for _, article_records, _, _ in pending for record in article_records]
+            self._append_shop_json(pending_shop, records)
+
+    def _skip_current(self, job, reason):
+        """
+        Помечает текущий артикул как сбойный и решает, перезапускать ли процесс.
+
+        Если процесс упал или завис на контрольном запросе, проверка магазина считается не пройденной.
+        """
+        if job.probing:
+            job.probing = False
+            self._notify(f"{job.shop}: проверка контрольным запросом не завершилась ({reason})")
+            if self.health.probe_done(job.shop, False, reason):
+                self._shop_disabled(job.shop)
+        elif job.position < len(job.articles):
+            article = job.articles[job.position]
+            job.failed[article] = reason
+            self._notify(f"{job.shop}: артикул {article} пропущен ({reason})")
+            self._report_progress(job, article, failed=True)
+            job.position += 1
+            if self.health is not None and self.health.record(job.shop, failed=True):
+                self._shop_disabled(job.shop)
+        job.current_started = None
+
+        if self._is_disabled(job):
+            self._abandon(job, stop=False)
+            return False
+        if job.position >= len(job.articles):
+            return False
+        if job.restarts >= self.max_restarts:
+            for article in job.articles[job.position:]:
+                job.failed[article] = "лимит перезапусков"
+                self._report_progress(job, article, failed=True)
+            self._notify(f"{job.shop}: исчерпан лимит перезапусков, оставшиеся артикулы пропущены")
+            return False
+
+        job.restarts += 1
+        return True
+
+    def _is_disabled(self, job):
+        return self.health is not None and self.health.is_disabled(job.shop)
+
+    def _shop_disabled(self, shop):
+        if self.metrics is not None:
+            self.metrics.shop_disabled(shop)
+        self._notify(f"{shop}: магазин отключён до конца запуска ({self.health.disabled[shop]}), "
+                     f"оставшиеся артикулы пропускаются")
+
+    def _abandon(self, job, stop=True):
+        """Останавливает задание отключённого магазина и помечает его оставшиеся артикулы сбойными."""
+        if stop and job.process is not None:
+            self._stop(job)
+            self._worker_stopped(job)
+        reason = f"магазин отключён: {self.health.disabled[job.shop]}"
+        for article in job.articles[job.position:]:
+            job.failed[article] = reason
+            self._report_progress(job, article, failed=True)
+        job.position = len(job.articles)
+        job.current_started = None
+
+    def _worker_stopped(self, job, restarted=False):
+        if self.proxy_pool is not None:
+            self.proxy_pool.release(job.name)
+        if self.metrics is not None:
+            self.metrics.worker_stopped(job.shop, restarted=restarted, worker=job.name)
+
+    def _sample_resources(self, running):
+        """Замеряет память и CPU рабочих с их Chrome; разросшимся браузерам назначает перезапуск."""
+        usages = self.resource_sampler.sample({(job.shop, job.name): job.process.pid for job in running
+                                               if job.process.is_alive()})
+        if not usages:
+            return
+        jobs = {job.name: job for job in running}
+        for usage in usages:
+            if self.metrics is not None:
+                self.metrics.resource_usage(usage.shop, usage.worker, usage.rss, usage.cpu, usage.processes)
+            parser_logger.debug("%s: %s: %.0f МБ, CPU %.0f%%, процессов %s (браузер %s)", self.__class__.__name__,
+                                usage.worker, usage.rss_mb, usage.cpu, usage.processes, usage.browser_processes)
+
+            job = jobs.get(usage.worker)
+            # Без keep_browser браузер и так закрывается после каждого артикула
+            if job is None or not job.keep_browser or job.recycle.is_set() or not self.resource_sampler.over_limit(usage):
+                continue
+            job.recycle.set()
+            if self.metrics is not None:
+                self.metrics.browser_recycled(job.shop)
+            self._notify(f"{job.shop}: браузер {job.name} занимает {usage.rss_mb:.0f} МБ "
+                         f"(порог {self.resource_sampler.recycle_rss_mb:.0f} МБ), будет перезапущен")
+
+    def _stop(self, job):
+        if job.process.is_alive():
+            _kill_process_tree(job.process.pid)
+        job.process.join(5)
+        if job.process.is_alive():
+            job.process.kill()
+            job.process.join(5)
+        job.queue.close()
+
+    def _open_shop_json(self, job):
+        """Создаёт пустой JSON магазина в формате парсеров: один файл на запуск, записи дописываются пачками."""
+        if job.shop in self._json_files:
+            return
+        prefix = os.path.basename(os.path.normpath(job.json_folder))
+        os.makedirs(job.json_folder, exist_ok=True)
+        filepath = os.path.join(job.json_folder, f"{prefix}_{datetime.now().strftime('%H-%M-%S_%d-%m-%Y')}.json")
+        with open(filepath, 'w', encoding='utf-8') as file:
+            json.dump({
+                "Дата и время создания файла": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                "Данные": []
+            }, file, ensure_ascii=False, indent=4)
+        self._json_files[job.shop] = filepath
+        self._offers.setdefault(job.shop, 0)
+
+    def _append_shop_json(self, shop, records):
+        """Дописывает записи в конец JSON магазина, не читая файл."""
+        from src.parsers.AbstractParser import AbstractParser
+
+        if not records:
+            return
+        AbstractParser._append_json_records(self._json_files[shop], records)
+        self._offers[shop] += len(records)
+        parser_logger.info("%s: %s: дописано %s записей в %s", self.__class__.__name__, shop, len(records),
+                           self._json_files[shop])
+
+    def run(self, jobs=None):
+        """
+        Выполняет задания и возвращает их результаты по магазинам.
+
+        :param jobs: Задания очередной пачки артикулов (по умолчанию — переданные в конструктор)
+        :return: {магазин: {"offers": сколько записей сохранено за весь запуск, "failed": {артикул: причина},
+                  "statuses": {артикул: ответ магазина}, "json_file": путь, "run_id": id}}; сами записи
+                  лежат в JSON-файле и в базе
+        """
+        if jobs is not None:
+            self.jobs = list(jobs)
+        max_workers = self.max_workers or min(os.cpu_count() or 1, max(len(self.jobs), 1))
+        pending = list(self.jobs)
+        running = []
+        for job in self.jobs:
+            stats = self._progress.setdefault(job.shop, {"total": 0, "done": 0, "failed": 0,
+                                                         "started": time.monotonic()})
+            stats["total"] += len(job.articles)
+            if self.metrics is not None:
+                self.metrics.add_queued(job.shop, len(job.articles))
+            if self.database is not None and job.shop not in self._run_ids:
+                self._run_ids[job.shop] = self.database.start_run(job.shop)
+            self._open_shop_json(job)
+
+        self._notify(f"Запуск {len(self.jobs)} заданий, процессов одновременно: {max_workers}")
+        try:
+            while pending or running:
+                while pending and len(running) < max_workers:
+                    job = pending.pop(0)
+                    if self._is_disabled(job):
+                        self._abandon(job)
+                        continue
+                    self._start(job)
+                    running.append(job)
+
+                time.sleep(self.poll_interval)
+
+                if self.resource_sampler is not None:
+                    self._sample_resources(running)
+
+                for job in list(running):
+                    self._drain(job)
+
+                    if self._is_disabled(job):
+                        running.remove(job)
+                        self._abandon(job)
+                        continue
+
+                    if not job.process.is_alive():
+                        job.process.join()
+                        self._drain(job)  # Сообщения могли дойти уже после выхода процесса
+                        job.queue.close()
+                        if job.finished or job.position >= len(job.articles):
+                            running.remove(job)
+                            self._worker_stopped(job)
+                            continue
+                        parser_logger.error(
+                            "%s: Процесс %s завершился с кодом %s", self.__class__.__name__, job.name, job.process.exitcode)
+                        running.remove(job)
+                        restart = self._skip_current(job, f"сбой процесса, код {job.process.exitcode}")
+                        self._worker_stopped(job, restarted=restart)
+                        if restart:
+                            pending.insert(0, job)
+                        continue
+
+                    if job.current_started and time.monotonic() - job.current_started > self.article_timeout:
+                        parser_logger.error(
+                            "%s: Процесс %s завис, превышено %s с", self.__class__.__name__, job.name, self.article_timeout)
+                        self._drain(job)
+                        self._stop(job)
+                        running.remove(job)
+                        restart = self._skip_current(job, "превышено время ожидания")
+                        self._worker_stopped(job, restarted=restart)
+                        if restart:
+                            pending.insert(0, job)
+
+            self._flush_checks()
+            results = {}
+            for job in self.jobs:
+                shop_result = results.setdefault(job.shop, {
+                    "offers": self._offers[job.shop], "failed": {}, "statuses": {},
+                    "json_file": self._json_files[job.shop], "run_id": self._run_ids.get(job.shop)})
+                shop_result["failed"].update(job.failed)
+                shop_result["statuses"].update(job.statuses)
+            return results
+
+        finally:
+            for job in running:
+                self._stop(job)
+                self._worker_stopped(job)
+            self._flush_checks()  # Уже полученные результаты не теряются и при прерванном запуске
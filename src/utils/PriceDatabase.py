@@ -0,0 +1,396 @@
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+from src.logger.logger import get_logger
+from src.utils.PageClassifier import TRUSTED
+
+parser_logger = get_logger(__name__)
+
+
+# position — номер предложения в выдаче артикула: у двух карточек одного товара (одинаковый product_key)
+# в одной проверке разные позиции, и ни одна не перезаписывает другую
+OFFERS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id       INTEGER NOT NULL REFERENCES runs(id),
+    shop         TEXT NOT NULL,
+    article      TEXT NOT NULL,
+    product_key  TEXT NOT NULL,
+    observed_at  TEXT NOT NULL,
+    description  TEXT,
+    price        TEXT,
+    url          TEXT,
+    payload      TEXT NOT NULL,
+    fingerprint  TEXT,
+    position     INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (shop, article, product_key, observed_at, position)
+);
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    shop        TEXT NOT NULL,
+    started_at  TEXT NOT NULL
+);
+""" + OFFERS_TABLE.format(name="offers") + """
+
+-- Какие артикулы проверялись в запуске (в том числе без найденных предложений)
+CREATE TABLE IF NOT EXISTS checks (
+    run_id      INTEGER NOT NULL REFERENCES runs(id),
+    shop        TEXT NOT NULL,
+    article     TEXT NOT NULL,
+    checked_at  TEXT NOT NULL,
+    offers      INTEGER NOT NULL,
+    status      TEXT,
+    PRIMARY KEY (run_id, article)
+);
+
+CREATE INDEX IF NOT EXISTS idx_runs_shop ON runs (shop, id);
+CREATE INDEX IF NOT EXISTS idx_offers_run ON offers (run_id);
+-- Последняя цена по артикулу в магазине
+CREATE INDEX IF NOT EXISTS idx_offers_latest ON offers (shop, article, observed_at);
+-- Изменение цены конкретного товара между запусками
+CREATE INDEX IF NOT EXISTS idx_offers_product ON offers (shop, article, product_key, observed_at);
+-- Индекс отпечатков запуска для сравнения с предыдущей проверкой артикула
+CREATE INDEX IF NOT EXISTS idx_offers_fingerprint ON offers (run_id, article, product_key, fingerprint);
+-- Предыдущая проверка артикула в магазине
+CREATE INDEX IF NOT EXISTS idx_checks_article ON checks (shop, article, run_id);
+"""
+
+
+# Проверки, которым можно доверять: без капчи, блокировки и ошибки (NULL — история до классификации ответов)
+TRUSTED_CHECK = "(status IS NULL OR status IN ({}))".format(", ".join(f"'{status}'" for status in TRUSTED))
+
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def product_key(record):
+    """Ключ товара внутри магазина: ссылка, иначе код карточки, иначе описание."""
+    url = record.get("url") or ""
+    if url.startswith("http"):
+        return url
+    for field in ("product_code", "cards_ID"):
+        if record.get(field):
+            return f"{field}:{record[field]}"
+    return f"description:{record.get('description', '')}"
+
+
+def offer_fingerprint(shop, record):
+    """Отпечаток предложения: меняется, если у товара изменились описание или цена."""
+    key = "\x1f".join((shop, product_key(record), str(record.get("description") or ""), str(record.get("price") or "")))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+class PriceDatabase:
+    """
+    История цен во встроенной базе SQLite.
+
+    Каждый запуск магазина — строка в runs, каждое найденное предложение — строка в offers.
+    База работает в режиме WAL, записи добавляются пачками (upsert) в одной транзакции.
+    """
+
+    def __init__(self, db_path="data/prices.sqlite3"):
+        """
+        :param db_path: Путь к файлу базы
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(db_path, timeout=30)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self.connection.executescript(SCHEMA)
+        parser_logger.info("%s: База цен открыта: %s", self.__class__.__name__, db_path)
+
+    def _migrate(self):
+        """Добавляет столбцы, появившиеся после создания базы."""
+        for table, column in (("offers", "fingerprint"), ("checks", "status")):
+            columns = {row["name"] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+            if columns and column not in columns:
+                with self.connection:
+                    self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+
+        # Ключ уникальности SQLite не меняет на месте, поэтому таблица предложений без position
+        # пересоздаётся; индексы старой таблицы удаляются вместе с ней и создаются заново по SCHEMA
+        columns = [row["name"] for row in self.connection.execute("PRAGMA table_info(offers)")]
+        if columns and "position" not in columns:
+            column_list = ", ".join(columns)
+            with self.connection:
+                self.connection.execute(OFFERS_TABLE.format(name="offers_migrated"))
+                self.connection.execute(
+                    f"INSERT INTO offers_migrated ({column_list}) SELECT {column_list} FROM offers ORDER BY id")
+                self.connection.execute("DROP TABLE offers")
+                self.connection.execute("ALTER TABLE offers_migrated RENAME TO offers")
+            parser_logger.info("%s: Таблица предложений переведена на ключ с позицией в выдаче",
+                               self.__class__.__name__)
+
+    def close(self):
+        self.connection.close()
+
+    def start_run(self, shop, started_at=None):
+        """Регистрирует новый запуск магазина и возвращает его id."""
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (shop, started_at) VALUES (?, ?)", (shop, started_at or _now()))
+        return cursor.lastrowid
+
+    @staticmethod
+    def _offer_rows(run_id, shop, records, observed_at):
+        """Строки offers из записей парсера; позиция считается отдельно для каждого артикула."""
+        rows = []
+        positions = {}
+        for item in records:
+            for article, record in item.items():
+                position = positions.get(article, 0)
+                positions[article] = position + 1
+                rows.append((
+                    run_id, shop, article, product_key(record), observed_at,
+                    record.get("description"), record.get("price"), record.get("url"),
+                    json.dumps(record, ensure_ascii=False), offer_fingerprint(shop, record), position,
+                ))
+        return rows
+
+    def _upsert_rows(self, rows):
+        self.connection.executemany("""
+            INSERT INTO offers (run_id, shop, article, product_key, observed_at, description, price, url, payload,
+                                fingerprint, position)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (shop, article, product_key, observed_at, position) DO UPDATE SET
+                run_id = excluded.run_id,
+                description = excluded.description,
+                price = excluded.price,
+                url = excluded.url,
+                payload = excluded.payload,
+                fingerprint = excluded.fingerprint
+        """, rows)
+
+    def _upsert_checks(self, rows):
+        self.connection.executemany("""
+            INSERT INTO checks (run_id, shop, article, checked_at, offers, status) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (run_id, article) DO UPDATE SET
+                checked_at = excluded.checked_at, offers = excluded.offers, status = excluded.status
+        """, rows)
+
+    def upsert_offers(self, run_id, shop, records, observed_at=None):
+        """
+        Пачкой сохраняет предложения в формате парсеров: [{артикул: {description, url, price, ...}}].
+
+        :return: Количество сохранённых предложений
+        """
+        rows = self._offer_rows(run_id, shop, records, observed_at or _now())
+        if not rows:
+            return 0
+
+        with self.connection:
+            self._upsert_rows(rows)
+        parser_logger.debug("%s: %s: сохранено %s предложений", self.__class__.__name__, shop, len(rows))
+        return len(rows)
+
+    def record_check(self, run_id, shop, article, offers, checked_at=None, status=None):
+        """
+        Отмечает, что артикул проверен в запуске, сколько предложений найдено и что ответил магазин.
+
+        :param status: Класс ответа магазина (см. PageClassifier)
+        """
+        with self.connection:
+            self._upsert_checks([(run_id, shop, article, checked_at or _now(), offers, status)])
+
+    def save_checks(self, run_id, shop, checks):
+        """
+        Сохраняет результаты нескольких артикулов магазина одной транзакцией: предложения и отметки о проверке.
+
+        :param checks: Список (артикул, записи [{артикул: {...}}], статус ответа, время проверки или None)
+        :return: Количество сохранённых предложений
+        """
+        offer_rows = []
+        check_rows = []
+        for article, records, status, checked_at in checks:
+            checked_at = checked_at or _now()
+            offer_rows.extend(self._offer_rows(run_id, shop, records, checked_at))
+            check_rows.append((run_id, shop, article, checked_at, len(records), status))
+        if not check_rows:
+            return 0
+
+        with self.connection:
+            if offer_rows:
+                self._upsert_rows(offer_rows)
+            self._upsert_checks(check_rows)
+        parser_logger.debug("%s: %s: сохранено %s артикулов, %s предложений", self.__class__.__name__, shop,
+                            len(check_rows), len(offer_rows))
+        return len(offer_rows)
+
+    def run_changes(self, run_id):
+        """
+        Изменения предложений запуска относительно предыдущей проверки каждого артикула в том же магазине.
+
+        Сравниваются только артикулы, надёжно проверенные в этом запуске, поэтому сбойные, пропущенные
+        и заблокированные артикулы не выглядят исчезнувшими. Для артикула без предыдущей проверки
+        все предложения новые.
+
+        :return: Список sqlite3.Row: change ("new", "removed", "price_changed"), shop, article, product_key,
+                 description, url, previous_price, price
+        """
+        return self.connection.execute("""
+            WITH current AS (
+                SELECT c.shop, c.article, c.run_id,
+                       (SELECT MAX(p.run_id) FROM checks p
+                        WHERE p.shop = c.shop AND p.article = c.article AND p.run_id < c.run_id
+                          AND {trusted_p}) AS previous_run_id
+                FROM checks c
+                WHERE c.run_id = ? AND {trusted_c}
+            ),
+            now_offers AS (
+                SELECT o.*, c.previous_run_id FROM current c JOIN offers o ON o.run_id = c.run_id AND o.article = c.article
+            ),
+            before_offers AS (
+                SELECT o.*, c.run_id AS current_run_id
+                FROM current c JOIN offers o ON o.run_id = c.previous_run_id AND o.article = c.article
+            )
+            SELECT 'new' AS change, n.shop, n.article, n.product_key, n.description, n.url,
+                   NULL AS previous_price, n.price
+            FROM now_offers n
+            WHERE NOT EXISTS (SELECT 1 FROM offers b
+                              WHERE b.run_id = n.previous_run_id AND b.article = n.article
+                                AND b.product_key = n.product_key)
+            UNION ALL
+            SELECT 'removed', b.shop, b.article, b.product_key, b.description, b.url, b.price, NULL
+            FROM before_offers b
+            WHERE NOT EXISTS (SELECT 1 FROM offers n
+                              WHERE n.run_id = b.current_run_id AND n.article = b.article
+                                AND n.product_key = b.product_key)
+            UNION ALL
+            SELECT 'price_changed', n.shop, n.article, n.product_key, n.description, n.url, b.price, n.price
+            FROM now_offers n
+            JOIN offers b ON b.run_id = n.previous_run_id AND b.article = n.article AND b.product_key = n.product_key
+            WHERE b.fingerprint IS NOT n.fingerprint AND b.price IS NOT n.price
+            ORDER BY 3, 1, 4
+        """.format(trusted_p=TRUSTED_CHECK.replace("status", "p.status"),
+                   trusted_c=TRUSTED_CHECK.replace("status", "c.status")), (run_id,)).fetchall()
+
+    def latest_run_id(self, shop):
+        row = self.connection.execute("SELECT MAX(id) AS id FROM runs WHERE shop = ?", (shop,)).fetchone()
+        return row["id"]
+
+    def latest_run_records(self, shop):
+        """Предложения последнего запуска магазина в формате JSON-файлов парсеров."""
+        run_id = self.latest_run_id(shop)
+        if run_id is None:
+            return []
+        rows = self.connection.execute(
+            "SELECT article, payload FROM offers WHERE run_id = ? ORDER BY id", (run_id,)).fetchall()
+        return [{row["article"]: json.loads(row["payload"])} for row in rows]
+
+    def run_records(self, run_id, batch_size=1000):
+        """
+        Предложения запуска в формате JSON-файлов парсеров, пачками по batch_size, чтобы не держать
+        весь запуск в памяти.
+        """
+        cursor = self.connection.execute("SELECT article, payload FROM offers WHERE run_id = ? ORDER BY id", (run_id,))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield [{row["article"]: json.loads(row["payload"])} for row in rows]
+
+    def latest_checked_records(self, shop):
+        """
+        Предложения магазина из последней проверки каждого артикула в формате JSON-файлов парсеров.
+
+        При выборочной перепроверке (RescrapeScheduler) в последнем запуске есть не все артикулы,
+        поэтому остальные берутся из их собственных последних проверок. Проверки с капчей, блокировкой
+        или ошибкой пропускаются, и на листе остаются предыдущие данные.
+        """
+        if self.connection.execute("SELECT 1 FROM checks WHERE shop = ? LIMIT 1", (shop,)).fetchone() is None:
+            return self.latest_run_records(shop)  # История без отметок о проверках
+        rows = self.connection.execute("""
+            SELECT o.article, o.payload
+            FROM (SELECT article, MAX(run_id) AS run_id FROM checks WHERE shop = ? AND {trusted} GROUP BY article) c
+            JOIN offers o ON o.run_id = c.run_id AND o.article = c.article
+            ORDER BY o.id
+        """.format(trusted=TRUSTED_CHECK), (shop,)).fetchall()
+        return [{row["article"]: json.loads(row["payload"])} for row in rows]
+
+    def latest_prices(self, shop=None):
+        """Последние наблюдённые предложения по каждому артикулу каждого магазина."""
+        query = """
+            SELECT o.shop, o.article, o.product_key, o.description, o.price, o.url, o.observed_at
+            FROM offers o
+            JOIN (
+                SELECT shop, article, MAX(observed_at) AS observed_at
+                FROM offers
+                {where}
+                GROUP BY shop, article
+            ) latest USING (shop, article, observed_at)
+            ORDER BY o.shop, o.article
+        """
+        if shop is None:
+            return self.connection.execute(query.format(where="")).fetchall()
+        return self.connection.execute(query.format(where="WHERE shop = ?"), (shop,)).fetchall()
+
+    def price_changes(self, shop=None):
+        """Товары, у которых цена в последнем наблюдении отличается от предыдущего."""
+        query = """
+            SELECT shop, article, product_key, description, url, previous_price, price,
+                   previous_observed_at, observed_at
+            FROM (
+                SELECT shop, article, product_key, description, url, price, observed_at,
+                       LAG(price) OVER w AS previous_price,
+                       LAG(observed_at) OVER w AS previous_observed_at,
+                       ROW_NUMBER() OVER (PARTITION BY shop, article, product_key ORDER BY observed_at DESC) AS rn
+                FROM offers
+                {where}
+                WINDOW w AS (PARTITION BY shop, article, product_key ORDER BY observed_at)
+            )
+            WHERE rn = 1 AND previous_price IS NOT NULL AND previous_price IS NOT price
+            ORDER BY shop, article
+        """
+        if shop is None:
+            return self.connection.execute(query.format(where="")).fetchall()
+        return self.connection.execute(query.format(where="WHERE shop = ?"), (shop,)).fetchall()
+
+    def import_json_folder(self, shop, folder):
+        """Переносит в базу историю из JSON-файлов магазина (каждый файл — отдельный запуск)."""
+        imported = 0
+        for filename in sorted(os.listdir(folder)):
+            if not filename.endswith(".json"):
+                continue
+            filepath = os.path.join(folder, filename)
+            try:
+                with open(filepath, 'r', encoding='utf-8') as file:
+                    file_data = json.load(file)
+            except (OSError, json.JSONDecodeError) as e:
+                parser_logger.warning("%s: Файл %s пропущен: %s", self.__class__.__name__, filepath, e)
+                continue
+
+            observed_at = (file_data.get("Дата и время создания файла")
+                           or file_data.get("Creation Date and Time")
+                           or datetime.fromtimestamp(os.path.getmtime(filepath)).strftime('%Y-%m-%d %H:%M:%S'))
+            # Старые файлы Aliexpress хранили записи под ключом "Data"
+            records = file_data.get("Данные", file_data.get("Data"))
+            if not isinstance(records, list):
+                parser_logger.warning("%s: Файл %s пропущен: нет списка записей \"Данные\" или \"Data\"",
+                                      self.__class__.__name__, filepath)
+                continue
+            run_id = self.start_run(shop, observed_at)
+
+            # В JSON нет проверенных артикулов без предложений, отмечаем хотя бы найденные
+            by_article = {}
+            for item in records:
+                for article, record in item.items():
+                    by_article.setdefault(article, []).append({article: record})
+            imported += self.save_checks(run_id, shop, [(article, article_records, None, observed_at)
+                                                        for article, article_records in by_article.items()])
+
+        parser_logger.info("%s: %s: импортировано %s предложений из %s", self.__class__.__name__, shop, imported,
+                           folder)
+        return imported
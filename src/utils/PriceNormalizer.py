@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+
+# Признаки валют в тексте цены (проверяются по порядку)
+CURRENCY_PATTERNS = [
+    ("RUB", r"₽|руб|\bRUB\b|\bр\.?(?=\s|$)"),
+    ("USD", r"\$|\bUSD\b"),
+    ("EUR", r"€|\bEUR\b"),
+    ("CNY", r"¥|\bCNY\b|юан"),
+]
+
+# Единица измерения после косой черты: "1 234 ₽/шт", "56 руб./м"
+UNIT_PATTERN = r"/\s*(шт|м|кг|г|л|уп|упак|компл|пара|рулон)\.?"
+
+# Неразрывные и узкие пробелы, а также HTML-сущность, которую оставляет Zakupki
+SPACES_PATTERN = r"&nbsp;?|[\u00a0\u202f\u2009\s]+"
+
+OFFER_COLUMNS = ["shop", "article", "description", "url", "product_code", "relevance", "raw_price", "price", "currency",
+                 "unit"]
+
+
+class Offer:
+    """Компактная типизированная запись предложения (без __dict__ на каждый экземпляр)."""
+
+    __slots__ = ("shop", "article", "description", "url", "product_code", "relevance", "raw_price", "price", "currency",
+                 "unit")
+
+    def __init__(self, shop, article, description, url, product_code, relevance, raw_price, price, currency, unit):
+        self.shop = shop
+        self.article = article
+        self.description = description
+        self.url = url
+        self.product_code = product_code
+        self.relevance = relevance  # Оценка RelevanceMatcher или None для записей без оценки
+        self.raw_price = raw_price
+        self.price = price  # float или None, если цена не распознана
+        self.currency = currency
+        self.unit = unit
+
+    def __repr__(self):
+        return f"Offer({self.shop!r}, {self.article!r}, price={self.price!r} {self.currency or ''})"
+
+
+def normalize_prices(raw_prices, default_currency="RUB"):
+    """
+    Переводит столбец сырых строк цен в числа.
+
+    Работает векторно над всей пачкой: текст вида "1 234,56 ₽/шт", "$12.99 to $15.99", "87&nbsp;900"
+    или 'Цена не найдена' превращается в price (float, NaN если цены нет), currency и unit.
+
+    :param raw_prices: Последовательность сырых цен (list или pd.Series)
+    :param default_currency: Валюта для чисел без явного признака валюты
+    :return: pd.DataFrame со столбцами price, currency, unit
+    """
+    # object, а не str: у строк на pyarrow другой движок регулярных выражений (без lookahead и \u)
+    raw = pd.Series(raw_prices, dtype="object").fillna("").astype(str).astype(object)
+    text = raw.str.replace(SPACES_PATTERN, " ", regex=True).str.strip()
+
+    # Первое число в строке (для диапазонов "от ... до ..." берём нижнюю границу)
+    number = text.str.extract(r"(\d[\d ]*(?:[.,]\d+)*)", expand=False)
+    number = number.str.replace(" ", "", regex=False)
+
+    has_comma = number.str.contains(",", regex=False, na=False)
+    has_dot = number.str.contains(".", regex=False, na=False)
+    comma_decimal = number.str.contains(r",\d{1,2}$", regex=True, na=False)
+    dot_thousands = number.str.contains(r"^\d{1,3}(?:\.\d{3}){2,}$", regex=True, na=False)
+
+    # "1.234,56" и "1 234,56" — запятая десятичная; "1,234.56" и "1,234" — запятая разделяет тысячи
+    last_is_comma = number.str.rfind(",") > number.str.rfind(".")
+    comma_is_decimal = np.where(has_comma & has_dot, last_is_comma, comma_decimal)
+    cleaned = pd.Series(np.where(
+        comma_is_decimal,
+        number.str.replace(".", "", regex=False).str.replace(",", ".", regex=False),
+        number.str.replace(",", "", regex=False),
+    ), index=raw.index)
+    cleaned = cleaned.where(~dot_thousands, number.str.replace(".", "", regex=False))
+
+    price = pd.to_numeric(cleaned, errors="coerce").astype("float64")  # Пачка из целых цен тоже float
+
+    currency = pd.Series(None, index=raw.index, dtype="object")
+    for code, pattern in CURRENCY_PATTERNS:
+        currency = currency.mask(currency.isna() & text.str.contains(pattern, case=False, regex=True), code)
+    currency = currency.mask(currency.isna() & price.notna(), default_currency)
+
+    unit = text.str.extract(UNIT_PATTERN, expand=False)
+
+    return pd.DataFrame({"price": price, "currency": currency, "unit": unit}, index=raw.index)
+
+
+def normalize_records(records, shop=None, default_currency="RUB"):
+    """
+    Нормализует пачку записей в формате парсеров: [{артикул: {description, url, price, ...}}].
+
+    :return: pd.DataFrame со столбцами OFFER_COLUMNS; price и relevance — float64, currency и unit — category
+    """
+    rows = []
+    for item in records:
+        for article, record in item.items():
+            rows.append((
+                shop, article,
+                record.get("description") or record.get("name"),
+                record.get("url"),
+                record.get("product_code") or record.get("cards_ID"),
+                record.get("relevance"),
+                record.get("price"),
+            ))
+
+    frame = pd.DataFrame(rows, columns=OFFER_COLUMNS[:7])
+    normalized = normalize_prices(frame["raw_price"], default_currency=default_currency)
+    frame = frame.join(normalized)
+    frame["relevance"] = frame["relevance"].astype(float)
+    frame["currency"] = frame["currency"].astype("category")
+    frame["unit"] = frame["unit"].astype("category")
+    return frame[OFFER_COLUMNS]
+
+
+def to_offers(frame):
+    """Превращает нормализованную таблицу в список Offer."""
+    offers = []
+    for row in frame[OFFER_COLUMNS].itertuples(index=False, name=None):
+        values = list(row)
+        for index in (5, 7):  # relevance, price
+            values[index] = None if pd.isna(values[index]) else float(values[index])
+        values[8] = None if pd.isna(values[8]) else values[8]
+        values[9] = None if pd.isna(values[9]) else values[9]
+        offers.append(Offer(*values))
+    return offers
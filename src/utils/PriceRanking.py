@@ -0,0 +1,119 @@
+import heapq
+import os
+
+import numpy as np
+import pandas as pd
+
+# Курсы валют к базовой валюте сводки: "USD=92.5,EUR=100"
+RATES_ENV = "EMPARSER_RATES"
+
+
+def summary_columns(top_n):
+    """Названия столбцов сводной таблицы для top_n лучших предложений."""
+    columns = ["article", "offers", "min_price", "median_price", "currency", "cheapest_shop"]
+    for place in range(1, top_n + 1):
+        columns += [f"shop_{place}", f"name_{place}", f"price_{place}", f"link_{place}"]
+    return columns
+
+
+def parse_rates(text):
+    """
+    Разбирает курсы из строки "USD=92.5,EUR=100" (или словаря).
+
+    :return: {валюта: цена единицы в базовой валюте}
+    """
+    if isinstance(text, dict):
+        return {currency.strip().upper(): float(rate) for currency, rate in text.items()}
+    rates = {}
+    for item in (text or "").split(","):
+        if not item.strip():
+            continue
+        currency, separator, rate = item.partition("=")
+        if not separator or not currency.strip():
+            raise ValueError(f"Курс нужно задать как ВАЛЮТА=число: {item.strip()!r}")
+        rates[currency.strip().upper()] = float(rate)
+    return rates
+
+
+def rates_from_config(rates=None):
+    """Курсы из аргумента, а если он не задан — из EMPARSER_RATES."""
+    if rates is None:
+        rates = os.environ.get(RATES_ENV, "")
+    return parse_rates(rates)
+
+
+def rank_offers(offers, articles=None, top_n=3, base_currency="RUB", rates=None):
+    """
+    Считает по каждому артикулу минимальную и медианную цену, самый дешёвый магазин и top_n лучших предложений.
+
+    Минимум и медиана считаются векторно (groupby), лучшие предложения отбираются за один проход
+    ограниченной кучей размера top_n на артикул — O(n log top_n) без полной сортировки.
+
+    Цены в валютах с курсом пересчитываются в base_currency. Предложения в валюте без курса не теряются:
+    они сравниваются между собой в отдельной строке артикула с этой валютой в столбце currency.
+
+    :param offers: Таблица из PriceNormalizer.normalize_records (все магазины вместе)
+    :param articles: Порядок артикулов в результате; артикулы без предложений тоже попадают в таблицу
+    :param top_n: Сколько лучших предложений выводить
+    :param base_currency: Валюта, в которой сравниваются цены
+    :param rates: Курсы {валюта: цена единицы в base_currency}
+    :return: pd.DataFrame со столбцами summary_columns(top_n); строка в base_currency есть у каждого артикула,
+             строки в других валютах идут следом
+    """
+    rates = dict(rates or {})
+    rates[base_currency] = 1.0
+
+    frame = offers[offers["price"].notna()]
+    # Цена без признака валюты считается ценой в base_currency, как у normalize_prices
+    currencies = frame["currency"].astype(object)
+    currencies = currencies.where(currencies.notna(), base_currency)
+    rate = currencies.map(rates).to_numpy(dtype=float)
+    convertible = ~np.isnan(rate)
+    prices = frame["price"].to_numpy(dtype=float) * np.where(convertible, rate, 1.0)
+    currencies = np.where(convertible, base_currency, currencies.to_numpy())
+
+    stats = pd.DataFrame({"article": frame["article"].to_numpy(), "currency": currencies, "price": prices})
+    stats = stats.groupby(["article", "currency"], sort=False)["price"].agg(offers="count", min_price="min",
+                                                                           median_price="median")
+
+    # Куча с максимумом наверху (цены со знаком минус): вытесняем самое дорогое из top_n
+    heaps = {}
+    foreign = {}  # Артикул -> валюты без курса в порядке появления
+    for position, (article, currency, price) in enumerate(zip(frame["article"].to_numpy(), currencies, prices)):
+        heap = heaps.setdefault((article, currency), [])
+        if not heap and currency != base_currency:
+            foreign.setdefault(article, []).append(currency)
+        entry = (-price, -position)
+        if len(heap) < top_n:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    shops = frame["shop"].to_numpy()
+    names = frame["description"].to_numpy()
+    links = frame["url"].to_numpy()
+
+    if articles is None:
+        articles = list(dict.fromkeys(stats.index.get_level_values("article")))
+
+    rows = []
+    for article in articles:
+        for currency in [base_currency] + foreign.get(article, []):
+            best = sorted(heaps.get((article, currency), []), reverse=True)  # От дешёвого к дорогому
+            row = [article]
+            if (article, currency) in stats.index:
+                article_stats = stats.loc[(article, currency)]
+                row += [int(article_stats["offers"]), article_stats["min_price"], article_stats["median_price"],
+                        currency, shops[-best[0][1]]]
+            else:
+                row += [0, None, None, currency, None]
+
+            for place in range(top_n):
+                if place < len(best):
+                    price, position = -best[place][0], -best[place][1]
+                    row += [shops[position], names[position], price, links[position]]
+                else:
+                    row += [None, None, None, None]
+            rows.append(row)
+
+    return pd.DataFrame(rows, columns=summary_columns(top_n))
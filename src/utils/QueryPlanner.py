@@ -0,0 +1,56 @@
+import pandas as pd
+
+from src.utils.RelevanceMatcher import fold_separators
+
+
+def canonical_query(article):
+    """Ключ запроса: регистр, похожие кириллические буквы и разделители не различаются ("lm-317t" == "LM317T")."""
+    article = str(article)
+    return fold_separators(article) or article
+
+
+class QueryPlan:
+    """
+    Схлопывает артикулы, которые отличаются только написанием, в один поисковый запрос.
+
+    Запросом становится первое встретившееся написание, для каждой исходной строки запоминается её запрос,
+    чтобы потом раздать найденные предложения всем строкам (см. fan_out_offers).
+    """
+
+    def __init__(self, articles=()):
+        self._queries = {}  # Канонический ключ -> запрос
+        self.query_of = {}  # Исходный артикул -> запрос
+        for article in articles:
+            self.add(article)
+
+    def add(self, article):
+        """Регистрирует исходный артикул и возвращает запрос, под которым его нужно искать."""
+        query = self._queries.setdefault(canonical_query(article), article)
+        self.query_of[article] = query
+        return query
+
+    @property
+    def queries(self):
+        """Уникальные запросы в порядке первого появления."""
+        return list(self._queries.values())
+
+    @property
+    def collapsed(self):
+        """Сколько исходных артикулов не требуют отдельного поиска."""
+        return len(self.query_of) - len(self._queries)
+
+
+def fan_out_offers(offers, query_of):
+    """
+    Раздаёт предложения каждого запроса всем исходным артикулам с этим запросом.
+
+    :param offers: Нормализованные предложения (PriceNormalizer.OFFER_COLUMNS), в столбце article — запрос
+    :param query_of: {исходный артикул: запрос} (QueryPlan.query_of)
+    :return: Предложения, в которых article — исходный артикул; предложения по чужим запросам отбрасываются
+    """
+    if not query_of:
+        return offers
+    mapping = pd.DataFrame({"query": list(query_of.values()), "source_article": list(query_of)})
+    fanned = offers.merge(mapping, left_on="article", right_on="query", how="inner", sort=False)
+    fanned["article"] = fanned["source_article"]
+    return fanned[list(offers.columns)].reset_index(drop=True)
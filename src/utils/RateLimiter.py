@@ -0,0 +1,164 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+from src.logger.logger import get_logger
+
+parser_logger = get_logger(__name__)
+
+# Результаты навигации, о которых сообщают ограничителю
+OK = "ok"
+SLOW = "slow"
+THROTTLED = "throttled"  # 429, капча, страница блокировки
+ERROR = "error"
+
+# Поля состояния ограничителя (см. shared_state)
+RATE, TOKENS, UPDATED, BLOCKED_UNTIL = range(4)
+
+
+class DomainRateLimiter:
+    """
+    Ограничитель частоты запросов к одному сайту: token bucket с адаптивной скоростью (AIMD).
+
+    Каждая навигация забирает токен. Быстрые успешные ответы понемногу увеличивают скорость (+additive_step),
+    медленные ответы и ошибки уменьшают её в decrease_factor раз, а 429/капча — ещё и останавливают запросы
+    на cooldown секунд. Так каждый магазин сам выходит на наибольшую частоту, которую выдерживает сайт.
+
+    Состояние (скорость, токены, пауза) может лежать в общей памяти (shared_state): тогда все процессы-шарды
+    магазина делят одну скорость, и она не сбрасывается при перезапуске процесса.
+    """
+
+    def __init__(self, domain, rate=0.5, min_rate=0.05, max_rate=3.0, burst=2, additive_step=0.05,
+                 decrease_factor=0.5, slow_threshold=8.0, cooldown=60.0, state=None):
+        """
+        :param domain: Домен сайта (для логов)
+        :param rate: Начальная скорость, запросов в секунду
+        :param min_rate: Нижняя граница скорости
+        :param max_rate: Верхняя граница скорости
+        :param burst: Сколько запросов можно сделать подряд без ожидания
+        :param additive_step: Прибавка скорости после быстрого успешного ответа
+        :param decrease_factor: Множитель скорости после медленного ответа, ошибки или блокировки
+        :param slow_threshold: Ответ дольше этого времени (сек) считается признаком перегрузки
+        :param cooldown: Пауза после 429/капчи, сек
+        :param state: Общее для процессов состояние из shared_state(); None — своё состояние процесса
+        """
+        self.domain = domain
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.additive_step = additive_step
+        self.decrease_factor = decrease_factor
+        self.slow_threshold = slow_threshold
+        self.cooldown = cooldown
+
+        if state is None:
+            self._state = [rate, float(burst), time.monotonic(), 0.0]
+            self._lock = threading.Lock()
+        else:
+            self._state = state
+            self._lock = state.get_lock()
+
+    @property
+    def rate(self):
+        """Текущая скорость, запросов в секунду."""
+        return self._state[RATE]
+
+    def _refill(self, now):
+        state = self._state
+        state[TOKENS] = min(self.burst, state[TOKENS] + (now - state[UPDATED]) * state[RATE])
+        state[UPDATED] = now
+
+    def acquire(self):
+        """Ждёт, пока можно сделать следующий запрос. Возвращает время ожидания, сек."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                state = self._state
+                now = time.monotonic()
+                self._refill(now)
+                delay = max(0.0, state[BLOCKED_UNTIL] - now)
+                if not delay and state[TOKENS] >= 1:
+                    state[TOKENS] -= 1
+                    return waited
+                if not delay:
+                    delay = (1 - state[TOKENS]) / state[RATE]
+            time.sleep(delay)
+            waited += delay
+
+    def report(self, latency, outcome=OK, cooldown=True):
+        """
+        Сообщает результат навигации и подстраивает скорость.
+
+        :param latency: Длительность навигации, сек
+        :param outcome: OK, THROTTLED или ERROR; медленный успешный ответ считается SLOW
+        :param cooldown: Останавливать ли запросы к домену после THROTTLED. Если блокировку получил прокси,
+                         пауза не нужна: пул прокси сам отстраняет его от домена, а следующая сессия идёт
+                         через другой прокси
+        """
+        if outcome == OK and latency > self.slow_threshold:
+            outcome = SLOW
+
+        with self._lock:
+            state = self._state
+            previous = state[RATE]
+            if outcome == OK:
+                state[RATE] = min(self.max_rate, previous + self.additive_step)
+            else:
+                state[RATE] = max(self.min_rate, previous * self.decrease_factor)
+                if outcome == THROTTLED and cooldown:
+                    state[BLOCKED_UNTIL] = time.monotonic() + self.cooldown
+                    state[TOKENS] = 0.0
+            rate = state[RATE]
+
+        if outcome != OK:
+            parser_logger.warning("%s: %s: %s (%.1f с), скорость %.2f -> %.2f запр/с", self.__class__.__name__,
+                                  self.domain, outcome, latency, previous, rate)
+        return outcome
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+_settings = {}
+_shared_states = {}  # Домен -> состояние в общей памяти, выданное супервизором (см. use_shared_states)
+
+
+def domain_of(url):
+    """Домен из URL без www: "https://www.chipdip.ru/search" -> "chipdip.ru"."""
+    netloc = urlparse(url).netloc or url
+    return netloc.lower().split(":")[0].removeprefix("www.")
+
+
+def configure(domain, **settings):
+    """Задаёт параметры ограничителя домена (до первого запроса к нему)."""
+    _settings[domain] = settings
+
+
+def shared_state(url_or_domain, context):
+    """
+    Начальное состояние ограничителя домена в общей памяти (multiprocessing.Array) для рабочих процессов.
+
+    Супервизор создаёт его один раз на домен и передаёт всем процессам магазина, в том числе перезапущенным.
+
+    :param context: Контекст multiprocessing, в котором создаются рабочие процессы
+    """
+    domain = domain_of(url_or_domain)
+    return context.Array('d', DomainRateLimiter(domain, **_settings.get(domain, {}))._state)
+
+
+def use_shared_states(states):
+    """Подключает в рабочем процессе состояния ограничителей, созданные супервизором: {домен: shared_state}."""
+    with _limiters_lock:
+        for domain, state in states.items():
+            _shared_states[domain] = state
+            _limiters.pop(domain, None)
+
+
+def get_limiter(url_or_domain):
+    """Ограничитель домена: общий для процесса, а с use_shared_states() — для всех процессов магазина."""
+    domain = domain_of(url_or_domain)
+    with _limiters_lock:
+        limiter = _limiters.get(domain)
+        if limiter is None:
+            limiter = _limiters[domain] = DomainRateLimiter(domain, state=_shared_states.get(domain),
+                                                            **_settings.get(domain, {}))
+        return limiter
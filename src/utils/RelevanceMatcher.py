@@ -0,0 +1,126 @@
+import re
+from bisect import bisect_right
+from functools import lru_cache
+
+# Кириллические буквы, которые в артикулах пишут вместо похожих латинских
+HOMOGLYPHS = str.maketrans("авекмнорстухё", "abekmhopctyxe")
+
+# Разделители, которые в номерах деталей ставят по-разному: "ABC-123", "ABC 123", "ABC_123", "ABC.123"
+SEPARATORS_CLASS = r"[\s\-_./\\]"
+SEPARATORS_PATTERN = re.compile(SEPARATORS_CLASS + "+")
+
+# Граница «слова»: соседний символ не буква и не цифра
+DIGIT_CHARS = r"0-9"
+LETTER_CHARS = r"a-zа-яё"
+BOUNDARY_CHARS = DIGIT_CHARS + LETTER_CHARS
+
+# Разделитель описаний внутри пачки: не встречается в тексте и не удаляется при свёртке разделителей
+BATCH_SEPARATOR = "\x00"
+
+EXACT_SCORE = 1.0  # Артикул стоит в описании отдельным словом
+FOLDED_SCORE = 0.8  # Артикул написан с другими разделителями ("LM 317") или с буквенным суффиксом ("LM317T")
+MIN_SCORE = FOLDED_SCORE  # Порог, с которым парсеры оставляют карточку
+
+
+def fold_case(text):
+    """Приводит регистр и похожие кириллические буквы к единому виду."""
+    return text.casefold().translate(HOMOGLYPHS)
+
+
+def fold_separators(text):
+    """fold_case плюс удаление разделителей: "ABC-12 3" и "abc123" дают одинаковую строку."""
+    return SEPARATORS_PATTERN.sub("", fold_case(text))
+
+
+class RelevanceMatcher:
+    """
+    Проверяет, относится ли карточка товара к искомым артикулам.
+
+    Все артикулы компилируются в два регулярных выражения-автомата: точное совпадение с границами слова
+    и свёрнутое — регистр и похожие буквы не важны, а разделители допускаются между любыми символами
+    артикула. Свёрнутое совпадение тоже должно начинаться на границе слова и не может продолжаться
+    символом того же рода, что последний символ артикула: "LM317T" подходит к LM317, а "ALM317"
+    и "film 3170" — нет. Описания страницы проверяются одним проходом по склеенной пачке, а не попарно
+    «карточка × артикул».
+    """
+
+    def __init__(self, terms):
+        """
+        :param terms: Артикулы (или другие ключевые слова), которые должны встречаться в описании
+        """
+        self.terms = [term for term in terms if term and fold_separators(str(term))]
+
+        exact = sorted({fold_case(str(term)).strip() for term in self.terms}, key=len, reverse=True)
+        folded = sorted({fold_separators(str(term)) for term in self.terms}, key=len, reverse=True)
+
+        self._exact_pattern = None
+        self._folded_pattern = None
+        if self.terms:
+            # Разделители внутри артикула в точном варианте необязательны и взаимозаменяемы
+            exact_terms = [(SEPARATORS_CLASS + "*").join(re.escape(part) for part in SEPARATORS_PATTERN.split(term))
+                           for term in exact]
+            self._exact_pattern = re.compile(
+                rf"(?<![{BOUNDARY_CHARS}])(?:{'|'.join(exact_terms)})(?![{BOUNDARY_CHARS}])")
+            self._folded_pattern = re.compile(
+                rf"(?<![{BOUNDARY_CHARS}])(?:{'|'.join(self._folded_term(term) for term in folded)})")
+
+    @staticmethod
+    def _folded_term(term):
+        """Свёрнутый артикул: разделители между любыми символами, без продолжения цифрами (или буквами)."""
+        pattern = (SEPARATORS_CLASS + "*").join(re.escape(char) for char in term)
+        if re.fullmatch(f"[{DIGIT_CHARS}]", term[-1]):
+            pattern += f"(?![{DIGIT_CHARS}])"
+        elif re.fullmatch(f"[{LETTER_CHARS}]", term[-1]):
+            pattern += f"(?![{LETTER_CHARS}])"
+        return pattern
+
+    @staticmethod
+    def _matched_positions(pattern, texts):
+        """Номера текстов пачки, в которых есть совпадение, за один проход регулярного выражения."""
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(BATCH_SEPARATOR)
+
+        matched = set()
+        for match in pattern.finditer(BATCH_SEPARATOR.join(texts)):
+            matched.add(bisect_right(starts, match.start()) - 1)
+        return matched
+
+    def score_batch(self, descriptions):
+        """
+        Оценивает релевантность описаний одной страницы.
+
+        :param descriptions: Описания карточек
+        :return: Список оценок той же длины: EXACT_SCORE, FOLDED_SCORE или 0.0
+        """
+        if not self.terms:
+            return [0.0] * len(descriptions)
+
+        texts = [fold_case(str(description or "")) for description in descriptions]
+        folded = self._matched_positions(self._folded_pattern, texts)
+        if not folded:
+            return [0.0] * len(descriptions)
+
+        # Точное совпадение проверяем только у карточек, прошедших свёрнутый фильтр (он шире точного)
+        candidates = sorted(folded)
+        exact = {candidates[index] for index in
+                 self._matched_positions(self._exact_pattern, [texts[position] for position in candidates])}
+
+        return [EXACT_SCORE if index in exact else FOLDED_SCORE if index in folded else 0.0
+                for index in range(len(descriptions))]
+
+    def score(self, description):
+        """Оценка релевантности одного описания."""
+        return self.score_batch([description])[0]
+
+
+@lru_cache(maxsize=256)
+def _cached_matcher(terms):
+    return RelevanceMatcher(terms)
+
+
+def get_matcher(terms):
+    """Скомпилированный RelevanceMatcher для набора артикулов (повторно используется между страницами)."""
+    return _cached_matcher(tuple(terms))
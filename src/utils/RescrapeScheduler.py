@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+
+from src.logger.logger import get_logger
+from src.utils.PriceDatabase import TRUSTED_CHECK
+
+parser_logger = get_logger(__name__)
+
+
+def _parse_time(value):
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+
+
+class RescrapeScheduler:
+    """
+    Выбирает, какие артикулы каких магазинов пора проверить снова.
+
+    По истории проверок в PriceDatabase (без капчи и блокировок) для каждой пары (магазин, артикул) оценивается
+    частота изменений предложений (сколько раз между соседними проверками менялся набор отпечатков)
+    и назначается интервал повторной проверки: волатильные цены проверяются часто, стабильные — редко.
+    В запуск попадают только пары, срок которых наступил, в порядке просроченности и в пределах бюджета запросов.
+    """
+
+    def __init__(self, database, min_interval=timedelta(hours=6), max_interval=timedelta(days=14),
+                 target_changes=0.5, prior_days=7.0):
+        """
+        :param database: PriceDatabase с историей проверок
+        :param min_interval: Минимальный интервал между проверками
+        :param max_interval: Максимальный интервал между проверками
+        :param target_changes: Сколько изменений в среднем допускается пропустить за интервал
+        :param prior_days: Сглаживание оценки: новая пара считается изменившейся раз в prior_days дней
+        """
+        self.database = database
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_changes = target_changes
+        self.prior_days = prior_days
+
+    def _history(self, shops):
+        """{(магазин, артикул): [(время проверки, отпечаток набора предложений), ...]} по возрастанию времени."""
+        placeholders = ", ".join("?" for _ in shops)
+        rows = self.database.connection.execute(f"""
+            SELECT c.shop, c.article, c.run_id, c.checked_at, o.fingerprint
+            FROM checks c
+            LEFT JOIN offers o ON o.run_id = c.run_id AND o.article = c.article
+            WHERE c.shop IN ({placeholders}) AND {TRUSTED_CHECK.replace("status", "c.status")}
+            ORDER BY c.shop, c.article, c.run_id
+        """, list(shops)).fetchall()
+
+        checks = {}
+        for row in rows:
+            key = (row["shop"], row["article"])
+            history = checks.setdefault(key, {})
+            checked_at, fingerprints = history.setdefault(row["run_id"], (row["checked_at"], set()))
+            if row["fingerprint"] is not None:
+                fingerprints.add(row["fingerprint"])
+
+        return {key: [(_parse_time(checked_at), frozenset(fingerprints))
+                      for checked_at, fingerprints in history.values()]
+                for key, history in checks.items()}
+
+    def interval(self, history):
+        """
+        Интервал повторной проверки по истории одной пары.
+
+        Частота изменений оценивается как (изменения + 1) / (дни наблюдения + prior_days),
+        интервал — target_changes / частота, в пределах [min_interval, max_interval].
+        """
+        changes = sum(1 for previous, current in zip(history, history[1:]) if previous[1] != current[1])
+        observed_days = (history[-1][0] - history[0][0]).total_seconds() / 86400
+        rate = (changes + 1) / (observed_days + self.prior_days)
+        interval = timedelta(days=self.target_changes / rate)
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def plan(self, shops, articles, budget=None, now=None):
+        """
+        Составляет план запуска.
+
+        :param shops: Названия магазинов
+        :param articles: Все артикулы из входного файла или {магазин: его артикулы}
+        :param budget: Сколько пар (магазин, артикул) можно проверить за запуск; None — без ограничения
+        :param now: Текущее время (для расчёта просроченности)
+        :return: {магазин: [артикулы к проверке в исходном порядке]}
+        """
+        now = now or datetime.now()
+        history = self._history(shops) if shops else {}
+
+        due = []
+        total = 0
+        for shop in shops:
+            shop_articles = articles.get(shop, []) if isinstance(articles, dict) else articles
+            total += len(shop_articles)
+            for position, article in enumerate(shop_articles):
+                checks = history.get((shop, article))
+                if not checks:
+                    # Ни разу не проверялись — в первую очередь
+                    due.append((float("inf"), position, shop, article))
+                    continue
+                interval = self.interval(checks)
+                overdue = (now - checks[-1][0]) / interval
+                if overdue >= 1:
+                    due.append((overdue, position, shop, article))
+
+        # Сначала самые просроченные, при равенстве — по порядку во входном файле
+        due.sort(key=lambda item: (-item[0], item[1]))
+        if budget is not None:
+            due = due[:max(0, budget)]
+
+        plan = {shop: [] for shop in shops}
+        for _, position, shop, article in sorted(due, key=lambda item: item[1]):
+            plan[shop].append(article)
+
+        parser_logger.info("%s: К проверке %s из %s пар (бюджет: %s)", self.__class__.__name__, len(due), total,
+                           budget)
+        return plan
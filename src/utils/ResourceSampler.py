@@ -0,0 +1,147 @@
+import importlib.util
+import os
+import time
+
+from src.logger.logger import get_logger
+
+parser_logger = get_logger(__name__)
+
+# Порог памяти дерева процессов рабочего (МБ), выше которого браузер перезапускается между артикулами
+RECYCLE_RSS_ENV = "EMPARSER_RECYCLE_RSS_MB"
+# Период замеров, сек
+INTERVAL_ENV = "EMPARSER_RESOURCE_INTERVAL"
+DEFAULT_INTERVAL = 5.0
+
+MB = 1024 * 1024
+
+
+def sampler_available():
+    """Установлен ли psutil (необязательная зависимость: pip install psutil)."""
+    return importlib.util.find_spec("psutil") is not None
+
+
+class ResourceUsage:
+    """Замер одного рабочего процесса вместе с chromedriver и Chrome."""
+
+    __slots__ = ("shop", "worker", "rss", "cpu", "processes", "browser_processes")
+
+    def __init__(self, shop, worker, rss, cpu, processes, browser_processes):
+        self.shop = shop
+        self.worker = worker
+        self.rss = rss  # Байт, сумма по дереву процессов
+        self.cpu = cpu  # Проценты одного ядра, сумма по дереву
+        self.processes = processes
+        self.browser_processes = browser_processes  # Из них chromedriver и Chrome
+
+    @property
+    def rss_mb(self):
+        return self.rss / MB
+
+
+class ResourceSampler:
+    """
+    Замеры памяти (RSS) и CPU рабочих процессов парсеров вместе с запущенными ими chromedriver и Chrome.
+
+    Супервизор вызывает sample() из своего цикла опроса; замер делается не чаще interval секунд.
+    Каждый замер относится к магазину и рабочему процессу (шарду). Если задан recycle_rss_mb,
+    over_limit() сообщает, каким рабочим пора перезапустить браузер.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, recycle_rss_mb=None):
+        """
+        :param interval: Период замеров, сек
+        :param recycle_rss_mb: Порог памяти дерева процессов одного рабочего, МБ (None — не перезапускать)
+        """
+        import psutil
+
+        self._psutil = psutil
+        self.interval = interval
+        self.recycle_rss_mb = recycle_rss_mb
+        self._processes = {}  # pid -> psutil.Process; cpu_percent считается между замерами одного объекта
+        self._last_sample = 0.0
+        self.peaks = {}  # (магазин, рабочий) -> наибольший RSS, байт
+
+    @classmethod
+    def from_config(cls, recycle_rss_mb=None, interval=None):
+        """
+        Создаёт сэмплер с настройками из окружения (EMPARSER_RECYCLE_RSS_MB, EMPARSER_RESOURCE_INTERVAL).
+
+        :return: ResourceSampler или None, если psutil не установлен
+        """
+        if not sampler_available():
+            parser_logger.warning("psutil не установлен, замеры памяти Chrome отключены (pip install psutil)")
+            return None
+        if recycle_rss_mb is None and os.environ.get(RECYCLE_RSS_ENV, "").strip():
+            recycle_rss_mb = float(os.environ[RECYCLE_RSS_ENV])
+        if interval is None:
+            interval = float(os.environ.get(INTERVAL_ENV, "").strip() or DEFAULT_INTERVAL)
+        return cls(interval=interval, recycle_rss_mb=recycle_rss_mb)
+
+    def _process(self, pid):
+        process = self._processes.get(pid)
+        if process is None:
+            process = self._psutil.Process(pid)
+            process.cpu_percent(None)  # Первый вызов только запоминает отсчёт
+            self._processes[pid] = process
+        return process
+
+    def _measure(self, shop, worker, pid):
+        psutil = self._psutil
+        try:
+            root = self._process(pid)
+            tree = [root] + root.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+
+        rss = cpu = browsers = 0
+        alive = 0
+        for process in tree:
+            try:
+                process = self._process(process.pid)
+                rss += process.memory_info().rss
+                cpu += process.cpu_percent(None)
+                name = process.name().lower()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            alive += 1
+            if "chrome" in name:  # chromedriver, chrome, Google Chrome Helper
+                browsers += 1
+        return ResourceUsage(shop, worker, rss, cpu, alive, browsers)
+
+    def sample(self, workers, force=False):
+        """
+        Замеряет деревья процессов рабочих.
+
+        :param workers: {(магазин, рабочий): pid}
+        :param force: Замерить, даже если interval ещё не прошёл
+        :return: Список ResourceUsage или None, если замер сейчас не нужен
+        """
+        now = time.monotonic()
+        if not force and now - self._last_sample < self.interval:
+            return None
+        self._last_sample = now
+
+        usages = []
+        for (shop, worker), pid in workers.items():
+            usage = self._measure(shop, worker, pid)
+            if usage is None:
+                continue
+            key = (shop, worker)
+            self.peaks[key] = max(self.peaks.get(key, 0), usage.rss)
+            usages.append(usage)
+
+        # Процессы, которых уже нет, больше не нужны для подсчёта CPU
+        live = {process.pid for process in self._processes.values() if process.is_running()}
+        self._processes = {pid: process for pid, process in self._processes.items() if pid in live}
+        return usages
+
+    def over_limit(self, usage):
+        """Превышает ли рабочий порог памяти, после которого браузер нужно перезапустить."""
+        return self.recycle_rss_mb is not None and usage.rss_mb > self.recycle_rss_mb
+
+    def shop_peaks(self):
+        """{магазин: наибольший RSS одного рабочего, МБ}."""
+        peaks = {}
+        for (shop, _), rss in self.peaks.items():
+            peaks[shop] = max(peaks.get(shop, 0.0), rss / MB)
+        return peaks
@@ -0,0 +1,340 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.logger.logger import get_logger
+from src.utils.PageClassifier import BLOCKED
+
+parser_logger = get_logger(__name__)
+
+# Порт HTTP-эндпоинта /metrics, если он не задан явно (--metrics-port)
+METRICS_PORT_ENV = "EMPARSER_METRICS_PORT"
+
+# Границы корзин гистограмм длительности, сек
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Гистограмма длительностей с накопительными корзинами, как в Prometheus."""
+
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.total += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+def _labels(**labels):
+    """Метки в формате Prometheus: {shop="ChipDip",stage="search"}."""
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class RunMetrics:
+    """
+    Метрики запуска парсеров: скорость и ответы магазинов, длительность этапов, число браузеров,
+    очередь артикулов, попадания в кэш запросов, память и CPU рабочих процессов с их Chrome.
+
+    Данные пишут супервизор (ParserSupervisor) и BatchRunner, читают GUI и HTTP-эндпоинт /metrics,
+    поэтому все методы защищены одной блокировкой.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Обнуляет метрики перед новым запуском."""
+        with self._lock:
+            self._started = {}  # Магазин -> время первого запуска процесса
+            self._articles = {}  # (магазин, ответ магазина) -> число артикулов
+            self._failed = {}  # Магазин -> артикулы со сбоем
+            self._queued = {}  # Магазин -> артикулов ещё не обработано
+            self._browsers = {}  # Магазин -> работающих процессов (у каждого свой браузер)
+            self._restarts = {}  # Магазин -> перезапусков процессов
+            self._cache = {}  # Магазин -> [попадания, промахи]
+            self._stages = {}  # (магазин, этап) -> Histogram
+            self._stage_failures = {}  # (магазин, этап) -> сбоев этапа
+            self._article_latency = {}  # Магазин -> Histogram
+            self._resources = {}  # (магазин, рабочий) -> (RSS, байт; CPU, %; процессов)
+            self._recycles = {}  # Магазин -> перезапусков браузера по порогу памяти
+            self._disabled = set()  # Магазины, отключённые до конца запуска (см. ShopHealth)
+
+    def add_queued(self, shop, count):
+        """Артикулы магазина поставлены в очередь."""
+        with self._lock:
+            self._queued[shop] = self._queued.get(shop, 0) + count
+
+    def worker_started(self, shop):
+        with self._lock:
+            self._started.setdefault(shop, time.monotonic())
+            self._browsers[shop] = self._browsers.get(shop, 0) + 1
+
+    def worker_stopped(self, shop, restarted=False, worker=None):
+        with self._lock:
+            self._browsers[shop] = max(0, self._browsers.get(shop, 0) - 1)
+            if restarted:
+                self._restarts[shop] = self._restarts.get(shop, 0) + 1
+            self._resources.pop((shop, worker), None)
+
+    def resource_usage(self, shop, worker, rss, cpu, processes):
+        """Последний замер рабочего вместе с chromedriver и Chrome (см. ResourceSampler)."""
+        with self._lock:
+            self._resources[(shop, worker)] = (rss, cpu, processes)
+
+    def browser_recycled(self, shop):
+        with self._lock:
+            self._recycles[shop] = self._recycles.get(shop, 0) + 1
+
+    def shop_disabled(self, shop):
+        with self._lock:
+            self._disabled.add(shop)
+
+    def article_done(self, shop, status, failed=False, seconds=None, stages=()):
+        """
+        Артикул обработан (или пропущен).
+
+        :param status: Ответ магазина (results, empty, captcha, block, error)
+        :param failed: Артикул не удалось обработать
+        :param seconds: Время обработки артикула
+        :param stages: Пары (этап, сек, успешно) из AbstractParser.stage_timings
+        """
+        with self._lock:
+            key = (shop, status)
+            self._articles[key] = self._articles.get(key, 0) + 1
+            if failed:
+                self._failed[shop] = self._failed.get(shop, 0) + 1
+            self._queued[shop] = max(0, self._queued.get(shop, 0) - 1)
+            if seconds is not None:
+                self._article_latency.setdefault(shop, Histogram()).observe(seconds)
+            for stage, stage_seconds, ok in stages:
+                self._stages.setdefault((shop, stage), Histogram()).observe(stage_seconds)
+                if not ok:
+                    self._stage_failures[(shop, stage)] = self._stage_failures.get((shop, stage), 0) + 1
+
+    def cache_lookup(self, shop, hits=0, misses=0):
+        """
+        Учитывает артикулы, которым не понадобился отдельный поиск (hits: то же написание уже искали
+        или цена ещё свежая), и те, что ушли в поиск (misses).
+        """
+        with self._lock:
+            counts = self._cache.setdefault(shop, [0, 0])
+            counts[0] += hits
+            counts[1] += misses
+
+    def snapshot(self):
+        """
+        Сводка по магазинам для GUI.
+
+        :return: {магазин: {"processed", "failed", "blocked", "rate", "queued", "browsers", "restarts",
+                  "cache_hit_ratio", "error_rate", "block_rate", "rss_mb", "cpu", "disabled",
+                  "stages": {этап: средняя длительность}}}
+        """
+        now = time.monotonic()
+        with self._lock:
+            shops = (set(self._queued) | set(self._browsers) | set(self._cache)
+                     | {shop for shop, _ in self._articles})
+            summary = {}
+            for shop in sorted(shops):
+                processed = sum(count for (name, _), count in self._articles.items() if name == shop)
+                blocked = sum(count for (name, status), count in self._articles.items()
+                              if name == shop and status in BLOCKED)
+                failed = self._failed.get(shop, 0)
+                elapsed = now - self._started[shop] if shop in self._started else 0.0
+                hits, misses = self._cache.get(shop, (0, 0))
+                resources = [usage for (name, _), usage in self._resources.items() if name == shop]
+                summary[shop] = {
+                    "processed": processed,
+                    "failed": failed,
+                    "blocked": blocked,
+                    "rate": processed / elapsed if elapsed > 0 else 0.0,
+                    "queued": self._queued.get(shop, 0),
+                    "browsers": self._browsers.get(shop, 0),
+                    "restarts": self._restarts.get(shop, 0),
+                    "cache_hit_ratio": hits / (hits + misses) if hits + misses else None,
+                    "error_rate": failed / processed if processed else 0.0,
+                    "block_rate": blocked / processed if processed else 0.0,
+                    "rss_mb": sum(rss for rss, _, _ in resources) / (1024 * 1024) if resources else None,
+                    "cpu": sum(cpu for _, cpu, _ in resources) if resources else None,
+                    "disabled": shop in self._disabled,
+                    "stages": {stage: histogram.mean for (name, stage), histogram in self._stages.items()
+                               if name == shop},
+                }
+            return summary
+
+    @staticmethod
+    def _render_histogram(lines, name, labels, histogram):
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {count}")
+        lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {histogram.count}")
+        lines.append(f"{name}_sum{_labels(**labels)} {histogram.total:.6f}")
+        lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+
+    def render(self):
+        """Метрики в текстовом формате Prometheus."""
+        snapshot = self.snapshot()
+        with self._lock:
+            lines = [
+                "# HELP emparser_articles_total Articles processed, by shop response.",
+                "# TYPE emparser_articles_total counter",
+            ]
+            lines += [f"emparser_articles_total{_labels(shop=shop, status=status)} {count}"
+                      for (shop, status), count in sorted(self._articles.items())]
+
+            lines += ["# HELP emparser_article_failures_total Articles that failed or were skipped.",
+                      "# TYPE emparser_article_failures_total counter"]
+            lines += [f"emparser_article_failures_total{_labels(shop=shop)} {count}"
+                      for shop, count in sorted(self._failed.items())]
+
+            lines += ["# HELP emparser_articles_per_second Articles processed per second since the shop started.",
+                      "# TYPE emparser_articles_per_second gauge"]
+            lines += [f"emparser_articles_per_second{_labels(shop=shop)} {stats['rate']:.6f}"
+                      for shop, stats in snapshot.items()]
+
+            lines += ["# HELP emparser_queue_depth Articles waiting to be processed.",
+                      "# TYPE emparser_queue_depth gauge"]
+            lines += [f"emparser_queue_depth{_labels(shop=shop)} {stats['queued']}"
+                      for shop, stats in snapshot.items()]
+
+            lines += ["# HELP emparser_active_browsers Running parser processes, each with its own browser.",
+                      "# TYPE emparser_active_browsers gauge"]
+            lines += [f"emparser_active_browsers{_labels(shop=shop)} {stats['browsers']}"
+                      for shop, stats in snapshot.items()]
+
+            lines += ["# HELP emparser_shop_disabled 1 if the shop was disabled for the rest of the run.",
+                      "# TYPE emparser_shop_disabled gauge"]
+            lines += [f"emparser_shop_disabled{_labels(shop=shop)} {int(stats['disabled'])}"
+                      for shop, stats in snapshot.items()]
+
+            lines += ["# HELP emparser_worker_restarts_total Parser processes restarted after a crash or hang.",
+                      "# TYPE emparser_worker_restarts_total counter"]
+            lines += [f"emparser_worker_restarts_total{_labels(shop=shop)} {count}"
+                      for shop, count in sorted(self._restarts.items())]
+
+            lines += ["# HELP emparser_worker_rss_bytes Resident memory of a parser process with its chromedriver and Chrome.",
+                      "# TYPE emparser_worker_rss_bytes gauge"]
+            lines += [f"emparser_worker_rss_bytes{_labels(shop=shop, worker=worker)} {rss}"
+                      for (shop, worker), (rss, _, _) in sorted(self._resources.items())]
+            lines += ["# HELP emparser_worker_cpu_percent CPU of a parser process tree, percent of one core.",
+                      "# TYPE emparser_worker_cpu_percent gauge"]
+            lines += [f"emparser_worker_cpu_percent{_labels(shop=shop, worker=worker)} {cpu:.1f}"
+                      for (shop, worker), (_, cpu, _) in sorted(self._resources.items())]
+            lines += ["# HELP emparser_worker_processes Processes in a parser process tree.",
+                      "# TYPE emparser_worker_processes gauge"]
+            lines += [f"emparser_worker_processes{_labels(shop=shop, worker=worker)} {processes}"
+                      for (shop, worker), (_, _, processes) in sorted(self._resources.items())]
+            lines += ["# HELP emparser_browser_recycles_total Browsers restarted above the memory threshold.",
+                      "# TYPE emparser_browser_recycles_total counter"]
+            lines += [f"emparser_browser_recycles_total{_labels(shop=shop)} {count}"
+                      for shop, count in sorted(self._recycles.items())]
+
+            lines += ["# HELP emparser_query_cache_hits_total Articles served without a separate search.",
+                      "# TYPE emparser_query_cache_hits_total counter"]
+            lines += [f"emparser_query_cache_hits_total{_labels(shop=shop)} {hits}"
+                      for shop, (hits, _) in sorted(self._cache.items())]
+            lines += ["# HELP emparser_query_cache_misses_total Articles sent to the shop search.",
+                      "# TYPE emparser_query_cache_misses_total counter"]
+            lines += [f"emparser_query_cache_misses_total{_labels(shop=shop)} {misses}"
+                      for shop, (_, misses) in sorted(self._cache.items())]
+
+            lines += ["# HELP emparser_stage_failures_total Parse stages that failed after retries.",
+                      "# TYPE emparser_stage_failures_total counter"]
+            lines += [f"emparser_stage_failures_total{_labels(shop=shop, stage=stage)} {count}"
+                      for (shop, stage), count in sorted(self._stage_failures.items())]
+
+            lines += ["# HELP emparser_stage_seconds Duration of parse stages, including retries.",
+                      "# TYPE emparser_stage_seconds histogram"]
+            for (shop, stage), histogram in sorted(self._stages.items()):
+                self._render_histogram(lines, "emparser_stage_seconds", {"shop": shop, "stage": stage}, histogram)
+
+            lines += ["# HELP emparser_article_seconds Time from article start to its result.",
+                      "# TYPE emparser_article_seconds histogram"]
+            for shop, histogram in sorted(self._article_latency.items()):
+                self._render_histogram(lines, "emparser_article_seconds", {"shop": shop}, histogram)
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """HTTP-эндпоинт /metrics для Prometheus в фоновом потоке."""
+
+    def __init__(self, metrics, port, host="127.0.0.1"):
+        """
+        :param metrics: RunMetrics
+        :param port: Порт (0 — любой свободный, см. self.port после start())
+        :param host: Адрес; по умолчанию только локальные подключения
+        """
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server = None
+
+    @classmethod
+    def from_env(cls, metrics):
+        """Сервер на порту из EMPARSER_METRICS_PORT или None, если переменная не задана."""
+        port = os.environ.get(METRICS_PORT_ENV, "").strip()
+        if not port:
+            return None
+        try:
+            return cls(metrics, int(port))
+        except ValueError:
+            parser_logger.error("Неверный порт в %s: %s", METRICS_PORT_ENV, port)
+            return None
+
+    def _handler(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                parser_logger.debug("MetricsServer: " + format, *args)
+
+        return Handler
+
+    def start(self):
+        """Запускает сервер; ошибка занятого порта пишется в лог и не прерывает парсинг."""
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        except OSError as e:
+            parser_logger.error("%s: Не удалось открыть порт %s: %s", self.__class__.__name__, self.port, e)
+            return self
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True).start()
+        parser_logger.info("%s: Метрики доступны на http://%s:%s/metrics", self.__class__.__name__, self.host, self.port)
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,98 @@
+import os
+import threading
+
+from src.logger.logger import get_logger
+from src.utils.PageClassifier import BLOCKED, ERROR, TRUSTED
+
+parser_logger = get_logger(__name__)
+
+# Проверять магазины контрольным запросом перед запуском ("0" — не проверять)
+HEALTH_CHECK_ENV = "EMPARSER_HEALTH_CHECK"
+# Сколько артикулов подряд может не удаться, прежде чем магазин отключается до конца запуска ("0" — не отключать)
+FAIL_FAST_ENV = "EMPARSER_FAIL_FAST"
+DEFAULT_FAIL_FAST = 20
+
+
+class ShopHealth:
+    """
+    Состояние магазинов за один запуск: проверка контрольным запросом и отключение сломанного магазина.
+
+    Магазин отключается, если контрольный запрос не нашёл карточек или обязательных полей (селекторы
+    устарели после обновления сайта), либо если fail_fast_after артикулов подряд закончились ошибкой
+    или тайм-аутом. Оставшиеся артикулы такого магазина сразу помечаются сбойными, вместо того чтобы
+    ждать полный тайм-аут на каждом. Один объект используется всеми пачками артикулов запуска.
+    """
+
+    def __init__(self, health_check=True, fail_fast_after=DEFAULT_FAIL_FAST):
+        """
+        :param health_check: Проверять магазин контрольным запросом перед первым артикулом
+        :param fail_fast_after: Сколько неудачных артикулов подряд отключают магазин (None или 0 — не отключать)
+        """
+        self.health_check = health_check
+        self.fail_fast_after = fail_fast_after or None
+        self.disabled = {}  # Магазин -> причина отключения
+        self._probed = set()
+        self._failures = {}  # Магазин -> неудачных артикулов подряд
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, health_check=None, fail_fast_after=None):
+        """Настройки из аргументов, а если они не заданы — из EMPARSER_HEALTH_CHECK и EMPARSER_FAIL_FAST."""
+        if health_check is None:
+            health_check = os.environ.get(HEALTH_CHECK_ENV, "1").strip() not in ("0", "false", "no", "off")
+        if fail_fast_after is None:
+            fail_fast_after = int(os.environ.get(FAIL_FAST_ENV, "").strip() or DEFAULT_FAIL_FAST)
+        return cls(health_check=health_check, fail_fast_after=fail_fast_after)
+
+    def claim_probe(self, shop):
+        """Нужно ли проверить магазин; проверка достаётся только первому рабочему процессу магазина."""
+        with self._lock:
+            if not self.health_check or shop in self._probed or shop in self.disabled:
+                return False
+            self._probed.add(shop)
+            return True
+
+    def probe_done(self, shop, ok, details):
+        """
+        Результат контрольного запроса.
+
+        :return: True, если магазин отключён этой проверкой
+        """
+        if ok:
+            parser_logger.info("%s: %s исправен: %s", self.__class__.__name__, shop, details)
+            return False
+        return self.disable(shop, f"проверка не пройдена: {details}")
+
+    def record(self, shop, status=None, failed=False):
+        """
+        Учитывает результат артикула.
+
+        :param status: Ответ магазина (results, empty, captcha, block, error); None — артикул пропущен
+        :param failed: Этап парсинга не удался, процесс упал или завис
+        :return: True, если магазин отключён этим артикулом
+        """
+        with self._lock:
+            if shop in self.disabled:
+                return False
+            if status in TRUSTED and not failed:
+                self._failures[shop] = 0
+                return False
+            if status in BLOCKED:
+                return False  # Капча и блокировка — дело сессии и прокси, а не селекторов
+            count = self._failures.get(shop, 0) + 1
+            self._failures[shop] = count
+        if self.fail_fast_after and count >= self.fail_fast_after:
+            return self.disable(shop, f"{count} артикулов подряд без результата ({status or ERROR})")
+        return False
+
+    def disable(self, shop, reason):
+        """Отключает магазин до конца запуска. :return: True, если магазин ещё не был отключён."""
+        with self._lock:
+            if shop in self.disabled:
+                return False
+            self.disabled[shop] = reason
+        parser_logger.error("%s: Магазин %s отключён до конца запуска: %s", self.__class__.__name__, shop, reason)
+        return True
+
+    def is_disabled(self, shop):
+        return shop in self.disabled
@@ -0,0 +1,137 @@
+import random
+import time
+
+from src.logger.logger import get_logger
+
+parser_logger = get_logger(__name__)
+
+
+class StageError(Exception):
+    """Сбой этапа парсинга. retryable — имеет ли смысл повторить этап."""
+
+    retryable = False
+
+    def __init__(self, stage, message=""):
+        super().__init__(f"{stage}: {message}" if message else stage)
+        self.stage = stage
+
+
+class SetupError(StageError):
+    """Не удалось запустить браузер."""
+    retryable = True
+
+
+class NavigationError(StageError):
+    """Не удалось открыть сайт."""
+    retryable = True
+
+
+class SearchError(StageError):
+    """Не удалось ввести запрос или запустить поиск."""
+    retryable = True
+
+
+class ParsePageError(StageError):
+    """Ошибка при разборе страницы результатов."""
+
+
+class SaveError(StageError):
+    """Ошибка при сохранении результатов."""
+
+
+class DeadlineExceeded(StageError):
+    """Этап не уложился в отведённое время."""
+
+
+STAGE_ERRORS = {
+    "setup": SetupError,
+    "navigate": NavigationError,
+    "search": SearchError,
+    "parse": ParsePageError,
+    "save": SaveError,
+}
+
+# Предельное время этапа, сек
+DEFAULT_DEADLINES = {"setup": 60.0, "navigate": 30.0, "search": 30.0, "parse": 90.0, "save": 15.0}
+
+# Сколько раз этап можно повторить после сбоя
+DEFAULT_RETRIES = {"setup": 1, "navigate": 2, "search": 1, "parse": 0, "save": 0}
+
+
+class StageDeadline:
+    """Момент окончания времени этапа (по time.monotonic). Ожидание ограничителя скорости сюда не засчитывается."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self):
+        return time.monotonic() > self.expires
+
+    def extend(self, seconds):
+        """Сдвигает окончание этапа, например на время ожидания очереди запросов к сайту."""
+        self.expires += seconds
+
+
+class StagePolicy:
+    """
+    Правила выполнения этапов парсинга: предельное время каждого этапа и ограниченные повторы
+    с экспоненциальной задержкой и случайным джиттером.
+
+    Любое исключение этапа превращается в типизированную ошибку (SearchError и т. п.);
+    если время этапа истекло — в DeadlineExceeded, которую не повторяют.
+    """
+
+    def __init__(self, deadlines=None, retries=None, base_delay=0.5, max_delay=5.0):
+        """
+        :param deadlines: {этап: сек}, дополняет DEFAULT_DEADLINES
+        :param retries: {этап: число повторов}, дополняет DEFAULT_RETRIES
+        :param base_delay: Задержка перед первым повтором, сек (удваивается с каждой попыткой)
+        :param max_delay: Наибольшая задержка между попытками, сек
+        """
+        self.deadlines = dict(DEFAULT_DEADLINES, **(deadlines or {}))
+        self.retries = dict(DEFAULT_RETRIES, **(retries or {}))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def _as_stage_error(self, stage, error, deadline):
+        if deadline is not None and deadline.expired():
+            return DeadlineExceeded(stage, f"превышено {deadline.seconds} с ({error})")
+        if isinstance(error, StageError):
+            return error
+        return STAGE_ERRORS.get(stage, StageError)(stage, f"{type(error).__name__}: {error}")
+
+    def run(self, stage, action, before_retry=None, on_attempt=None):
+        """
+        Выполняет этап.
+
+        :param stage: Название этапа (setup, navigate, search, parse, save)
+        :param action: Функция этапа
+        :param before_retry: Что сделать перед повтором (например, перезагрузить страницу)
+        :param on_attempt: Вызывается в начале каждой попытки с её StageDeadline
+        :return: Результат action()
+        :raises StageError: Если этап не удался после всех попыток
+        """
+        retries = self.retries.get(stage, 0)
+        for attempt in range(retries + 1):
+            deadline = None
+            try:
+                if attempt and before_retry:
+                    before_retry()
+                deadline = StageDeadline(self.deadlines.get(stage, float("inf")))
+                if on_attempt:
+                    on_attempt(deadline)
+                return action()
+            except Exception as e:
+                error = self._as_stage_error(stage, e, deadline)
+                if not error.retryable or attempt == retries:
+                    raise error from e
+
+                # Полный джиттер: случайная задержка от 0 до base_delay * 2^attempt
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                parser_logger.warning("%s: Этап %s, попытка %s из %s не удалась (%s), повтор через %.2f с",
+                                      self.__class__.__name__, stage, attempt + 1, retries + 1, error, delay)
+                time.sleep(delay)
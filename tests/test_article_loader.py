@@ -0,0 +1,56 @@
+from src.utils.ArticleLoader import ArticleLoader, normalize_article, parse_quantity, parse_shops
+
+
+def write_csv(tmp_path, text, name="articles.csv"):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_cell_parsing():
+    assert normalize_article(12345.0) == "12345"
+    assert normalize_article("  LM317   T ") == "LM317 T"
+    assert parse_quantity("1 000,5") == 1000.5 and parse_quantity("шт") is None
+    assert parse_shops("ChipDip; eBay |Ozon") == ("ChipDip", "eBay", "Ozon")
+
+
+def test_header_columns_and_duplicates(tmp_path):
+    path = write_csv(tmp_path, "Артикул;Кол-во;Магазины\nLM317;2;ChipDip\nNE555;;\nLM317;3;eBay\n\n")
+    loader = ArticleLoader(path)
+
+    rows = list(loader.rows())
+
+    assert [(row.article, row.quantity, row.shops, row.row) for row in rows] == [
+        ("LM317", 5, ("ChipDip", "eBay"), 2), ("NE555", None, (), 3)]
+    assert loader.duplicates == 1
+    assert rows[0].wants("ebay") and not rows[0].wants("Ozon") and rows[1].wants("Ozon")
+
+
+def test_without_header_reads_first_column(tmp_path):
+    path = write_csv(tmp_path, "LM317,foo\nNE555,bar\n")
+
+    assert [row.article for row in ArticleLoader(path).rows()] == ["LM317", "NE555"]
+
+
+def test_widened_rows_are_reported_after_their_chunk(tmp_path):
+    path = write_csv(tmp_path, "article,shops\nLM317,ChipDip\nNE555,ChipDip\nLM317,eBay\nNE555,ChipDip\n")
+    loader = ArticleLoader(path, chunk_size=1)
+    chunks = loader.chunks()
+
+    assert [row.article for row in next(chunks)] == ["LM317"]
+    assert loader.widened() == []
+    assert [row.article for row in next(chunks)] == ["NE555"]
+    assert loader.widened() == []
+    # Повтор LM317 дочитан после того, как строка ушла в первой пачке: отдаётся пустая пачка
+    assert next(chunks) == []
+    widened = loader.widened()
+    assert [(row.article, row.shops) for row in widened] == [("LM317", ("ChipDip", "eBay"))]
+    assert list(chunks) == []
+
+
+def test_row_asking_for_all_shops_widens(tmp_path):
+    path = write_csv(tmp_path, "article,shops\nLM317,ChipDip\nLM317,\n")
+    loader = ArticleLoader(path, chunk_size=1)
+
+    assert [[row.article for row in chunk] for chunk in loader.chunks()] == [["LM317"], []]
+    assert loader.widened()[0].shops == ()
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+import cli
+from src.parsers.ShopRegistry import shop_names
+from src.utils import BatchRunner as batch_runner_module
+
+
+class FakeRunner:
+    """BatchRunner, который только запоминает аргументы."""
+
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        FakeRunner.instances.append(self)
+
+    def run(self):
+        return {shop: {"offers": 2, "failed": {"A1": "сбой"}} for shop in self.kwargs["shops"]}
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    for name in ("EMPARSER_PROXIES", "EMPARSER_PROFILE", "EMPARSER_METRICS_PORT"):
+        # setenv запоминает исходное значение, и переменные, заданные cli.main, удаляются после теста
+        monkeypatch.setenv(name, "")
+        monkeypatch.delenv(name)
+    monkeypatch.setattr(batch_runner_module, "BatchRunner", FakeRunner)
+    FakeRunner.instances = []
+    return FakeRunner
+
+
+def test_arguments_reach_batch_runner(runner, capsys):
+    shop = shop_names()[0]
+
+    code = cli.main(["--articles", "in.csv", "--shops", shop, "--output", "out.xlsx", "--workers", "2",
+                     "--shards", "3", "--chunk-size", "50", "--incremental", "--budget", "10",
+                     "--export", "parquet", "--recycle-rss-mb", "1500", "--no-health-check", "--fail-fast", "0",
+                     "--rates", "USD=90"])
+
+    assert code == 0
+    kwargs = runner.instances[0].kwargs
+    assert kwargs["articles_file"] == "in.csv" and kwargs["shops"] == [shop] and kwargs["output_file"] == "out.xlsx"
+    assert (kwargs["max_workers"], kwargs["shards_per_shop"], kwargs["chunk_size"]) == (2, 3, 50)
+    assert kwargs["incremental"] and kwargs["budget"] == 10 and kwargs["export_format"] == "parquet"
+    assert kwargs["recycle_rss_mb"] == 1500 and kwargs["health_check"] is False and kwargs["fail_fast_after"] == 0
+    assert kwargs["rates"] == "USD=90"
+    assert "Done: 2 records, 1 failed articles" in capsys.readouterr().out
+
+
+def test_defaults(runner):
+    assert cli.main(["--shops", "all"]) == 0
+
+    kwargs = runner.instances[0].kwargs
+    assert kwargs["shops"] == shop_names()
+    assert kwargs["chunk_size"] == 1000 and kwargs["health_check"] is None and kwargs["rates"] is None
+
+
+def test_proxies_and_profile_go_to_environment(runner, monkeypatch):
+    cli.main(["--shops", shop_names()[0], "--proxies", "proxies.txt", "--profile", "profile"])
+
+    # Рабочие процессы читают эти настройки из окружения
+    assert os.environ["EMPARSER_PROXIES"] == "proxies.txt"
+    assert os.environ["EMPARSER_PROFILE"] == "profile"
+
+
+def test_unknown_shop_is_rejected(runner, capsys):
+    assert cli.main(["--shops", "NoSuchShop"]) == 2
+    assert not runner.instances
+    assert "NoSuchShop" in capsys.readouterr().err
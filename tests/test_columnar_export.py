@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from src.utils.ColumnarExport import export_offer_batches, export_offers, read_offers
+
+pytest.importorskip("pyarrow")
+
+
+def batch(*prices):
+    return [{"LM317": {"description": "LM317T", "url": f"https://x/{price}", "price": f"{price} ₽"}}
+            for price in prices]
+
+
+@pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+def test_batches_go_to_one_partition_file(tmp_path, export_format):
+    filepath = export_offer_batches(iter([batch(10, 12), [], batch(15)]), "ChipDip", 7, root=str(tmp_path),
+                                    export_format=export_format)
+
+    assert filepath == os.path.join(str(tmp_path), "run=7", "shop=ChipDip", f"offers.{export_format}")
+    table = read_offers(str(tmp_path))
+    assert table.column("price").to_pylist() == [10.0, 12.0, 15.0]
+    assert set(table.column("run").to_pylist()) == {"7"}
+
+
+def test_export_offers_and_unknown_format(tmp_path):
+    export_offers(batch(1), "eBay", "r1", root=str(tmp_path))
+
+    assert read_offers(str(tmp_path), shops=["eBay"]).num_rows == 1
+    with pytest.raises(ValueError):
+        export_offers(batch(1), "eBay", "r1", root=str(tmp_path), export_format="csv")
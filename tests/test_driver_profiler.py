@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from src.utils.DriverProfiler import DriverProfiler, build_report, folded_stacks, selector_stats
+
+
+class FakeDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, driver_command, params=None):
+        self.commands.append(driver_command)
+        if driver_command == "findElement" and params["value"] == "div.missing":
+            raise LookupError("нет элемента")
+        return {"value": None}
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = DriverProfiler(str(tmp_path))
+    profiler.set_context("Demo", "A-1")
+    profiler.set_stage("parse")
+    return profiler
+
+
+def test_attach_records_commands_with_selectors(profiler):
+    driver = profiler.attach(FakeDriver())
+    assert profiler.attach(driver) is driver
+
+    driver.execute("findElement", {"using": "css selector", "value": "div.card"})
+    with pytest.raises(LookupError):
+        driver.execute("findElement", {"using": "css selector", "value": "div.missing"})
+    driver.execute("executeScript", {"script": "return 1", "args": []})
+
+    events = profiler._events
+    assert [(event["command"], event["selector"], event["ok"]) for event in events] == [
+        ("findElement", "css selector=div.card", True), ("findElement", "css selector=div.missing", False),
+        ("executeScript", None, True)]
+    assert all(event["shop"] == "Demo" and event["stage"] == "parse" for event in events)
+
+
+def script_events(profiler):
+    profiler._record_command("executeScript", {"script": "...", "args": []}, 0.5, None)
+    profiler.record_script("executeScript", [("карточка", "div.card", 1, 1, 0.1),
+                                             ("price", "span.price", 4, 3, 0.2)])
+    return profiler._events
+
+
+def test_script_searches_nest_under_their_command(profiler):
+    stacks = folded_stacks(script_events(profiler))
+
+    assert stacks["Demo;parse;executeScript"] == pytest.approx(0.2)
+    assert stacks["Demo;parse;executeScript;карточка css selector=div.card"] == pytest.approx(0.1)
+    assert stacks["Demo;parse;executeScript;price css selector=span.price"] == pytest.approx(0.2)
+    assert sum(stacks.values()) == pytest.approx(0.5)
+
+
+def test_selector_stats_count_script_searches(profiler):
+    stats = {row["selector"]: row for row in selector_stats(script_events(profiler))}
+
+    price = stats["css selector=span.price"]
+    assert (price["calls"], price["failed"]) == (4, 1)
+    assert price["seconds"] == pytest.approx(0.2)
+    assert price["failed_seconds"] == pytest.approx(0.05)
+
+
+def test_report_does_not_count_script_searches_twice(profiler, tmp_path):
+    script_events(profiler)
+    profiler.flush()
+
+    with open(build_report(str(tmp_path)), encoding="utf-8") as file:
+        report = file.read()
+    assert "Время в командах WebDriver: 0.5 с" in report
+    assert "     0.5  Demo  A-1" in report
+    assert os.path.exists(tmp_path / "folded.txt")
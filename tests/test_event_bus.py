@@ -0,0 +1,48 @@
+import threading
+
+from src.utils.EventBus import EventBus
+
+
+def test_drain_returns_events_in_publish_order():
+    bus = EventBus()
+    bus.log("старт")
+    bus.progress({"shop": "ChipDip", "article": "LM317", "done": 1, "failed": 0, "total": 2})
+    bus.publish({"type": "custom"})
+
+    events = bus.drain()
+
+    assert [event["type"] for event in events] == ["log", "progress", "custom"]
+    assert events[0]["message"] == "старт"
+    assert events[1]["shop"] == "ChipDip" and events[1]["total"] == 2
+    assert bus.drain() == []
+
+
+def test_drain_is_batched():
+    bus = EventBus()
+    for index in range(5):
+        bus.log(str(index))
+
+    assert [event["message"] for event in bus.drain(max_events=3)] == ["0", "1", "2"]
+    assert [event["message"] for event in bus.drain(max_events=3)] == ["3", "4"]
+
+
+def test_progress_does_not_modify_supervisor_event():
+    event = {"shop": "eBay", "done": 1}
+    EventBus().progress(event)
+
+    assert "type" not in event
+
+
+def test_each_thread_keeps_its_order():
+    bus = EventBus()
+    threads = [threading.Thread(target=lambda name=name: [bus.log(f"{name}:{index}") for index in range(200)])
+               for name in ("a", "b", "c")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    messages = [event["message"] for event in bus.drain(max_events=10000)]
+    assert len(messages) == 600
+    for name in ("a", "b", "c"):
+        assert [int(message.split(":")[1]) for message in messages if message.startswith(name)] == list(range(200))
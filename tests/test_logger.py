@@ -0,0 +1,58 @@
+import json
+import logging
+import os
+
+import pytest
+
+from src.logger.logger import LEVELS_ENV, ROOT_LOGGER_NAME, JsonLinesFormatter, Logger, get_logger
+
+
+@pytest.fixture
+def levels(monkeypatch):
+    """Восстанавливает уровни логгеров и переменную окружения после теста."""
+    logger = Logger()
+    saved = dict(logger.levels)
+    monkeypatch.setenv(LEVELS_ENV, "")
+    yield logger
+    for name in list(logger.levels):
+        logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}" if name else ROOT_LOGGER_NAME).setLevel(logging.NOTSET)
+    logger.levels = {}
+    logger.set_levels(saved or {"": "INFO"})
+
+
+def test_default_level_is_info():
+    assert get_logger("tests.default").getEffectiveLevel() == logging.INFO
+
+
+def test_set_levels_per_module(levels):
+    levels.set_levels("WARNING,tests.verbose=DEBUG")
+
+    assert get_logger("tests.other").getEffectiveLevel() == logging.WARNING
+    assert get_logger("tests.verbose").getEffectiveLevel() == logging.DEBUG
+    # Дочерние процессы получают уровни через окружение
+    assert set(levels.levels.items()) >= {("", "WARNING"), ("tests.verbose", "DEBUG")}
+    assert "tests.verbose=DEBUG" in os.environ[LEVELS_ENV].split(",")
+
+
+def test_disabled_level_does_not_format_arguments(levels):
+    class Expensive:
+        formatted = 0
+
+        def __str__(self):
+            Expensive.formatted += 1
+            return "дорого"
+
+    get_logger("tests.lazy").debug("%s", Expensive())
+
+    assert Expensive.formatted == 0
+
+
+def test_json_lines_formatter():
+    record = logging.LogRecord("ParserLogger.tests", logging.WARNING, "module.py", 12, "Артикул %s: %s",
+                               ("LM317", "нет цены"), None)
+
+    entry = json.loads(JsonLinesFormatter().format(record))
+
+    assert entry["level"] == "WARNING" and entry["logger"] == "ParserLogger.tests"
+    assert entry["message"] == "Артикул LM317: нет цены"
+    assert (entry["file"], entry["line"]) == ("module.py", 12)
@@ -0,0 +1,78 @@
+import pytest
+
+from src.parsers.AbstractParser import AbstractParser
+from src.parsers.ShopDefinition import Field, ShopDefinition
+from src.parsers.ShopEngine import EXTRACT_CARDS_JS, ShopEngineParser
+from src.utils.PageClassifier import BLOCK, CAPTCHA, EMPTY, ERROR, RESULTS, PageClassifier
+
+
+@pytest.mark.parametrize("cards_found, title, text, expected", [
+    (3, "Поиск LM317", "", RESULTS),
+    (0, "Поиск LM317", "По запросу ничего не найдено", EMPTY),
+    (0, "Too Many Requests", "", BLOCK),
+    (5, "Вы не робот?", "", CAPTCHA),
+    (0, "Поиск LM317", "", ERROR),
+])
+def test_classify(cards_found, title, text, expected):
+    assert PageClassifier().classify(cards_found, title, "https://shop/search?q=lm317", text) == expected
+
+
+def test_article_429_is_not_a_block():
+    assert PageClassifier().classify(0, "Поиск 429", "", "ничего не найдено") == EMPTY
+    assert not PageClassifier().is_throttled("LM429 — купить", "https://shop/search?q=429")
+
+
+class FakeDriver:
+    title = "Поиск"
+    current_url = "https://shop/search?q=LM317"
+
+    def __init__(self, descriptions):
+        self.descriptions = descriptions
+
+    def execute_script(self, script, *args):
+        if script == EXTRACT_CARDS_JS:
+            return {"cards": [{"description": text} for text in self.descriptions], "cardsChoice": 0, "hits": [[1]]}
+        return "Результаты поиска"
+
+    def quit(self):
+        pass
+
+
+class FakeShopParser(ShopEngineParser):
+    definition = ShopDefinition("Fake", 99, "https://shop", ".card", [Field("description", ".title")],
+                                search_url="https://shop/search?q={query}", cards_timeout=0, relevance_threshold=1.0)
+    relevance_threshold = 1.0
+
+    def _ensure_driver(self):
+        pass
+
+    def _get_url(self, reload=False):
+        pass
+
+    def _entering_request(self):
+        pass
+
+
+def make_parser(descriptions):
+    parser = object.__new__(FakeShopParser)
+    parser.url, parser.request, parser.items = "https://shop", "LM317", ["LM317"]
+    parser.data, parser.stage_timings = [], []
+    parser.driver = FakeDriver(descriptions)
+    return parser
+
+
+def test_filtered_out_cards_still_count_as_results():
+    parser = make_parser(["Резистор 10 кОм", "Конденсатор 100 мкФ"])
+    AbstractParser._pending.clear()
+
+    status = parser.parse_with_recovery()
+
+    assert status == RESULTS
+    assert parser.new_data == [] and parser.cards_found == 2
+    AbstractParser._pending.clear()
+
+
+def test_page_without_cards_is_not_results():
+    parser = make_parser([])
+
+    assert parser.parse_with_recovery() == ERROR
@@ -0,0 +1,124 @@
+import json
+import time
+
+import pytest
+
+from src.parsers.AbstractParser import AbstractParser
+from src.utils.ParserPool import ParserSupervisor
+from src.utils.PriceDatabase import PriceDatabase
+from src.utils.ResourceSampler import ResourceSampler
+from src.utils.RunMetrics import RunMetrics
+from src.utils.ShopHealth import ShopHealth
+
+
+class FakeDriver:
+    title = "Результаты"
+    current_url = "http://fake.example/search"
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def execute_script(self, script, *args):
+        return ""
+
+    def quit(self):
+        pass
+
+
+class FakeParser(AbstractParser):
+    """Парсер без браузера: на каждый запрос две карточки."""
+
+    def _run_once(self):
+        pass
+
+    def _setup(self, reuse_driver=None):
+        self.driver = FakeDriver()
+
+    def _get_url(self, reload=False):
+        pass
+
+    def _entering_request(self):
+        pass
+
+    def _pars_page(self):
+        self.new_data = [{"description": self.request, "price": "1"}, {"description": self.request, "price": "2"}]
+
+
+class SlowParser(FakeParser):
+    """Парсер, который запоминает, в каком по счёту браузере разобрана страница."""
+
+    def _setup(self, reuse_driver=None):
+        super()._setup(reuse_driver)
+        self.browsers = getattr(self, "browsers", 0) + 1
+
+    def _pars_page(self):
+        time.sleep(0.3)
+        self.new_data = [{"description": self.request, "price": "1", "browser": str(self.browsers)}]
+
+
+class HangingProbeParser(FakeParser):
+    """Парсер, контрольный запрос которого не завершается."""
+
+    def probe_health(self):
+        time.sleep(60)
+        return True, "не дождались"
+
+
+def shop(tmp_path, parser_class=FakeParser, keep_browser=False):
+    return {"shop": "Fake", "parser_class": parser_class, "keep_browser": keep_browser, "site_name": "http://fake.example/",
+            "json_folder": str(tmp_path / "FakeData")}
+
+
+def test_chunks_stream_into_one_json_and_one_progress_total(tmp_path):
+    database = PriceDatabase(str(tmp_path / "prices.sqlite3"))
+    progress = []
+    supervisor = ParserSupervisor(database=database, database_batch_size=2, poll_interval=0.05,
+                                  on_progress=progress.append)
+
+    first = supervisor.run(ParserSupervisor.jobs_for([shop(tmp_path)], ["A1", "A2", "A3"], shards_per_shop=2))
+    second = supervisor.run(ParserSupervisor.jobs_for([shop(tmp_path)], ["A4"]))
+
+    assert first["Fake"]["json_file"] == second["Fake"]["json_file"]
+    assert first["Fake"]["run_id"] == second["Fake"]["run_id"]
+    assert second["Fake"]["offers"] == 8 and "records" not in second["Fake"]
+    assert set(first["Fake"]["statuses"]) == {"A1", "A2", "A3"} and list(second["Fake"]["statuses"]) == ["A4"]
+
+    with open(second["Fake"]["json_file"], encoding="utf-8") as file:
+        records = json.load(file)["Данные"]
+    assert sorted(list(record)[0] for record in records) == ["A1", "A1", "A2", "A2", "A3", "A3", "A4", "A4"]
+    assert len(list((tmp_path / "FakeData").iterdir())) == 1
+    assert sum(len(batch) for batch in database.run_records(second["Fake"]["run_id"], batch_size=3)) == 8
+
+    # Прогресс считается по всему запуску, а не по пачке
+    assert progress[-1]["total"] == 4 and progress[-1]["done"] == 4
+    database.close()
+
+
+def test_hanging_probe_is_stopped_and_disables_shop(tmp_path):
+    health = ShopHealth()
+    supervisor = ParserSupervisor(article_timeout=1, poll_interval=0.05, health=health)
+
+    started = time.monotonic()
+    result = supervisor.run(ParserSupervisor.jobs_for([shop(tmp_path, HangingProbeParser)], ["A1", "A2"]))
+
+    assert time.monotonic() - started < 30
+    assert "превышено время ожидания" in health.disabled["Fake"]
+    assert set(result["Fake"]["failed"]) == {"A1", "A2"} and not result["Fake"]["statuses"]
+
+
+def test_kept_browser_is_recycled_above_memory_threshold(tmp_path):
+    pytest.importorskip("psutil")
+    metrics = RunMetrics()
+    # Любой рабочий превышает порог: браузер перезапускается между артикулами
+    sampler = ResourceSampler(interval=0, recycle_rss_mb=0.001)
+    supervisor = ParserSupervisor(poll_interval=0.05, metrics=metrics, resource_sampler=sampler)
+
+    result = supervisor.run(ParserSupervisor.jobs_for([shop(tmp_path, SlowParser, keep_browser=True)],
+                                                      ["A1", "A2", "A3"]))
+
+    assert result["Fake"]["statuses"] == {"A1": "results", "A2": "results", "A3": "results"}
+    with open(result["Fake"]["json_file"], encoding="utf-8") as file:
+        browsers = [record[article]["browser"] for record in json.load(file)["Данные"] for article in record]
+    assert browsers[0] == "1" and len(set(browsers)) > 1
+    assert 'emparser_browser_recycles_total{shop="Fake"}' in metrics.render()
+    assert sampler.shop_peaks()["Fake"] > 0
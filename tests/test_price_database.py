@@ -0,0 +1,98 @@
+import json
+import sqlite3
+
+from src.utils.PriceDatabase import PriceDatabase
+
+
+def offer(url, price, description="LM317T"):
+    return {"description": description, "url": url, "price": price}
+
+
+def test_same_product_twice_in_one_check_keeps_both(tmp_path):
+    database = PriceDatabase(str(tmp_path / "prices.sqlite3"))
+    run_id = database.start_run("eBay")
+    records = [{"LM317": offer("https://x/1", "10")}, {"LM317": offer("https://x/1", "12")}]
+
+    saved = database.save_checks(run_id, "eBay", [("LM317", records, "results", "2026-01-01 10:00:00")])
+
+    assert saved == 2
+    assert [record["LM317"]["price"] for record in database.latest_run_records("eBay")] == ["10", "12"]
+    database.close()
+
+
+def test_save_checks_writes_checks_and_skips_untrusted(tmp_path):
+    database = PriceDatabase(str(tmp_path / "prices.sqlite3"))
+    first = database.start_run("ChipDip", "2026-01-01 10:00:00")
+    database.save_checks(first, "ChipDip", [
+        ("LM317", [{"LM317": offer("https://x/1", "10")}], "results", "2026-01-01 10:00:00"),
+        ("NE555", [{"NE555": offer("https://x/2", "5", "NE555")}], "results", "2026-01-01 10:00:01"),
+    ])
+    second = database.start_run("ChipDip", "2026-01-02 10:00:00")
+    database.save_checks(second, "ChipDip", [
+        ("LM317", [{"LM317": offer("https://x/1", "11")}], "results", "2026-01-02 10:00:00"),
+        ("NE555", [], "captcha", "2026-01-02 10:00:01"),
+    ])
+
+    checks = database.connection.execute("SELECT article, offers, status FROM checks WHERE run_id = ?",
+                                         (second,)).fetchall()
+    assert {(row["article"], row["offers"], row["status"]) for row in checks} == {("LM317", 1, "results"),
+                                                                                  ("NE555", 0, "captcha")}
+    # Проверка с капчей не доверенная: NE555 берётся из первого запуска
+    latest = {article: record["price"] for item in database.latest_checked_records("ChipDip")
+              for article, record in item.items()}
+    assert latest == {"LM317": "11", "NE555": "5"}
+    database.close()
+
+
+def test_import_accepts_legacy_data_key(tmp_path):
+    folder = tmp_path / "AliexpressData"
+    folder.mkdir()
+    (folder / "new.json").write_text(json.dumps({"Дата и время создания файла": "2026-01-01 10:00:00",
+                                                 "Данные": [{"LM317": offer("https://x/1", "10")}]}), encoding="utf-8")
+    (folder / "old.json").write_text(json.dumps({"Creation Date and Time": "2025-01-01 10:00:00",
+                                                 "Data": [{"LM317": offer("https://x/1", "9")},
+                                                          {"NE555": offer("https://x/2", "5", "NE555")}]}),
+                                     encoding="utf-8")
+    (folder / "broken.json").write_text(json.dumps({"Something": []}), encoding="utf-8")
+    database = PriceDatabase(str(tmp_path / "prices.sqlite3"))
+
+    assert database.import_json_folder("Aliexpress", str(folder)) == 3
+    assert database.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 2
+    database.close()
+
+
+def test_old_offers_table_is_migrated(tmp_path):
+    path = str(tmp_path / "prices.sqlite3")
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, shop TEXT NOT NULL, started_at TEXT NOT NULL);
+        CREATE TABLE offers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, run_id INTEGER NOT NULL, shop TEXT NOT NULL, article TEXT NOT NULL,
+            product_key TEXT NOT NULL, observed_at TEXT NOT NULL, description TEXT, price TEXT, url TEXT,
+            payload TEXT NOT NULL, UNIQUE (shop, article, product_key, observed_at));
+        INSERT INTO runs (shop, started_at) VALUES ('eBay', '2025-01-01 10:00:00');
+        INSERT INTO offers (run_id, shop, article, product_key, observed_at, price, payload)
+        VALUES (1, 'eBay', 'LM317', 'https://x/1', '2025-01-01 10:00:00', '10', '{"price": "10"}');
+    """)
+    connection.close()
+
+    database = PriceDatabase(path)
+    columns = {row["name"] for row in database.connection.execute("PRAGMA table_info(offers)")}
+    assert {"fingerprint", "position"} <= columns
+    assert database.latest_run_records("eBay") == [{"LM317": {"price": "10"}}]
+    indexes = {row["name"] for row in database.connection.execute("PRAGMA index_list(offers)")}
+    assert "idx_offers_latest" in indexes
+    database.close()
+
+
+def test_run_records_are_read_in_batches(tmp_path):
+    database = PriceDatabase(str(tmp_path / "prices.sqlite3"))
+    run_id = database.start_run("eBay")
+    records = [{"LM317": offer(f"https://x/{number}", str(number))} for number in range(5)]
+    database.save_checks(run_id, "eBay", [("LM317", records, "results", "2026-01-01 10:00:00")])
+
+    batches = list(database.run_records(run_id, batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [record for batch in batches for record in batch] == records
+    database.close()
@@ -0,0 +1,36 @@
+from src.utils.PriceNormalizer import normalize_prices, normalize_records, to_offers
+
+
+def test_normalize_prices_formats():
+    frame = normalize_prices(["1 234,56 ₽/шт", "$12.99 to $15.99", "87&nbsp;900", "1.234.567", "1,234.56 EUR",
+                              "56 руб./м", "¥ 12"])
+
+    assert frame["price"].tolist() == [1234.56, 12.99, 87900.0, 1234567.0, 1234.56, 56.0, 12.0]
+    assert frame["currency"].tolist() == ["RUB", "USD", "RUB", "RUB", "EUR", "RUB", "CNY"]
+    assert frame["unit"].tolist()[0] == "шт"
+    assert frame["unit"].tolist()[5] == "м"
+
+
+def test_missing_price_has_no_currency():
+    frame = normalize_prices(["Цена не найдена", None, ""])
+
+    assert frame["price"].isna().all()
+    assert frame["currency"].isna().all()
+
+
+def test_default_currency_for_bare_numbers():
+    assert normalize_prices(["1500"], default_currency="USD")["currency"].tolist() == ["USD"]
+
+
+def test_normalize_records_and_offers():
+    records = [{"LM317": {"description": "LM317T", "url": "https://x/1", "price": "10 ₽", "relevance": 1.0}},
+               {"LM317": {"name": "LM317 kit", "cards_ID": "7", "price": "Цена не найдена"}}]
+
+    frame = normalize_records(records, shop="ChipDip")
+
+    assert str(frame["price"].dtype) == "float64"
+    offers = to_offers(frame)
+    assert [(offer.shop, offer.article, offer.price, offer.currency) for offer in offers] == [
+        ("ChipDip", "LM317", 10.0, "RUB"), ("ChipDip", "LM317", None, None)]
+    assert offers[1].description == "LM317 kit" and offers[1].product_code == "7"
+    assert offers[0].relevance == 1.0 and offers[1].relevance is None
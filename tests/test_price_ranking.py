@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from src.utils.PriceNormalizer import normalize_records
+from src.utils.PriceRanking import parse_rates, rank_offers, rates_from_config
+
+
+def offers():
+    return normalize_records([
+        {"LM317": {"description": "LM317T eBay", "url": "https://ebay/1", "price": "$12.99", "shop": "eBay"}},
+        {"LM317": {"description": "LM317T", "url": "https://chipdip/1", "price": "1 200 ₽"}},
+        {"LM317": {"description": "LM317 2шт", "url": "https://chipdip/2", "price": "900 ₽"}},
+    ], shop="ChipDip").assign(shop=["eBay", "ChipDip", "ChipDip"])
+
+
+def test_offers_without_rate_are_ranked_in_their_currency():
+    summary = rank_offers(offers(), articles=["LM317", "NE555"], top_n=2)
+
+    assert summary[["article", "offers", "min_price", "currency", "cheapest_shop"]].values.tolist()[:2] == [
+        ["LM317", 2, 900.0, "RUB", "ChipDip"], ["LM317", 1, 12.99, "USD", "eBay"]]
+    assert summary.loc[1, "link_1"] == "https://ebay/1" and pd.isna(summary.loc[1, "price_2"])
+    # Артикул без предложений остаётся в сводке
+    assert (summary.loc[2, "article"], summary.loc[2, "offers"]) == ("NE555", 0) and pd.isna(summary.loc[2, "min_price"])
+
+
+def test_offers_with_rate_are_converted():
+    summary = rank_offers(offers(), top_n=3, rates={"USD": 100.0})
+
+    assert len(summary) == 1
+    row = summary.iloc[0]
+    assert (row["offers"], row["currency"], row["cheapest_shop"]) == (3, "RUB", "ChipDip")
+    assert [row["shop_1"], row["shop_2"], row["shop_3"]] == ["ChipDip", "ChipDip", "eBay"]
+    assert row["price_3"] == pytest.approx(1299.0)
+    assert row["median_price"] == pytest.approx(1200.0)
+
+
+def test_parse_rates(monkeypatch):
+    assert parse_rates("usd=92.5, EUR = 100") == {"USD": 92.5, "EUR": 100.0}
+    assert parse_rates("") == {}
+    with pytest.raises(ValueError):
+        parse_rates("USD")
+
+    monkeypatch.setenv("EMPARSER_RATES", "CNY=12.5")
+    assert rates_from_config() == {"CNY": 12.5}
+    assert rates_from_config({"usd": "90"}) == {"USD": 90.0}
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from src.utils.QueryPlanner import QueryPlan, canonical_query, fan_out_offers
+
+
+def test_spelling_variants_share_one_query():
+    plan = QueryPlan(["LM317T", "lm-317t", "LM 317 T", "NE555"])
+
+    assert canonical_query("lm-317t") == canonical_query("LM317T")
+    assert plan.queries == ["LM317T", "NE555"]
+    assert plan.query_of["LM 317 T"] == "LM317T"
+    assert plan.collapsed == 2
+
+
+def test_add_returns_query_of_first_spelling():
+    plan = QueryPlan()
+
+    assert plan.add("ne-555") == "ne-555"
+    assert plan.add("NE555") == "ne-555"
+
+
+def test_fan_out_copies_offers_to_every_source_article():
+    plan = QueryPlan(["LM317T", "lm-317t", "NE555"])
+    offers = pd.DataFrame({"article": ["LM317T", "LM317T", "OTHER"], "price": [10.0, 12.0, 1.0]})
+
+    fanned = fan_out_offers(offers, plan.query_of)
+
+    assert list(fanned.columns) == ["article", "price"]
+    assert sorted(zip(fanned["article"], fanned["price"])) == [("LM317T", 10.0), ("LM317T", 12.0),
+                                                               ("lm-317t", 10.0), ("lm-317t", 12.0)]
+
+
+def test_fan_out_without_plan_returns_offers_unchanged():
+    offers = pd.DataFrame({"article": ["LM317T"], "price": [10.0]})
+
+    assert fan_out_offers(offers, {}) is offers
@@ -0,0 +1,99 @@
+import multiprocessing as mp
+
+import pytest
+
+from src.utils import RateLimiter
+from src.utils.RateLimiter import (DomainRateLimiter, ERROR, OK, SLOW, THROTTLED, domain_of, get_limiter,
+                                   shared_state, use_shared_states)
+
+
+class FakeClock:
+    """Подменяет модуль time ограничителя: sleep только сдвигает часы."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(RateLimiter, "time", clock)
+    return clock
+
+
+def _report_throttled(state):
+    DomainRateLimiter("shop.example", state=state).report(0.0, THROTTLED)
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    RateLimiter._limiters.clear()
+    RateLimiter._shared_states.clear()
+    yield
+    RateLimiter._limiters.clear()
+    RateLimiter._shared_states.clear()
+
+
+def test_domain_of():
+    assert domain_of("https://www.ChipDip.ru:443/search?q=1") == "chipdip.ru"
+    assert domain_of("ebay.com") == "ebay.com"
+
+
+def test_aimd():
+    limiter = DomainRateLimiter("shop.example", rate=1.0, additive_step=0.1, decrease_factor=0.5, slow_threshold=5)
+
+    assert limiter.report(1.0) == OK and limiter.rate == pytest.approx(1.1)
+    assert limiter.report(6.0) == SLOW and limiter.rate == pytest.approx(0.55)
+    assert limiter.report(1.0, ERROR) == ERROR and limiter.rate == pytest.approx(0.275)
+
+
+def test_rate_stays_within_bounds():
+    limiter = DomainRateLimiter("shop.example", rate=0.1, min_rate=0.1, max_rate=0.2, additive_step=1.0)
+
+    limiter.report(0.0, ERROR)
+    assert limiter.rate == 0.1
+    limiter.report(0.0)
+    assert limiter.rate == 0.2
+
+
+def test_burst_then_wait(clock):
+    limiter = DomainRateLimiter("shop.example", rate=2.0, burst=2)
+
+    assert limiter.acquire() == 0.0 and limiter.acquire() == 0.0
+    assert limiter.acquire() == pytest.approx(0.5)
+
+
+def test_throttled_cooldown_only_when_asked(clock):
+    # Через прокси пауза всему домену не нужна: следующая сессия идёт через другой прокси
+    proxied = DomainRateLimiter("shop.example", rate=1.0, burst=2, cooldown=60.0)
+    proxied.report(0.0, THROTTLED, cooldown=False)
+    assert proxied.rate == 0.5 and proxied.acquire() == 0.0
+
+    direct = DomainRateLimiter("shop.example", rate=1.0, burst=2, cooldown=60.0)
+    direct.report(0.0, THROTTLED)
+    assert direct.acquire() == pytest.approx(60.0)
+
+
+def test_shared_state_is_one_rate_for_all_processes():
+    context = mp.get_context("spawn")
+    state = shared_state("https://www.shop.example/search", context)
+    use_shared_states({"shop.example": state})
+    limiter = get_limiter("https://shop.example/")
+    rate = limiter.rate
+
+    process = context.Process(target=_report_throttled, args=(state,))
+    process.start()
+    process.join(30)
+
+    assert process.exitcode == 0
+    assert limiter.rate == pytest.approx(rate * 0.5)
+    # Ограничитель, созданный заново (например, после перезапуска процесса), продолжает с той же скоростью
+    assert DomainRateLimiter("shop.example", state=state).rate == pytest.approx(rate * 0.5)
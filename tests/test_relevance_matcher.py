@@ -0,0 +1,38 @@
+from src.utils.RelevanceMatcher import EXACT_SCORE, FOLDED_SCORE, RelevanceMatcher, get_matcher
+
+
+def test_exact_and_folded_matches():
+    matcher = RelevanceMatcher(["LM317", "ABC-123"])
+
+    scores = matcher.score_batch(["Регулятор LM317 в корпусе TO-220", "Стабилизатор LM317T", "abc_123 деталь",
+                                  "lm 317 регулятор", "NE555", None])
+
+    assert scores == [EXACT_SCORE, FOLDED_SCORE, EXACT_SCORE, FOLDED_SCORE, 0.0, 0.0]
+
+
+def test_cyrillic_homoglyphs_match_latin_article():
+    # "АВС" набрано кириллицей
+    assert RelevanceMatcher(["ABC123"]).score("Деталь АВС123") == EXACT_SCORE
+
+
+def test_empty_terms_score_zero():
+    assert RelevanceMatcher(["", None, " - "]).score_batch(["LM317", "x"]) == [0.0, 0.0]
+
+
+def test_matcher_is_cached_per_terms():
+    assert get_matcher(["LM317"]) is get_matcher(["LM317"])
+    assert get_matcher(["LM317"]) is not get_matcher(["NE555"])
+
+
+def test_folded_match_needs_word_boundaries():
+    matcher = RelevanceMatcher(["LM317"])
+
+    scores = matcher.score_batch(["Плёнка защитная film 3170 мм", "ALM317", "LM3170", "LM 317 0 шт", "LM-317-T"])
+
+    assert scores == [0.0, 0.0, 0.0, FOLDED_SCORE, FOLDED_SCORE]
+
+
+def test_folded_match_does_not_extend_letter_terms():
+    matcher = RelevanceMatcher(["NE555P"])
+
+    assert matcher.score_batch(["ne 555 p", "NE555PW", "XNE555P"]) == [FOLDED_SCORE, 0.0, 0.0]
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+from src.utils.PriceDatabase import PriceDatabase
+from src.utils.RescrapeScheduler import RescrapeScheduler
+
+
+NOW = datetime(2026, 1, 31, 12, 0, 0)
+
+
+def check(database, shop, article, price, checked_at, status="results"):
+    run_id = database.start_run(shop, checked_at)
+    records = [{article: {"description": article, "url": f"https://x/{article}", "price": price}}] if price else []
+    database.save_checks(run_id, shop, [(article, records, status, checked_at)])
+
+
+def history(days, changes):
+    """Проверки раз в сутки за days дней, из которых первые changes меняли набор предложений."""
+    start = NOW - timedelta(days=days)
+    return [(start + timedelta(days=day), frozenset({str(min(day, changes))})) for day in range(days + 1)]
+
+
+def test_interval_shrinks_for_volatile_prices():
+    scheduler = RescrapeScheduler(database=None)
+
+    stable = scheduler.interval(history(days=30, changes=0))
+    volatile = scheduler.interval(history(days=30, changes=20))
+
+    assert volatile < stable
+    assert scheduler.min_interval <= volatile and stable <= scheduler.max_interval
+
+
+def test_interval_is_clamped():
+    scheduler = RescrapeScheduler(database=None, min_interval=timedelta(days=2), max_interval=timedelta(days=30))
+
+    assert scheduler.interval(history(days=365, changes=0)) == timedelta(days=30)
+    assert scheduler.interval(history(days=3, changes=3)) == timedelta(days=2)
+
+
+def test_plan_picks_new_and_overdue_articles_in_input_order(tmp_path):
+    database = PriceDatabase(str(tmp_path / "prices.sqlite3"))
+    check(database, "ChipDip", "FRESH", "10", "2026-01-31 11:00:00")
+    check(database, "ChipDip", "STALE", "10", "2025-12-01 10:00:00")
+    scheduler = RescrapeScheduler(database)
+
+    plan = scheduler.plan(["ChipDip"], ["NEW", "FRESH", "STALE"], now=NOW)
+
+    assert plan == {"ChipDip": ["NEW", "STALE"]}
+    database.close()
+
+
+def test_plan_ignores_untrusted_checks_and_respects_budget(tmp_path):
+    database = PriceDatabase(str(tmp_path / "prices.sqlite3"))
+    # Капча не считается проверкой: артикул остаётся непроверенным
+    check(database, "eBay", "CAPTCHA", None, "2026-01-31 11:00:00", status="captcha")
+    check(database, "eBay", "STALE", "10", "2025-12-01 10:00:00")
+    scheduler = RescrapeScheduler(database)
+
+    assert scheduler.plan(["eBay"], {"eBay": ["STALE", "CAPTCHA"]}, budget=1, now=NOW) == {"eBay": ["CAPTCHA"]}
+    assert scheduler.plan(["eBay"], {"eBay": ["STALE", "CAPTCHA"]}, budget=0, now=NOW) == {"eBay": []}
+    database.close()
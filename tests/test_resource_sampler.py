@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("psutil")
+
+from src.utils.ResourceSampler import MB, ResourceSampler, ResourceUsage  # noqa: E402
+
+
+@pytest.fixture
+def child():
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    yield process
+    process.kill()
+    process.wait()
+
+
+def test_sample_measures_current_process_tree(child):
+    sampler = ResourceSampler(interval=60)
+
+    usages = sampler.sample({("ChipDip", "ChipDip#0"): os.getpid()}, force=True)
+
+    assert len(usages) == 1
+    usage = usages[0]
+    assert (usage.shop, usage.worker) == ("ChipDip", "ChipDip#0")
+    assert usage.processes >= 2 and usage.browser_processes == 0
+    assert usage.rss > 0 and usage.cpu >= 0
+    assert sampler.peaks[("ChipDip", "ChipDip#0")] == usage.rss
+    assert sampler.shop_peaks() == {"ChipDip": usage.rss / MB}
+
+
+def test_sample_respects_interval_unless_forced():
+    sampler = ResourceSampler(interval=60)
+    workers = {("ChipDip", "ChipDip#0"): os.getpid()}
+
+    assert sampler.sample(workers) is not None
+    assert sampler.sample(workers) is None
+    assert sampler.sample(workers, force=True) is not None
+
+
+def test_sample_skips_finished_processes():
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+
+    assert ResourceSampler().sample({("eBay", "eBay#0"): finished.pid}, force=True) == []
+
+
+def test_shop_peaks_keep_largest_worker():
+    sampler = ResourceSampler()
+    sampler.peaks = {("ChipDip", "ChipDip#0"): 100 * MB, ("ChipDip", "ChipDip#1"): 300 * MB, ("eBay", "eBay#0"): MB}
+
+    assert sampler.shop_peaks() == {"ChipDip": 300.0, "eBay": 1.0}
+
+
+def test_over_limit_threshold():
+    usage = ResourceUsage("ChipDip", "ChipDip#0", rss=1500 * MB, cpu=0.0, processes=3, browser_processes=2)
+
+    assert not ResourceSampler(recycle_rss_mb=None).over_limit(usage)
+    assert not ResourceSampler(recycle_rss_mb=1500).over_limit(usage)
+    assert ResourceSampler(recycle_rss_mb=1499.5).over_limit(usage)
+
+
+def test_from_config_reads_environment(monkeypatch):
+    monkeypatch.setenv("EMPARSER_RECYCLE_RSS_MB", "1200")
+    monkeypatch.setenv("EMPARSER_RESOURCE_INTERVAL", "2")
+
+    sampler = ResourceSampler.from_config()
+    assert (sampler.recycle_rss_mb, sampler.interval) == (1200.0, 2.0)
+    assert ResourceSampler.from_config(recycle_rss_mb=800).recycle_rss_mb == 800
@@ -0,0 +1,101 @@
+import types
+import urllib.request
+
+import pytest
+
+from src.utils import RunMetrics as run_metrics_module
+from src.utils.RunMetrics import PROMETHEUS_CONTENT_TYPE, Histogram, MetricsServer, RunMetrics
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=100.0)
+    monkeypatch.setattr(run_metrics_module, "time", types.SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture
+def metrics(clock):
+    metrics = RunMetrics()
+    metrics.add_queued("ChipDip", 4)
+    metrics.worker_started("ChipDip")
+    clock.now += 10
+    metrics.article_done("ChipDip", "results", seconds=0.3, stages=[("search", 0.2, True), ("parse", 0.1, True)])
+    metrics.article_done("ChipDip", "captcha", failed=True, seconds=3.0, stages=[("search", 3.0, False)])
+    metrics.cache_lookup("ChipDip", hits=3, misses=1)
+    return metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(1.0, 5.0))
+    for value in (0.5, 1.0, 2.0, 10.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 3]
+    assert (histogram.count, histogram.total, histogram.mean) == (4, 13.5, 3.375)
+
+
+def test_snapshot_after_articles_and_cache_lookups(metrics):
+    stats = metrics.snapshot()["ChipDip"]
+
+    assert (stats["processed"], stats["failed"], stats["blocked"], stats["queued"]) == (2, 1, 1, 2)
+    assert stats["rate"] == pytest.approx(0.2)
+    assert stats["error_rate"] == 0.5 and stats["block_rate"] == 0.5
+    assert stats["cache_hit_ratio"] == 0.75
+    assert stats["browsers"] == 1 and stats["rss_mb"] is None and not stats["disabled"]
+    assert stats["stages"] == {"search": pytest.approx(1.6), "parse": pytest.approx(0.1)}
+
+
+def test_render_prometheus_text(metrics):
+    lines = metrics.render().splitlines()
+
+    assert 'emparser_articles_total{shop="ChipDip",status="captcha"} 1' in lines
+    assert 'emparser_articles_per_second{shop="ChipDip"} 0.200000' in lines
+    assert 'emparser_query_cache_hits_total{shop="ChipDip"} 3' in lines
+    assert 'emparser_stage_failures_total{shop="ChipDip",stage="search"} 1' in lines
+    # Корзины накопительные, +Inf равна числу наблюдений
+    assert 'emparser_stage_seconds_bucket{shop="ChipDip",stage="search",le="0.25"} 1' in lines
+    assert 'emparser_stage_seconds_bucket{shop="ChipDip",stage="search",le="2.5"} 1' in lines
+    assert 'emparser_stage_seconds_bucket{shop="ChipDip",stage="search",le="5.0"} 2' in lines
+    assert 'emparser_stage_seconds_bucket{shop="ChipDip",stage="search",le="+Inf"} 2' in lines
+    assert 'emparser_stage_seconds_sum{shop="ChipDip",stage="search"} 3.200000' in lines
+    assert 'emparser_article_seconds_count{shop="ChipDip"} 2' in lines
+    assert "# TYPE emparser_stage_seconds histogram" in lines
+
+
+def test_render_escapes_label_values(clock):
+    metrics = RunMetrics()
+    metrics.add_queued('Shop "A"\\B\nC', 1)
+
+    assert 'emparser_queue_depth{shop="Shop \\"A\\"\\\\B\\nC"} 1' in metrics.render().splitlines()
+
+
+def test_reset_and_resources(metrics):
+    metrics.resource_usage("ChipDip", "ChipDip#0", 300 * 1024 * 1024, 50.0, 4)
+    assert metrics.snapshot()["ChipDip"]["rss_mb"] == 300.0
+    assert 'emparser_worker_processes{shop="ChipDip",worker="ChipDip#0"} 4' in metrics.render().splitlines()
+
+    metrics.worker_stopped("ChipDip", restarted=True, worker="ChipDip#0")
+    stats = metrics.snapshot()["ChipDip"]
+    assert (stats["browsers"], stats["restarts"], stats["rss_mb"]) == (0, 1, None)
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_metrics_server_serves_render(monkeypatch):
+    metrics = RunMetrics()
+    metrics.add_queued("eBay", 2)
+    server = MetricsServer(metrics, 0).start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+            assert response.headers["Content-Type"] == PROMETHEUS_CONTENT_TYPE
+        assert 'emparser_queue_depth{shop="eBay"} 2' in body
+    finally:
+        server.stop()
+
+    monkeypatch.delenv("EMPARSER_METRICS_PORT", raising=False)
+    assert MetricsServer.from_env(metrics) is None
+    monkeypatch.setenv("EMPARSER_METRICS_PORT", "9108")
+    assert MetricsServer.from_env(metrics).port == 9108
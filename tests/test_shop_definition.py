@@ -0,0 +1,109 @@
+import pytest
+
+from src.parsers.ShopDefinition import Field, Pagination, ShopDefinition, Step, selector_chain
+from src.parsers.ShopEngine import ShopEngineParser
+
+
+def definition(**overrides):
+    options = dict(key="Demo", shop_id=1, site_url="https://demo.example", cards_selector=["div.card", "li.item"],
+                   fields=[Field("description", ["a.title", "h3"]), Field("url", "a", attribute="href"),
+                           Field("cards_ID", None, attribute="id")],
+                   search_url="https://demo.example/search?q={query}")
+    options.update(overrides)
+    return ShopDefinition(**options)
+
+
+def test_selector_chain_accepts_string_and_sequence():
+    assert selector_chain(" div.price ") == ("div.price",)
+    assert selector_chain(["a[data-id='1']", "a:not(.ad)"]) == ("a[data-id='1']", "a:not(.ad)")
+
+
+@pytest.mark.parametrize("selectors", ["", "   ", [], ["div", ""], "a[href", "a:not(.ad", "div]", "a[title='x]"])
+def test_selector_chain_rejects_broken_selectors(selectors):
+    with pytest.raises(ValueError):
+        selector_chain(selectors)
+
+
+def test_selector_chain_ignores_brackets_inside_quotes():
+    assert selector_chain("a[title='(]']") == ("a[title='(]']",)
+
+
+def test_field_defaults():
+    assert Field("price", "span").default == "Цена не найдена"
+    assert Field("brand", "span").default == "brand не найдено"
+    assert Field("cards_ID").selector is None
+    assert Field("price", "span").normalize("  10 ₽ ") == "10 ₽"
+
+
+def test_step_and_pagination_validate_selectors():
+    with pytest.raises(ValueError):
+        Step("click")
+    assert Step("pause", seconds=(0, 1)).selector is None
+    assert Pagination(["a.next", "button.next"]).next_selector == ("a.next", "button.next")
+
+
+@pytest.mark.parametrize("overrides", [
+    {"fields": []},
+    {"search_url": None},
+    {"search_url": "https://demo.example/search"},
+    {"fields": [Field("price", "span"), Field("price", "div")]},
+    {"key": "Demo shop"},
+])
+def test_definition_rejects_invalid_options(overrides):
+    with pytest.raises(ValueError):
+        definition(**overrides)
+
+
+def test_definition_precomputes_extract_args():
+    shop = definition()
+
+    assert shop.cards_selector == ("div.card", "li.item")
+    assert shop.class_name == "DemoParser"
+    assert shop.json_folder == "data/JSON/DemoData"
+    assert shop.extract_args == (["div.card", "li.item"],
+                                 [["description", ["a.title", "h3"], "text"], ["url", ["a"], "href"],
+                                  ["cards_ID", None, "id"]])
+
+
+def test_script_timings_follow_selector_chains():
+    parser = ShopEngineParser.__new__(ShopEngineParser)
+    parser.definition = definition()
+    extracted = {"cardsChoice": 1, "cardsTimes": [2.0, 4.0],
+                 "hits": [[3, 2], [5], []], "tries": [[5, 2], [5], []], "times": [[10.0, 1.0], [5.0], []]}
+
+    assert parser._script_timings(extracted) == [
+        ("карточка", "div.card", 1, 0, 0.002), ("карточка", "li.item", 1, 1, 0.004),
+        ("description", "a.title", 5, 3, 0.01), ("description", "h3", 2, 2, 0.001), ("url", "a", 5, 5, 0.005)]
+
+
+class RecordingDriver:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url):
+        self.calls.append(("get", url))
+
+    def execute_script(self, script, *args):
+        self.calls.append(("script", script))
+
+
+def test_entering_request_uses_steps_cold_and_search_url_warm():
+    parser = ShopEngineParser.__new__(ShopEngineParser)
+    parser.definition = definition(search_url="https://demo.example/search?q={query}",
+                                   search_steps=[Step("script", value="search()", navigates=True)])
+    parser._throttled = lambda action: action()
+    parser.driver = RecordingDriver()
+
+    parser.request = "LM317"
+    parser._entering_request()
+    assert parser.driver.calls == [("script", "search()")]
+
+    # Тот же браузер уже прогрет: выдача открывается ссылкой
+    parser.request = "NE555 P"
+    parser._entering_request()
+    assert parser.driver.calls[-1] == ("get", "https://demo.example/search?q=NE555+P")
+
+    # После смены сессии браузер новый, поиск снова идёт шагами
+    parser.driver = RecordingDriver()
+    parser._entering_request()
+    assert parser.driver.calls == [("script", "search()")]
@@ -0,0 +1,60 @@
+import pytest
+
+from src.utils.StagePolicy import DeadlineExceeded, ParsePageError, SearchError, StagePolicy
+
+
+def failing(times, error=RuntimeError("нет ответа")):
+    calls = []
+
+    def action():
+        calls.append(len(calls))
+        if len(calls) <= times:
+            raise error
+        return "ok"
+
+    return action, calls
+
+
+def test_retries_retryable_stage_then_succeeds():
+    policy = StagePolicy(retries={"search": 2}, base_delay=0)
+    action, calls = failing(2)
+    retried = []
+
+    assert policy.run("search", action, before_retry=lambda: retried.append(True)) == "ok"
+    assert len(calls) == 3 and len(retried) == 2
+
+
+def test_gives_up_with_typed_error():
+    policy = StagePolicy(retries={"search": 1}, base_delay=0)
+    action, calls = failing(5)
+
+    with pytest.raises(SearchError) as error:
+        policy.run("search", action)
+    assert error.value.stage == "search" and len(calls) == 2
+    assert isinstance(error.value.__cause__, RuntimeError)
+
+
+def test_parse_errors_are_not_retried():
+    policy = StagePolicy(retries={"parse": 3}, base_delay=0)
+    action, calls = failing(1)
+
+    with pytest.raises(ParsePageError):
+        policy.run("parse", action)
+    assert len(calls) == 1
+
+
+def test_expired_deadline_is_not_retried():
+    policy = StagePolicy(deadlines={"navigate": -1.0}, retries={"navigate": 3}, base_delay=0)
+    action, calls = failing(5)
+
+    with pytest.raises(DeadlineExceeded):
+        policy.run("navigate", action)
+    assert len(calls) == 1
+
+
+def test_on_attempt_can_extend_deadline():
+    policy = StagePolicy(deadlines={"navigate": -1.0}, retries={"navigate": 1}, base_delay=0)
+    action, calls = failing(1)
+
+    assert policy.run("navigate", action, on_attempt=lambda deadline: deadline.extend(60)) == "ok"
+    assert len(calls) == 2